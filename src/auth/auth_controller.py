@@ -59,7 +59,7 @@ def get_my_data(
     return employee
 
 @auth_router.post("/login", status_code=status.HTTP_200_OK, response_model=dict)
-async def auth_login(
+def auth_login(
     db: DatabaseSession,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ):
@@ -0,0 +1,19 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class CvTextCache(SQLModel, table=True):
+    """
+    Texto normalizado de un CV y, si está disponible, el `DocBin` de spaCy
+    ya procesado. Se indexa por el hash SHA-256 del PDF decodificado, así
+    un CV que no cambió no vuelve a pasar por la extracción ni por el modelo.
+    """
+
+    __tablename__ = "cv_text_cache"  # type: ignore
+
+    pdf_hash: str = Field(primary_key=True, max_length=64)
+    normalized_text: str
+    model_name: str | None = Field(default=None, max_length=100)
+    doc_bin: bytes | None = Field(default=None)
+    size: int = Field(default=0)
+    last_used_at: datetime = Field(default_factory=datetime.now, index=True)
@@ -0,0 +1,106 @@
+from datetime import datetime
+from hashlib import sha256
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
+from sqlmodel import col, delete, func, select, update
+from src.database.core import DatabaseSession
+from src.cv_matching.cache_models import CvTextCache
+from os import getenv
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+# Tamaño máximo (texto + DocBin) que puede ocupar la caché antes de desalojar
+# las entradas usadas hace más tiempo.
+CV_CACHE_MAX_BYTES = int(getenv("CV_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# El matcher solo necesita lemas y POS; ORTH y espacios se guardan siempre.
+DOC_BIN_ATTRS = ["LEMMA", "POS"]
+
+
+def hash_pdf(pdf_bytes: bytes) -> str:
+    return sha256(pdf_bytes).hexdigest()
+
+
+def get_model_name(model: Language) -> str:
+    return f"{model.lang}_{model.meta.get('name')}-{model.meta.get('version')}"
+
+
+def get_entry(db: DatabaseSession, pdf_hash: str) -> CvTextCache | None:
+    return db.get(CvTextCache, pdf_hash)
+
+
+def load_doc(entry: CvTextCache, model: Language) -> Doc | None:
+    """
+    Devuelve el documento guardado si fue procesado con el mismo modelo.
+    """
+    if entry.doc_bin is None or entry.model_name != get_model_name(model):
+        return None
+    return next(DocBin().from_bytes(entry.doc_bin).get_docs(model.vocab))
+
+
+def put_entry(
+    db: DatabaseSession,
+    pdf_hash: str,
+    normalized_text: str,
+    doc: Doc | None = None,
+    model: Language | None = None,
+) -> None:
+    """
+    Guarda (o reemplaza) la entrada del CV. No hace commit.
+    """
+    doc_bin: bytes | None = None
+    if doc is not None and model is not None:
+        doc_bin = DocBin(attrs=DOC_BIN_ATTRS, docs=[doc]).to_bytes()
+
+    db.merge(
+        CvTextCache(
+            pdf_hash=pdf_hash,
+            normalized_text=normalized_text,
+            model_name=get_model_name(model) if doc_bin is not None and model else None,
+            doc_bin=doc_bin,
+            size=len(normalized_text.encode()) + len(doc_bin or b""),
+            last_used_at=datetime.now(),
+        )
+    )
+
+
+def touch_entries(db: DatabaseSession, pdf_hashes: list[str]) -> None:
+    """
+    Marca como usadas las entradas en una sola sentencia. No hace commit.
+    """
+    if not pdf_hashes:
+        return
+    db.exec(
+        update(CvTextCache)
+        .where(col(CvTextCache.pdf_hash).in_(pdf_hashes))
+        .values(last_used_at=datetime.now())
+    )  # type: ignore
+
+
+def evict(db: DatabaseSession, max_bytes: int = CV_CACHE_MAX_BYTES) -> int:
+    """
+    Desaloja las entradas usadas hace más tiempo hasta que el tamaño total
+    quede por debajo de `max_bytes`. Devuelve la cantidad eliminada. No hace
+    commit.
+    """
+    db.flush()
+    total = db.exec(select(func.coalesce(func.sum(CvTextCache.size), 0))).one()
+    if total <= max_bytes:
+        return 0
+
+    to_delete: list[str] = []
+    entries = db.exec(
+        select(CvTextCache.pdf_hash, CvTextCache.size).order_by(
+            col(CvTextCache.last_used_at)
+        )
+    )
+    for pdf_hash, size in entries:
+        if total <= max_bytes:
+            break
+        to_delete.append(pdf_hash)
+        total -= size
+
+    db.exec(delete(CvTextCache).where(col(CvTextCache.pdf_hash).in_(to_delete)))  # type: ignore
+    logger.info(f"Evicted {len(to_delete)} CV cache entries")
+    return len(to_delete)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, status
 from src.database.core import DatabaseSession
 from src.cv_matching import matcher_service
+from src.cv_matching import job_service
 from src.cv_matching import schema
 from typing import List
 
@@ -8,13 +9,63 @@ from typing import List
 matcher_router = APIRouter(prefix="/matcher", tags=["Skills matcher"])
 
 
+@matcher_router.get(
+    "/models",
+    status_code=status.HTTP_200_OK,
+    response_model=List[schema.ModelStatsResponse],
+)
+async def get_model_stats():
+    """
+    Devuelve el tiempo de carga y la memoria de cada modelo de spaCy cargado.
+    """
+    return matcher_service.get_model_stats()
+
+
 @matcher_router.get(
     "/{job_opportunity_id}",
     status_code=status.HTTP_200_OK,
     response_model=List[schema.MatcherResponse],
 )
-async def evaluate_candidates(db: DatabaseSession, job_opportunity_id: int):
+def evaluate_candidates(
+    db: DatabaseSession, job_opportunity_id: int, incremental: bool = True
+):
+    """
+    Evalúa los CVs de forma sincrónica. Al no ser `async` corre en el
+    threadpool y no bloquea el event loop; para ofertas con muchas
+    postulaciones conviene usar `POST /matcher/{job_opportunity_id}/jobs`.
+
+    Con `incremental` solo se evalúan las postulaciones cuyo CV, o las
+    habilidades y porcentajes de la oferta, cambiaron desde la última
+    evaluación; el resto devuelve el resultado guardado.
+    """
     return matcher_service.evaluate_candidates(
         db,
         job_opportunity_id,
+        incremental,
     )
+
+
+@matcher_router.post(
+    "/{job_opportunity_id}/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=schema.MatcherJobResponse,
+)
+def create_evaluation_job(
+    db: DatabaseSession, job_opportunity_id: int, incremental: bool = True
+):
+    """
+    Encola la evaluación de los CVs de la oferta y devuelve el ID del job.
+    """
+    return job_service.create_job(db, job_opportunity_id, incremental)
+
+
+@matcher_router.get(
+    "/jobs/{job_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=schema.MatcherJobResponse,
+)
+def get_evaluation_job(db: DatabaseSession, job_id: int):
+    """
+    Devuelve el progreso del job y los resultados de las postulaciones ya evaluadas.
+    """
+    return job_service.get_job(db, job_id)
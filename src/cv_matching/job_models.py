@@ -0,0 +1,31 @@
+from typing import Any
+from sqlmodel import SQLModel, Field, Column, JSON
+from datetime import datetime
+from src.cv_matching.schema import MatcherJobStatus
+
+
+class MatcherJob(SQLModel, table=True):
+    """
+    Evaluación de CVs de una oferta laboral ejecutada en segundo plano.
+    Guarda el progreso y los errores por postulación.
+    """
+
+    __tablename__ = "matcher_job"  # type: ignore
+
+    id: int | None = Field(default=None, primary_key=True, index=True)
+    job_opportunity_id: int = Field(
+        foreign_key="job_opportunity.id", ondelete="CASCADE", index=True
+    )
+    status: MatcherJobStatus = Field(default=MatcherJobStatus.PENDIENTE)
+    incremental: bool = Field(default=True)
+    total: int = Field(default=0)
+    processed: int = Field(default=0)
+    skipped: int = Field(default=0)
+    failed: int = Field(default=0)
+    errors: dict[str, Any] = Field(sa_column=Column(JSON), default_factory=dict)
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: datetime | None = Field(default=None)
+    finished_at: datetime | None = Field(default=None)
+    # Proceso que lo ejecuta y su último latido (`src/database/heartbeat.py`)
+    worker_id: str | None = Field(default=None, max_length=100)
+    heartbeat_at: datetime | None = Field(default=None)
@@ -0,0 +1,286 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from fastapi import HTTPException, status
+from sqlmodel import Session, col, select, update
+from src.database.core import DatabaseSession, engine
+from src.database.heartbeat import Heartbeat, stale_before, worker_id
+from src.cv_matching import matcher_service
+from src.cv_matching import schema
+from src.cv_matching.job_models import MatcherJob
+from src.modules.postulation.models.postulation_models import Postulation
+from os import getenv
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+MATCHER_WORKERS = int(getenv("MATCHER_WORKERS", "2"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=MATCHER_WORKERS, thread_name_prefix="matcher-job"
+)
+_heartbeat = Heartbeat(MatcherJob.__table__)  # type: ignore
+
+UNFINISHED_STATUSES = (
+    schema.MatcherJobStatus.PENDIENTE,
+    schema.MatcherJobStatus.EN_PROCESO,
+)
+
+
+def get_job_or_not_found(db: DatabaseSession, job_id: int) -> MatcherJob:
+    job = db.get(MatcherJob, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No existe la evaluación {job_id}",
+        )
+    return job
+
+
+def create_job(
+    db: DatabaseSession, job_opportunity_id: int, incremental: bool = True
+) -> schema.MatcherJobResponse:
+    """
+    Registra una evaluación de candidatos para la oferta y la encola en el
+    pool de workers. Devuelve inmediatamente el estado inicial.
+    """
+    matcher_service.get_job_opportunity_or_bad_request(db, job_opportunity_id)
+    postulations = matcher_service.get_postulations_or_bad_request(
+        db, job_opportunity_id
+    )
+
+    # El job vive en el pool de este proceso: queda a su nombre y con latido
+    # desde que se encola
+    job = MatcherJob(
+        job_opportunity_id=job_opportunity_id,
+        incremental=incremental,
+        total=len(postulations),
+        worker_id=worker_id(),
+        heartbeat_at=datetime.now(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    logger.info(f"Queued matcher job {job.id} for job opportunity {job_opportunity_id}")
+
+    _heartbeat.add(job.id)  # type: ignore
+    _executor.submit(run_job, job.id)
+    return build_job_response(db, job)
+
+
+def get_job(db: DatabaseSession, job_id: int) -> schema.MatcherJobResponse:
+    job = get_job_or_not_found(db, job_id)
+    if job.status in UNFINISHED_STATUSES and fail_interrupted_jobs(job_id):
+        db.refresh(job)
+    return build_job_response(db, job)
+
+
+def build_job_response(
+    db: DatabaseSession, job: MatcherJob
+) -> schema.MatcherJobResponse:
+    """
+    Arma la respuesta del job incluyendo los resultados. Mientras corre son
+    las postulaciones evaluadas desde que arrancó; al finalizar se agregan
+    las que se reutilizaron por no haber cambiado.
+    """
+    results: list[schema.MatcherResponse] = []
+    if job.started_at is not None:
+        query = select(Postulation).where(
+            Postulation.job_opportunity_id == job.job_opportunity_id
+        )
+        if job.status == schema.MatcherJobStatus.FINALIZADO:
+            query = query.where(col(Postulation.evaluated_at).is_not(None))
+        else:
+            query = query.where(col(Postulation.evaluated_at) >= job.started_at)
+        postulations = db.exec(query.order_by(col(Postulation.id))).all()
+        results = [
+            matcher_service.matcher_response_from_postulation(postulation)
+            for postulation in postulations
+            if str(postulation.id) not in job.errors
+        ]
+
+    return schema.MatcherJobResponse(
+        **job.model_dump(exclude={"errors"}),
+        errors={key: str(value) for key, value in job.errors.items()},
+        results=results,
+    )
+
+
+def record_postulation_error(
+    job: MatcherJob, postulation: Postulation, error: Exception
+) -> None:
+    logger.error(
+        f"Matcher job {job.id} failed evaluating postulation {postulation.id}"
+    )
+    logger.error(error)
+    job.processed += 1
+    job.failed += 1
+    job.errors = {**job.errors, str(postulation.id): str(error)}
+
+
+def fail_interrupted_jobs(job_id: int | None = None) -> int:
+    """
+    Marca como fallidos los jobs pendientes o en proceso sin latido reciente:
+    el proceso que los ejecutaba se reinició o se cayó, nadie los va a
+    retomar y los clientes que consultan su estado esperarían para siempre.
+    Los que siguen corriendo en otro worker tienen latido y no se tocan. Se
+    vuelven a pedir con un job nuevo, que en modo incremental no repite las
+    postulaciones ya evaluadas. Con `job_id` solo revisa ese job. Devuelve
+    cuántos marcó.
+    """
+    stale = (
+        col(MatcherJob.status).in_(UNFINISHED_STATUSES)
+        & (
+            col(MatcherJob.heartbeat_at).is_(None)
+            | (col(MatcherJob.heartbeat_at) < stale_before())
+        )
+    )
+    if job_id is not None:
+        stale = stale & (col(MatcherJob.id) == job_id)
+
+    failed_ids = []
+    with Session(engine) as db:
+        for job in db.exec(select(MatcherJob).where(stale)).all():
+            # Se repite la condición: si el latido llegó entre la consulta y
+            # el UPDATE, el job sigue vivo
+            result = db.exec(
+                update(MatcherJob)
+                .where(col(MatcherJob.id) == job.id)
+                .where(stale)
+                .values(
+                    status=schema.MatcherJobStatus.FALLIDO,
+                    errors={
+                        **job.errors,
+                        "job": "Interrumpida por un reinicio del servidor",
+                    },
+                    finished_at=datetime.now(),
+                )
+            )
+            if result.rowcount:
+                failed_ids.append(str(job.id))
+        db.commit()
+
+    if failed_ids:
+        logger.warning(
+            f"Marked {len(failed_ids)} interrupted matcher jobs as failed: "
+            f"{', '.join(failed_ids)}"
+        )
+    return len(failed_ids)
+
+
+def run_job(job_id: int) -> None:
+    """
+    Ejecuta el job en un thread del pool con su propia sesión. Los CVs se
+    procesan en lote con `parse_texts` y cada postulación se confirma por
+    separado para que el progreso y los resultados parciales sean visibles
+    mientras se procesa.
+    """
+    try:
+        with Session(engine) as db:
+            execute_job(db, job_id)
+    finally:
+        _heartbeat.discard(job_id)
+
+
+def execute_job(db: Session, job_id: int) -> None:
+    job = db.get(MatcherJob, job_id)
+    if job is None:
+        logger.error(f"Matcher job {job_id} not found")
+        return
+
+    # Los cambios de estado son UPDATE condicionales: un job que se dio por
+    # interrumpido (FALLIDO) mientras esperaba o corría no se pisa
+    started = db.exec(
+        update(MatcherJob)
+        .where(col(MatcherJob.id) == job_id)
+        .where(col(MatcherJob.status) == schema.MatcherJobStatus.PENDIENTE)
+        .values(status=schema.MatcherJobStatus.EN_PROCESO, started_at=datetime.now())
+    )
+    db.commit()
+    if not started.rowcount:
+        logger.warning(f"Matcher job {job_id} is no longer pending, not running it")
+        return
+
+    try:
+        job_opportunity = matcher_service.get_job_opportunity_or_bad_request(
+            db, job.job_opportunity_id
+        )
+        postulations = matcher_service.get_postulations_or_bad_request(
+            db, job.job_opportunity_id
+        )
+        required_words, desired_words = matcher_service.get_normalized_abilities(
+            db, job.job_opportunity_id
+        )
+        job.total = len(postulations)
+
+        pending = [
+            postulation
+            for postulation in postulations
+            if not (
+                job.incremental
+                and matcher_service.is_evaluation_current(
+                    postulation, job_opportunity, required_words, desired_words
+                )
+            )
+        ]
+        job.skipped = len(postulations) - len(pending)
+        job.processed = job.skipped
+        db.add(job)
+        db.commit()
+
+        model = matcher_service.load_spanish_model()
+        required_abilities = matcher_service.parse_abilities(required_words, model)
+        desired_abilities = matcher_service.parse_abilities(desired_words, model)
+
+        parsed_cvs = matcher_service.parse_postulation_cvs(
+            db,
+            pending,
+            model,
+            on_error=lambda postulation, e: record_postulation_error(
+                job, postulation, e
+            ),
+        )
+        for postulation, cv in parsed_cvs:
+            try:
+                matcher_service.evaluate_postulation(
+                    postulation,
+                    job_opportunity,
+                    cv,
+                    required_abilities,
+                    desired_abilities,
+                    model,
+                )
+                db.add(postulation)
+                job.processed += 1
+            except Exception as e:
+                record_postulation_error(job, postulation, e)
+            db.add(job)
+            db.commit()
+
+        final_status = schema.MatcherJobStatus.FINALIZADO
+        errors = job.errors
+    except Exception as e:
+        logger.error(f"Matcher job {job_id} failed")
+        logger.error(e)
+        db.rollback()
+        final_status = schema.MatcherJobStatus.FALLIDO
+        errors = {**job.errors, "job": str(getattr(e, "detail", e))}
+
+    finished = db.exec(
+        update(MatcherJob)
+        .where(col(MatcherJob.id) == job_id)
+        .where(col(MatcherJob.status) != schema.MatcherJobStatus.FALLIDO)
+        .values(status=final_status, errors=errors, finished_at=datetime.now())
+    )
+    db.commit()
+    if not finished.rowcount:
+        logger.warning(
+            f"Matcher job {job_id} was marked as failed while running, "
+            f"keeping that status"
+        )
+        return
+    db.refresh(job)
+    logger.info(
+        f"Matcher job {job_id} {job.status.value}: "
+        f"{job.processed}/{job.total} processed, {job.skipped} skipped, "
+        f"{job.failed} failed"
+    )
@@ -1,4 +1,5 @@
 from io import BytesIO
+from functools import lru_cache
 from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.tokens.span import Span
@@ -11,22 +12,251 @@ from src.modules.opportunity.schemas.job_opportunity_schemas import (
 )
 from src.modules.opportunity.services import opportunity_service
 from src.modules.postulation.models.postulation_models import Postulation
-from src.modules.cv_matching import matcher_schema
+from src.cv_matching import schema
+from src.cv_matching import model_registry
+from src.cv_matching import cache_service
 from fastapi import status, HTTPException
-from typing import List, Any
+from typing import List, Any, Sequence, Iterable, Iterator, Callable
+from dataclasses import dataclass
+from os import getenv
 import pymupdf
 import unicodedata
 import string
-import spacy
 import base64
 import logging
 import re
-import itertools
+import json
+from hashlib import sha256
 from datetime import datetime
 from pypdf import PdfReader
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.optimize import linear_sum_assignment
+from spacy.attrs import ORTH
+import numpy as np
 
 logger = logging.getLogger("uvicorn.error")
 
+# Procesos y tamaño de lote con los que `Language.pipe` procesa los CVs.
+MATCHER_N_PROCESS = int(getenv("MATCHER_N_PROCESS", "1"))
+MATCHER_BATCH_SIZE = int(getenv("MATCHER_BATCH_SIZE", "32"))
+
+SIMILARITY_THRESHOLD = 0.79
+
+# Clave de `Postulation.ability_match` donde se guarda la huella de la
+# evaluación, para saber si se puede reutilizar.
+FINGERPRINT_KEY = "evaluation_fingerprint"
+
+
+CUSTOM_LEMMAS = {
+    "lic": "licenciatura",
+    "tec": "tecnicatura",
+    "ing": "ingenieria",
+    "definicion": "definir",
+    "capacitacion": "capacitar",
+    "definiciones": "definir",
+    "organizacion": "organizar",
+    "organizaciones": "organizar",
+    "resolucion": "resolver",
+    "resoluciones": "resolver",
+    "ejecucion": "ejecutar",
+    "ejecuciones": "ejecutar",
+    "educacion": "educar",
+    "educaciones": "educar",
+    "analisis": "analizar",
+    "construccion": "construir",
+    "construcciones": "construir",
+    "produccion": "producir",
+    "producciones": "producir",
+    "evaluacion": "evaluar",
+    "evaluaciones": "evaluar",
+    "informacion": "informar",
+    "revision": "revisar",
+    "revisiones": "revisar",
+    "desarrollo": "desarrollar",
+    "desarrollos": "desarrollar",
+    "programacion": "programar",
+    "programaciones": "programar",
+    "implementacion": "implementar",
+    "implementaciones": "implementar",
+    "diseno": "disenar",
+    "disenos": "disenar",
+    "configuracion": "configurar",
+    "configuraciones": "configurar",
+    "integracion": "integrar",
+    "integraciones": "integrar",
+    "mantenimiento": "mantener",
+    "automatizacion": "automatizar",
+    "automatizaciones": "automatizar",
+    "optimizacion": "optimizar",
+    "optimizaciones": "optimizar",
+    "pruebas": "probar",
+    "testing": "probar",
+    "despliegue": "desplegar",
+    "despliegues": "desplegar",
+    "soporte": "soportar",
+    "migracion": "migrar",
+    "migraciones": "migrar",
+    "documentacion": "documentar",
+    "depuracion": "depurar",
+    "refactorizacion": "refactorizar",
+    "innovacion": "innovar",
+    "actualizacion": "actualizar",
+    "prueba": "probar",
+    "integracioncontinua": "integrar",
+    "desplieguecontinuo": "desplegar",
+    "postgres": "sql",
+    "postgresql": "sql",
+    "mariadb": "sql",
+    "mysql": "sql",
+    "adm": "administrar",
+    "administracion": "administrar",
+    "administraciones": "administrar",
+    "comunicacion": "comunicar",
+    "comunicaciones": "comunicar",
+    "liderazgo": "liderar",
+    "gestion": "gestionar",
+    "gestiones": "gestionar",
+    "estrategia": "estrategizar",
+    "estrategias": "estrategizar",
+    "planificacion": "planificar",
+    "planificaciones": "planificar",
+    "innovaciones": "innovar",
+    "experiencia": "experimentar",
+    "coordinacion": "coordinar",
+    "coordinaciones": "coordinar",
+    "proyecto": "proyectar",
+    "proyectos": "proyectar",
+    "code": "codigo",
+}
+
+
+@dataclass
+class ParsedText:
+    """
+    Resultado de procesar un texto (CV o habilidad) una única vez con spaCy.
+    `doc` es el documento sin tokens vacíos y `doc_norm` el documento de lemas
+    normalizados, que solo se usa por sus vectores. `vectors` es la matriz
+    (tokens de `doc_norm` × dimensiones) con cada fila normalizada.
+    """
+
+    text: str
+    tokens_text: list[str]
+    doc: Doc
+    norm_text: list[str]
+    doc_norm: Doc
+    vectors: np.ndarray
+
+
+def parse_texts(
+    texts: Iterable[str],
+    model: Language,
+    *,
+    n_process: int = MATCHER_N_PROCESS,
+    batch_size: int = MATCHER_BATCH_SIZE,
+) -> Iterator[ParsedText]:
+    """
+    Procesa los textos en lote con `Language.pipe`. Cada texto se tokeniza,
+    se descartan los tokens vacíos y el documento resultante pasa una sola vez
+    por el pipeline. Los lemas normalizados se calculan una vez por texto.
+    """
+    texts = list(texts)
+    docs = (
+        Doc(model.vocab, words=[token.text for token in model.make_doc(text) if token.text.strip()])
+        for text in texts
+    )
+    for text, doc in zip(
+        texts, model.pipe(docs, n_process=n_process, batch_size=batch_size)
+    ):
+        yield build_parsed_text(text, doc, model)
+
+
+def build_parsed_text(text: str, doc: Doc, model: Language) -> ParsedText:
+    norm_text = [
+        CUSTOM_LEMMAS.get(token.lemma_, token.lemma_)
+        for token in doc
+        if token.text.strip() and token.lemma_.strip() and not token.is_stop and token.pos_ != "ADP"
+    ]
+    doc_norm = Doc(model.vocab, words=norm_text)
+    return ParsedText(
+        text=text,
+        tokens_text=[token.text for token in doc],
+        doc=doc,
+        norm_text=norm_text,
+        doc_norm=doc_norm,
+        vectors=get_normalized_vectors(doc_norm),
+    )
+
+
+def get_normalized_vectors(doc: Doc) -> np.ndarray:
+    """
+    Devuelve los vectores de los tokens de `doc` como una matriz contigua con
+    norma 1 por fila (las filas de tokens sin vector quedan en cero), de modo
+    que el producto de dos matrices da directamente la similaridad coseno.
+    """
+    vectors = doc.vocab.vectors
+    if vectors.mode == "default" and len(doc) > 0:
+        rows = vectors.find(keys=doc.to_array(ORTH))
+        found = rows >= 0
+        matrix = np.zeros((len(doc), vectors.shape[1]), dtype=np.float32)
+        matrix[found] = np.asarray(vectors.data)[rows[found]]
+    else:
+        matrix = np.array(
+            [token.vector for token in doc], dtype=np.float32
+        ).reshape(len(doc), -1)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def parse_postulation_cvs(
+    db: DatabaseSession,
+    postulations: Sequence[Postulation],
+    model: Language,
+    on_error: Callable[[Postulation, Exception], None] | None = None,
+) -> Iterator[tuple[Postulation, ParsedText]]:
+    """
+    Devuelve el CV procesado de cada postulación. Primero se entregan los CVs
+    que ya están en la caché (sin extraer el PDF ni pasar por el modelo) y
+    luego los nuevos, procesados en lote. Si se indica `on_error`, los CVs que
+    fallan se informan ahí en lugar de lanzar la excepción.
+
+    Las entradas nuevas de la caché se agregan a la sesión; el commit queda a
+    cargo de quien consume el iterador.
+    """
+    pending: list[tuple[Postulation, str, str]] = []
+    cache_hits: list[str] = []
+
+    for postulation in postulations:
+        try:
+            pdf_bytes = decode_pdf(postulation.cv_file)
+            pdf_hash = cache_service.hash_pdf(pdf_bytes)
+            entry = cache_service.get_entry(db, pdf_hash)
+            if entry is not None:
+                cache_hits.append(pdf_hash)
+                doc = cache_service.load_doc(entry, model)
+                if doc is not None:
+                    logger.info(f"Using cached CV for postulation {postulation.id}")
+                    yield postulation, build_parsed_text(entry.normalized_text, doc, model)
+                    continue
+                normalized_text = entry.normalized_text
+            else:
+                normalized_text = normalize(extract_text_from_pdf_bytes(pdf_bytes))
+            logger.info(f"Normalized PDF text:\n{normalized_text}")
+            pending.append((postulation, pdf_hash, normalized_text))
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(postulation, e)
+
+    cache_service.touch_entries(db, cache_hits)
+
+    parsed_cvs = parse_texts((text for _, _, text in pending), model)
+    for (postulation, pdf_hash, _), cv in zip(pending, parsed_cvs):
+        cache_service.put_entry(db, pdf_hash, cv.text, cv.doc, model)
+        yield postulation, cv
+
+    cache_service.evict(db)
+
 
 def get_all_abilities(
     db: DatabaseSession, job_opportunity_id: int
@@ -34,9 +264,16 @@ def get_all_abilities(
     return opportunity_service.get_opportunity_with_abilities(db, job_opportunity_id)
 
 
+def decode_pdf(base64_pdf: str) -> bytes:
+    return base64.b64decode(base64_pdf.replace("\n", "").strip())
+
+
 def extract_text_from_pdf(base64_pdf: str) -> str:
+    return extract_text_from_pdf_bytes(decode_pdf(base64_pdf))
+
+
+def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
     texto: str = ""
-    pdf_bytes = base64.b64decode(base64_pdf)
 
     try:
         logger.info("Extracting text with PyMuPDF...")
@@ -67,17 +304,23 @@ def extract_text_from_pdf(base64_pdf: str) -> str:
     return texto
 
 
-def evaluate_candidates(
+def get_job_opportunity_or_bad_request(
     db: DatabaseSession, job_opportunity_id: int
-) -> List[matcher_schema.MatcherResponse]:
+) -> JobOpportunityModel:
     job_opportunity = db.exec(
         select(JobOpportunityModel).where(JobOpportunityModel.id == job_opportunity_id)
-    ).one()
+    ).one_or_none()
     if not job_opportunity:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"No existe la oferta laboral {job_opportunity_id}",
         )
+    return job_opportunity
+
+
+def get_postulations_or_bad_request(
+    db: DatabaseSession, job_opportunity_id: int
+) -> Sequence[Postulation]:
     postulations = db.exec(
         select(Postulation).where(Postulation.job_opportunity_id == job_opportunity_id)
     ).all()
@@ -86,62 +329,182 @@ def evaluate_candidates(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"No hay postulaciones para la oferta laboral {job_opportunity_id}",
         )
-    abilities = get_all_abilities(db, job_opportunity_id)
-    model = load_spanish_model()
+    return postulations
 
-    desired_abilities = extract_desirable_abilities(abilities)
-    required_abilities = extract_required_abilities(abilities)
 
-    normalized_required_words = normalize_words(required_abilities)
-    normalized_desired_words = normalize_words(desired_abilities)
+def get_normalized_abilities(
+    db: DatabaseSession, job_opportunity_id: int
+) -> tuple[list[str], list[str]]:
+    """
+    Devuelve las habilidades requeridas y deseadas de la oferta, normalizadas.
+    """
+    abilities = get_all_abilities(db, job_opportunity_id)
+    return (
+        normalize_words(extract_required_abilities(abilities)),
+        normalize_words(extract_desirable_abilities(abilities)),
+    )
 
-    response: list[matcher_schema.MatcherResponse] = []
 
+def evaluate_candidates(
+    db: DatabaseSession, job_opportunity_id: int, incremental: bool = True
+) -> List[schema.MatcherResponse]:
+    job_opportunity = get_job_opportunity_or_bad_request(db, job_opportunity_id)
+    postulations = get_postulations_or_bad_request(db, job_opportunity_id)
+    normalized_required_words, normalized_desired_words = get_normalized_abilities(
+        db, job_opportunity_id
+    )
+
+    responses: dict[int | None, schema.MatcherResponse] = {}
+    pending: list[Postulation] = []
     for postulation in postulations:
-        normalized_text = normalize(
-            extract_text_from_pdf(postulation.cv_file.replace("\n", "").strip())
-        )
-        logger.info(f"Normalized PDF text:\n{normalized_text}")
-        required_words_match = match_abilities(
-            normalized_text,
+        if incremental and is_evaluation_current(
+            postulation,
+            job_opportunity,
             normalized_required_words,
-            model,
-            similarity_threshold=0.79,
-            minimum_percentage=job_opportunity.required_skill_percentage,
-        )
-        desired_words_match = match_abilities(
-            normalized_text,
             normalized_desired_words,
-            model,
-            similarity_threshold=0.79,
-            minimum_percentage=job_opportunity.desirable_skill_percentage,
-        )
-        suitable = required_words_match["SUITABLE"] and desired_words_match["SUITABLE"]
-
-        matcher = schema.MatcherResponse(
-            postulation_id=postulation.id,
-            name=postulation.name,
-            surname=postulation.surname,
-            suitable=suitable,
-            required_words_found=required_words_match["WORDS_FOUND"],
-            desired_words_found=desired_words_match["WORDS_FOUND"],
-            required_words_not_found=required_words_match["WORDS_NOT_FOUND"],
-            desired_words_not_found=desired_words_match["WORDS_NOT_FOUND"],
+        ):
+            responses[postulation.id] = matcher_response_from_postulation(postulation)
+        else:
+            pending.append(postulation)
+    logger.info(
+        f"Reusing {len(responses)} evaluations, evaluating {len(pending)} postulations"
+    )
+
+    if pending:
+        model = load_spanish_model()
+        required_abilities = parse_abilities(normalized_required_words, model)
+        desired_abilities = parse_abilities(normalized_desired_words, model)
+
+        for postulation, cv in parse_postulation_cvs(db, pending, model):
+            responses[postulation.id] = evaluate_postulation(
+                postulation,
+                job_opportunity,
+                cv,
+                required_abilities,
+                desired_abilities,
+                model,
+            )
+
+        db.commit()
+
+    return [responses[postulation.id] for postulation in postulations]
+
+
+def evaluation_fingerprint(
+    postulation: Postulation,
+    job_opportunity: JobOpportunityModel,
+    required_words: list[str],
+    desired_words: list[str],
+) -> str:
+    """
+    Resume todo lo que determina el resultado de una evaluación: el CV, las
+    habilidades de la oferta, los porcentajes mínimos y el umbral.
+    """
+    data = {
+        "cv": sha256(postulation.cv_file.encode()).hexdigest(),
+        "required": sorted(required_words),
+        "desired": sorted(desired_words),
+        "required_percentage": job_opportunity.required_skill_percentage,
+        "desired_percentage": job_opportunity.desirable_skill_percentage,
+        "threshold": SIMILARITY_THRESHOLD,
+    }
+    return sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def is_evaluation_current(
+    postulation: Postulation,
+    job_opportunity: JobOpportunityModel,
+    required_words: list[str],
+    desired_words: list[str],
+) -> bool:
+    """
+    Indica si el `ability_match` guardado sigue siendo válido, es decir, si
+    ni el CV ni las habilidades o porcentajes de la oferta cambiaron desde
+    `evaluated_at`.
+    """
+    return (
+        postulation.evaluated_at is not None
+        and postulation.ability_match.get(FINGERPRINT_KEY)
+        == evaluation_fingerprint(
+            postulation, job_opportunity, required_words, desired_words
         )
-        response.append(matcher)
+    )
 
-        postulation.evaluated_at = datetime.now()
-        postulation.suitable = suitable
-        postulation.ability_match = {
-            "required_words_found": required_words_match["WORDS_FOUND"],
-            "desired_words_found": desired_words_match["WORDS_FOUND"],
-            "required_words_not_found": required_words_match["WORDS_NOT_FOUND"],
-            "desired_words_not_found": desired_words_match["WORDS_NOT_FOUND"],
-        }
 
-    db.commit()
+def parse_abilities(words: list[str], model: Language) -> list[ParsedText]:
+    # Son pocas palabras: no vale la pena levantar procesos.
+    return list(parse_texts(words, model, n_process=1))
 
-    return response
+
+def evaluate_postulation(
+    postulation: Postulation,
+    job_opportunity: JobOpportunityModel,
+    cv: ParsedText,
+    required_abilities: list[ParsedText],
+    desired_abilities: list[ParsedText],
+    model: Language,
+) -> schema.MatcherResponse:
+    """
+    Evalúa el CV ya procesado de una postulación y guarda el resultado en la
+    postulación (sin hacer commit).
+    """
+    phrase_matcher = get_phrase_matcher(
+        model,
+        tuple(sorted({ability.text for ability in required_abilities + desired_abilities})),
+    )
+    phrases_found = find_phrases(cv.doc, phrase_matcher)
+
+    required_words_match = match_abilities(
+        cv,
+        required_abilities,
+        phrases_found,
+        similarity_threshold=SIMILARITY_THRESHOLD,
+        minimum_percentage=job_opportunity.required_skill_percentage,
+    )
+    desired_words_match = match_abilities(
+        cv,
+        desired_abilities,
+        phrases_found,
+        similarity_threshold=SIMILARITY_THRESHOLD,
+        minimum_percentage=job_opportunity.desirable_skill_percentage,
+    )
+    suitable = required_words_match["SUITABLE"] and desired_words_match["SUITABLE"]
+
+    postulation.evaluated_at = datetime.now()
+    postulation.suitable = suitable
+    postulation.ability_match = {
+        "required_words_found": required_words_match["WORDS_FOUND"],
+        "desired_words_found": desired_words_match["WORDS_FOUND"],
+        "required_words_not_found": required_words_match["WORDS_NOT_FOUND"],
+        "desired_words_not_found": desired_words_match["WORDS_NOT_FOUND"],
+        FINGERPRINT_KEY: evaluation_fingerprint(
+            postulation,
+            job_opportunity,
+            [ability.text for ability in required_abilities],
+            [ability.text for ability in desired_abilities],
+        ),
+    }
+
+    return matcher_response_from_postulation(postulation)
+
+
+def matcher_response_from_postulation(
+    postulation: Postulation,
+) -> schema.MatcherResponse:
+    return schema.MatcherResponse(
+        postulation_id=postulation.id,
+        name=postulation.name,
+        surname=postulation.surname,
+        suitable=postulation.suitable,
+        required_words_found=postulation.ability_match.get("required_words_found", []),
+        desired_words_found=postulation.ability_match.get("desired_words_found", []),
+        required_words_not_found=postulation.ability_match.get(
+            "required_words_not_found", []
+        ),
+        desired_words_not_found=postulation.ability_match.get(
+            "desired_words_not_found", []
+        ),
+    )
 
 
 def extract_desirable_abilities(abilities: JobOpportunityResponse):
@@ -177,31 +540,44 @@ def normalize_words(words: list[str]) -> list[str]:
     return normalized_words
 
 
-def match_phrase(tokens: Doc, ability: str, model: Language) -> bool:
+@lru_cache(maxsize=32)
+def get_phrase_matcher(model: Language, abilities: tuple[str, ...]) -> PhraseMatcher:
+    """
+    Compila un único `PhraseMatcher` con todas las habilidades de la oferta,
+    cada una con su propio match id. Se cachea por modelo y conjunto de
+    habilidades, así se arma una sola vez hasta que la oferta cambie.
+    """
+    logger.info(f"Building PhraseMatcher for abilities {abilities}")
     matcher = PhraseMatcher(model.vocab, attr="LOWER")
-    matcher.add("TerminologyList", [model.make_doc(ability)])
-
-    matches = matcher(tokens)
-    matches_list: list[Span] = []
-    if not matches:
-        logger.info(f"Did not find {ability} with PhraseMatcher")
-        return False
-
-    for match_id, start, end in matches:
-        span = tokens[start:end]
-        matches_list.append(span)
-        logger.info(f"Matched phrase: {span} (start: {start}, end: {end})")
-
-    if len(matches_list) > 0:
-        logger.info(f"Ability {ability} found with PhraseMatcher {len(matches_list)} times")
-        return True
-    else:
-        return False
+    for ability in abilities:
+        matcher.add(ability, [model.make_doc(ability)])
+    return matcher
 
 
-def match_abilities(text: str, abilities: list[str], model: Language, *, similarity_threshold: float, minimum_percentage: float):
+def find_phrases(tokens: Doc, matcher: PhraseMatcher) -> set[str]:
+    """
+    Recorre el documento una sola vez y devuelve las habilidades encontradas.
+    """
+    found: set[str] = set()
+    for match_id, start, end in matcher(tokens):
+        span: Span = tokens[start:end]
+        ability = tokens.vocab.strings[match_id]
+        found.add(ability)
+        logger.info(f"Matched phrase {ability}: {span} (start: {start}, end: {end})")
+    return found
+
+
+def match_abilities(
+    cv: ParsedText,
+    abilities: list[ParsedText],
+    phrases_found: set[str],
+    *,
+    similarity_threshold: float,
+    minimum_percentage: float,
+):
     """
-    Verifica si las habilidades se encuentran en `text`, usando el umbral de similaridad especificado.
+    Verifica si las habilidades se encuentran en el CV ya procesado, usando el umbral de similaridad especificado.
+    `phrases_found` son las habilidades que el `PhraseMatcher` encontró en el CV.
     Devuelve las listas de palabras encontradas y no encontradas y el valor booleano Suitable en base
     al mínimo porcentaje requerido del total de habilidades.
     """
@@ -209,14 +585,9 @@ def match_abilities(text: str, abilities: list[str], model: Language, *, similar
     if minimum_percentage < 0:
         raise ValueError("minimum_percentage must be a positive value or zero")
 
-    logger.info(f"Finding required abilities {abilities} with threshold {similarity_threshold} and minimum percentage {minimum_percentage}")
-
-    doc: Doc = model(text)
-    tokens_text = [token.text for token in doc if token.text.strip()]
-    doc = model(" ".join(tokens_text))
-    logger.info(f"Tokens: {tokens_text}")
-
-
+    ability_names = [ability.text for ability in abilities]
+    logger.info(f"Finding required abilities {ability_names} with threshold {similarity_threshold} and minimum percentage {minimum_percentage}")
+    logger.info(f"Tokens: {cv.tokens_text}")
 
     result: dict[str, Any] = {
         "WORDS_FOUND": [],
@@ -224,130 +595,37 @@ def match_abilities(text: str, abilities: list[str], model: Language, *, similar
         "SUITABLE": False
     }
 
-    for ability in abilities:
+    for parsed_ability in abilities:
+        ability = parsed_ability.text
         logger.info(f"Matching ability {ability}")
 
-        if ability in tokens_text:
+        if ability in cv.tokens_text:
             result["WORDS_FOUND"].append(ability)
             logger.info(f"Found ability {ability} in tokens")
-        elif match_phrase(doc, ability, model):
+        elif ability in phrases_found:
             result["WORDS_FOUND"].append(ability)
+            logger.info(f"Found ability {ability} with PhraseMatcher")
         else:
-            custom_lemmas = {
-            "lic": "licenciatura",
-            "tec": "tecnicatura",
-            "ing": "ingenieria",
-            "definicion": "definir",
-            "capacitacion": "capacitar",
-            "definiciones": "definir",
-            "organizacion": "organizar",
-            "organizaciones": "organizar",
-            "resolucion": "resolver",
-            "resoluciones": "resolver",
-            "ejecucion": "ejecutar",
-            "ejecuciones": "ejecutar",
-            "educacion": "educar",
-            "educaciones": "educar",
-            "analisis": "analizar",
-            "construccion": "construir",
-            "construcciones": "construir",
-            "produccion": "producir",
-            "producciones": "producir",
-            "evaluacion": "evaluar",
-            "evaluaciones": "evaluar",
-            "informacion": "informar",
-            "revision": "revisar",
-            "revisiones": "revisar",
-            "desarrollo": "desarrollar",
-            "desarrollos": "desarrollar",
-            "programacion": "programar",
-            "programaciones": "programar",
-            "implementacion": "implementar",
-            "implementaciones": "implementar",
-            "diseno": "disenar",
-            "disenos": "disenar",
-            "configuracion": "configurar",
-            "configuraciones": "configurar",
-            "integracion": "integrar",
-            "integraciones": "integrar",
-            "mantenimiento": "mantener",
-            "automatizacion": "automatizar",
-            "automatizaciones": "automatizar",
-            "optimizacion": "optimizar",
-            "optimizaciones": "optimizar",
-            "pruebas": "probar",
-            "testing": "probar",
-            "despliegue": "desplegar",
-            "despliegues": "desplegar",
-            "soporte": "soportar",
-            "migracion": "migrar",
-            "migraciones": "migrar",
-            "documentacion": "documentar",
-            "depuracion": "depurar",
-            "refactorizacion": "refactorizar",
-            "innovacion": "innovar",
-            "actualizacion": "actualizar",
-            "prueba": "probar",
-            "integracioncontinua": "integrar",
-            "desplieguecontinuo": "desplegar",
-            "postgres": "sql",
-            "postgresql": "sql",
-            "mariadb": "sql",
-            "mysql": "sql",
-            "adm": "administrar",
-            "administracion": "administrar",
-            "administraciones": "administrar",
-            "comunicacion": "comunicar",
-            "comunicaciones": "comunicar",
-            "liderazgo": "liderar",
-            "gestion": "gestionar",
-            "gestiones": "gestionar",
-            "estrategia": "estrategizar",
-            "estrategias": "estrategizar",
-            "planificacion": "planificar",
-            "planificaciones": "planificar",
-            "innovaciones": "innovar",
-            "experiencia": "experimentar",
-            "coordinacion": "coordinar",
-            "coordinaciones": "coordinar",
-            "proyecto": "proyectar",
-            "proyectos": "proyectar",
-            "code": "codigo"
-            }
-            doc_norm: Doc = doc.copy()
-            doc_norm_text = [custom_lemmas.get(token.lemma_, token.lemma_) for token in doc_norm if token.text.strip() and token.lemma_.strip() and not token.is_stop and token.pos_ != "ADP"]
-            doc_norm = model(" ".join(doc_norm_text))
-            logger.info(f"Norm tokens: {doc_norm_text}")
-
-            ability_doc: Doc = model(ability)
-            ability_doc_text = [custom_lemmas.get(token.lemma_, token.lemma_) for token in ability_doc if token.text.strip() and token.lemma_.strip() and not token.is_stop and token.pos_ != "ADP"]
-            ability_doc = model(" ".join(ability_doc_text))
+            ability_doc = parsed_ability.doc_norm
+            ability_doc_text = parsed_ability.norm_text
 
             if not ability_doc or len(ability_doc) == 0 or not all([token.has_vector for token in ability_doc]):
                 result["WORDS_NOT_FOUND"].append(ability)
                 logger.info(f"Skipping ability {ability} because it's empty or doesn't have a vector")
                 continue
 
-            token_groups: list[Span] = create_token_groups(doc_norm, len(ability_doc))
-            similarities: dict[Span, float] = {}
-            for token in token_groups:
-                if not token.text.strip():
-                    logger.info(f"Tried to evaluate similarity of empty token {token}")
-                    continue
-                elif not token.has_vector:
-                    logger.info(f"Tried to evaluate similarity of token without vector: {token}")
-                    continue
-                sum = 0
-                for token_i, ability_doc_i in zip(token, ability_doc):
-                    sum += token_i.similarity(ability_doc_i)
-                similarities[token] = sum / len(token)
-            logger.info(f"Similarities: {similarities}")
+            max_value, window_start = max_window_similarity(
+                cv.vectors, parsed_ability.vectors, similarity_threshold
+            )
 
-            max_item = max(similarities.items(), key=lambda item: item[1])
-            max_key = max_item[0]
-            max_value = max_item[1]
+            if window_start < 0:
+                result["WORDS_NOT_FOUND"].append(ability)
+                logger.info(f"Didn't match ability \"{ability}\" ({ability_doc_text}): no comparable tokens")
+                continue
+
+            max_key = cv.doc_norm[window_start : window_start + len(ability_doc)]
 
-            if similarities and max_value >= similarity_threshold:
+            if max_value >= similarity_threshold:
                 result["WORDS_FOUND"].append(ability)
                 logger.info(f"Matched ability \"{ability}\" ({ability_doc_text}) with max similarity {max_value} to \"{max_key}\"")
             else:
@@ -355,7 +633,7 @@ def match_abilities(text: str, abilities: list[str], model: Language, *, similar
                 logger.info(f"Didn't match ability \"{ability}\" ({ability_doc_text}) with max similarity {max_value} to \"{max_key}\"")
 
     processed_abilities = result["WORDS_FOUND"] + result["WORDS_NOT_FOUND"]
-    for ability in abilities:
+    for ability in ability_names:
         if ability not in processed_abilities:
             result["WORDS_NOT_FOUND"].append(ability)
 
@@ -365,36 +643,62 @@ def match_abilities(text: str, abilities: list[str], model: Language, *, similar
     return result
 
 
-def create_token_groups(doc: Doc, word_amount: int) -> list[Span]:
-    output_spans: list[Span] = []
+def max_window_similarity(
+    cv_vectors: np.ndarray, ability_vectors: np.ndarray, threshold: float
+) -> tuple[float, int]:
+    """
+    Busca la ventana de tokens consecutivos del CV, del largo de la habilidad,
+    más parecida a la habilidad sin importar el orden de las palabras.
+
+    El puntaje de una ventana es el promedio de similaridad coseno entre cada
+    palabra de la habilidad y la palabra de la ventana asignada a ella, con la
+    mejor asignación posible (equivale a probar todas las permutaciones).
+    Primero se calcula para todas las ventanas la cota superior que permite
+    repetir palabras (máximo por columna) y solo se resuelve la asignación
+    exacta en las ventanas cuya cota alcanza el umbral.
+
+    Devuelve el mejor puntaje exacto encontrado y el inicio de la ventana, o
+    `(0.0, -1)` si el CV tiene menos palabras que la habilidad.
+    """
+    word_amount = len(ability_vectors)
+    if word_amount == 0 or len(cv_vectors) < word_amount:
+        return 0.0, -1
 
-    for i in range(len(doc) - word_amount + 1):
-        token_group = doc[i : i + word_amount]
-        output_spans.append(token_group)
+    scores = cv_vectors @ ability_vectors.T
+    if word_amount == 1:
+        best = int(np.argmax(scores[:, 0]))
+        return float(scores[best, 0]), best
 
-        tokens_text = [token.text for token in token_group]
+    # windows[w, j, i] = similaridad entre el token w + i del CV y la palabra j
+    windows = sliding_window_view(scores, word_amount, axis=0)
+    upper_bounds = windows.max(axis=2).mean(axis=1)
+    candidates = np.argsort(-upper_bounds)
 
-        if word_amount >= 10:
-            logger.info(f"Skipping token group \"{tokens_text}\" permutations because word amount is too large ({word_amount})")
-        elif word_amount > 1:
-            perms = set(itertools.permutations(tokens_text))
-            for perm in perms:
-                if list(perm) == tokens_text:
-                    continue
-                new_doc = Doc(doc.vocab, words=list(perm))
-                new_span = new_doc[0:len(new_doc)]
-                output_spans.append(new_span)
+    best_value, best_start = -1.0, -1
+    for position, start in enumerate(candidates):
+        if position > 0 and upper_bounds[start] < max(threshold, best_value):
+            break
+        window = windows[start]
+        rows, cols = linear_sum_assignment(window, maximize=True)
+        value = float(window[rows, cols].mean())
+        if value > best_value:
+            best_value, best_start = value, int(start)
+        if best_value >= threshold:
+            break
 
-    logger.info(
-           f"Total token groups (including permutations): {len(output_spans)}. "
-           f"Groups: {[span.text for span in output_spans]}"
-       )
-    return output_spans
+    return best_value, best_start
+
+
+def load_spanish_model() -> Language:
+    return model_registry.get_spanish_model()
 
 
-def load_spanish_model():
-    return spacy.load("es_core_news_lg")
+def load_english_model() -> Language:
+    return model_registry.get_english_model()
 
 
-def load_english_model():
-    return spacy.load("en_core_web_lg")
+def get_model_stats() -> List[schema.ModelStatsResponse]:
+    return [
+        schema.ModelStatsResponse(**vars(stats))
+        for stats in model_registry.get_stats()
+    ]
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from spacy.language import Language
+from threading import Lock
+from time import perf_counter
+from os import getenv
+import gc
+import logging
+import resource
+import spacy
+
+logger = logging.getLogger("uvicorn.error")
+
+SPANISH_MODEL = "es_core_news_lg"
+ENGLISH_MODEL = "en_core_web_lg"
+
+# El matcher solo usa tokens, lemas, POS, stopwords y vectores, por lo que el
+# parser de dependencias y el reconocedor de entidades no se cargan.
+EXCLUDED_COMPONENTS = ["parser", "ner"]
+
+
+@dataclass
+class ModelStats:
+    name: str
+    components: list[str]
+    load_seconds: float
+    memory_bytes: int
+
+
+_models: dict[str, Language] = {}
+_stats: dict[str, ModelStats] = {}
+_lock = Lock()
+
+
+def _current_rss_bytes() -> int:
+    """
+    Devuelve la memoria residente actual del proceso. En sistemas sin
+    /proc se usa el pico de memoria informado por `resource`.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def get_model(name: str) -> Language:
+    """
+    Devuelve el pipeline de spaCy `name`, cargándolo una única vez por proceso.
+    Las siguientes llamadas reutilizan la misma instancia.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(name)
+        if model is not None:
+            return model
+
+        logger.info(f"Loading spaCy model {name} (excluding {EXCLUDED_COMPONENTS})...")
+        rss_before = _current_rss_bytes()
+        start = perf_counter()
+        model = spacy.load(name, exclude=EXCLUDED_COMPONENTS)
+        load_seconds = perf_counter() - start
+        memory_bytes = max(_current_rss_bytes() - rss_before, 0)
+
+        _models[name] = model
+        _stats[name] = ModelStats(
+            name=name,
+            components=list(model.pipe_names),
+            load_seconds=load_seconds,
+            memory_bytes=memory_bytes,
+        )
+        logger.info(
+            f"Loaded spaCy model {name} in {load_seconds:.2f}s "
+            f"(~{memory_bytes / (1024 * 1024):.1f} MiB)"
+        )
+        return model
+
+
+def get_spanish_model() -> Language:
+    return get_model(SPANISH_MODEL)
+
+
+def get_english_model() -> Language:
+    return get_model(ENGLISH_MODEL)
+
+
+def get_stats() -> list[ModelStats]:
+    return list(_stats.values())
+
+
+def preload_models() -> None:
+    """
+    Carga los modelos listados en `SPACY_PRELOAD_MODELS` (separados por coma).
+    Si se llama antes de crear los workers (por ejemplo `gunicorn --preload`),
+    los workers comparten las páginas del modelo por copy-on-write. `gc.freeze`
+    evita que el recolector toque esos objetos y fuerce la copia.
+    """
+    names = [
+        name.strip()
+        for name in getenv("SPACY_PRELOAD_MODELS", "").split(",")
+        if name.strip()
+    ]
+    for name in names:
+        get_model(name)
+    if names:
+        gc.freeze()
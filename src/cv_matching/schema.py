@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
+from enum import Enum
 
 
 class MatcherResponse(BaseModel):
@@ -11,3 +13,33 @@ class MatcherResponse(BaseModel):
     desired_words_found: list[str]
     required_words_not_found: list[str]
     desired_words_not_found: list[str]
+
+
+class ModelStatsResponse(BaseModel):
+    name: str
+    components: list[str]
+    load_seconds: float
+    memory_bytes: int
+
+
+class MatcherJobStatus(str, Enum):
+    PENDIENTE = "pendiente"
+    EN_PROCESO = "en_proceso"
+    FINALIZADO = "finalizado"
+    FALLIDO = "fallido"
+
+
+class MatcherJobResponse(BaseModel):
+    id: int
+    job_opportunity_id: int
+    status: MatcherJobStatus
+    incremental: bool
+    total: int
+    processed: int
+    skipped: int
+    failed: int
+    errors: dict[str, str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    results: list[MatcherResponse] = []
@@ -0,0 +1,361 @@
+"""
+Esquema de la base tal como lo creaba `init_db` antes de versionar las
+migraciones: tablas, columnas e índices de ese momento. Es una copia fija y no
+se modifica; un cambio de esquema va en su propia migración.
+"""
+
+from sqlalchemy import (
+    JSON,
+    TIMESTAMP,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    Time,
+    func,
+)
+
+BASELINE_METADATA = MetaData()
+
+
+Table(
+    "ability",
+    BASELINE_METADATA,
+    Column("name", String(50), unique=True, nullable=False),
+    Column("description", String(100), nullable=True),
+    Column("id", Integer(), primary_key=True, index=True),
+)
+
+Table(
+    "concept",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True),
+    Column("description", String(), nullable=False),
+    Column("is_deletable", Boolean(), nullable=False),
+)
+
+Table(
+    "country",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column("name", String(100), index=True, unique=True, nullable=False),
+)
+
+Table(
+    "leave_type",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column("type", String(), index=True, unique=True, nullable=False),
+    Column("justification_required", Boolean(), nullable=False),
+)
+
+Table(
+    "permission",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column("name", String(50), nullable=False),
+    Column("description", String(100), nullable=False),
+)
+
+Table(
+    "role",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column("name", String(50), nullable=False),
+    Column("description", String(100), nullable=False),
+)
+
+Table(
+    "sector",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column("name", String(100), index=True, unique=True, nullable=False),
+)
+
+Table(
+    "shift",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True),
+    Column("description", String(), nullable=False),
+    Column("type", String(), nullable=False),
+    Column("working_hours", Float(), nullable=False),
+    Column("working_days", Integer(), nullable=False),
+)
+
+Table(
+    "job",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column("name", String(100), index=True, nullable=False),
+    Column("sector_id", Integer(), ForeignKey("sector.id"), nullable=False),
+)
+
+Table(
+    "role_permission",
+    BASELINE_METADATA,
+    Column(
+        "role_id",
+        Integer(),
+        ForeignKey("role.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+    Column(
+        "permission_id",
+        Integer(),
+        ForeignKey("permission.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+)
+
+Table(
+    "state",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column("name", String(100), index=True, nullable=False),
+    Column("country_id", Integer(), ForeignKey("country.id"), nullable=False),
+)
+
+Table(
+    "employee",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column("user_id", String(100), unique=True, nullable=False),
+    Column("first_name", String(100), nullable=False),
+    Column("last_name", String(100), nullable=False),
+    Column("dni", String(50), unique=True, nullable=False),
+    Column("type_dni", String(10), nullable=False),
+    Column("personal_email", String(100), unique=True, nullable=False),
+    Column("active", Boolean(), nullable=False),
+    Column("role_id", Integer(), ForeignKey("role.id"), nullable=True),
+    Column("password", String(100), nullable=True),
+    Column("phone", String(20), unique=True, nullable=False),
+    Column("salary", Numeric(), nullable=False),
+    Column("job_id", Integer(), ForeignKey("job.id"), nullable=True),
+    Column("birth_date", Date(), nullable=False),
+    Column("hire_date", Date(), nullable=False),
+    Column("photo", LargeBinary(), nullable=True),
+    Column("address_street", String(100), nullable=False),
+    Column("address_city", String(100), nullable=False),
+    Column("address_cp", String(100), nullable=False),
+    Column("address_state_id", Integer(), ForeignKey("state.id"), nullable=True),
+    Column("address_country_id", Integer(), ForeignKey("country.id"), nullable=True),
+    Column("shift_id", Integer(), ForeignKey("shift.id"), nullable=True),
+)
+
+Table(
+    "clock_events",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True),
+    Column(
+        "employee_id",
+        Integer(),
+        ForeignKey("employee.id", ondelete="CASCADE"),
+        nullable=True,
+    ),
+    Column("event_date", DateTime(), nullable=False),
+    Column("event_type", Enum("IN", "OUT", name="clockeventtypes"), nullable=False),
+    Column("source", String(), nullable=False),
+    Column("device_id", String(), nullable=False),
+)
+
+Table(
+    "document",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column(
+        "employee_id",
+        Integer(),
+        ForeignKey("employee.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("name", String(50), nullable=False),
+    Column("extension", String(5), nullable=False),
+    Column("creation_date", Date(), nullable=False),
+    Column("file", LargeBinary(), nullable=False),
+    Column("active", Boolean(), nullable=False),
+)
+
+Table(
+    "employee_hours",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True),
+    Column(
+        "employee_id",
+        Integer(),
+        ForeignKey("employee.id", ondelete="CASCADE"),
+        nullable=True,
+    ),
+    Column("concept_id", Integer(), ForeignKey("concept.id"), nullable=True),
+    Column("shift_id", Integer(), ForeignKey("shift.id"), nullable=False),
+    Column("check_count", Integer(), nullable=False),
+    Column("work_date", Date(), nullable=False),
+    Column(
+        "register_type",
+        Enum("AUSENCIA", "PRESENCIA", "DIA_NO_HABIL", name="registertype"),
+        nullable=False,
+    ),
+    Column("first_check_in", Time(), nullable=True),
+    Column("last_check_out", Time(), nullable=True),
+    Column("sumary_time", Time(), nullable=True),
+    Column("extra_hours", Time(), nullable=True),
+    Column(
+        "payroll_status",
+        Enum(
+            "PAYABLE", "NOT_PAYABLE", "ARCHIVED", "PENDING_VALIDATION", name="paytype"
+        ),
+        nullable=False,
+    ),
+    Column("notes", String(), nullable=False),
+)
+
+Table(
+    "face_recognition",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column("employee_id", Integer(), ForeignKey("employee.id"), nullable=False),
+    Column("embedding", JSON(), nullable=True),
+)
+
+Table(
+    "job_opportunity",
+    BASELINE_METADATA,
+    Column(
+        "owner_employee_id",
+        Integer(),
+        ForeignKey("employee.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column(
+        "status",
+        Enum("ACTIVO", "NO_ACTIVO", name="jobopportunitystatus"),
+        nullable=False,
+    ),
+    Column(
+        "work_mode",
+        Enum("REMOTO", "HIBRIDO", "PRESENCIAL", name="jobopportunityworkmode"),
+        nullable=False,
+    ),
+    Column("title", String(100), nullable=False),
+    Column("description", String(1000), nullable=False),
+    Column("budget", Integer(), nullable=False),
+    Column("budget_currency_id", String(3), nullable=False),
+    Column("state_id", Integer(), nullable=False),
+    Column("created_at", DateTime(), nullable=False),
+    Column("updated_at", DateTime(), nullable=False),
+    Column("id", Integer(), primary_key=True, index=True),
+)
+
+Table(
+    "leave",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column(
+        "employee_id",
+        Integer(),
+        ForeignKey("employee.id"),
+        index=True,
+        nullable=False,
+    ),
+    Column("request_date", Date(), index=True, nullable=False),
+    Column("start_date", Date(), index=True, nullable=False),
+    Column("end_date", Date(), index=True, nullable=False),
+    Column("file", String(), nullable=True),
+    Column("leave_type_id", Integer(), ForeignKey("leave_type.id"), nullable=False),
+    Column("reason", String(), nullable=True),
+    Column("document_status", String(), index=True, nullable=False),
+    Column("request_status", String(), index=True, nullable=False),
+    Column("observations", String(), nullable=True),
+    Column(
+        "created_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    Column(
+        "updated_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+)
+
+Table(
+    "work_history",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column(
+        "employee_id",
+        Integer(),
+        ForeignKey("employee.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("job_id", Integer(), ForeignKey("job.id"), nullable=False),
+    Column("from_date", Date(), nullable=False),
+    Column("to_date", Date(), nullable=False),
+    Column("company_name", String(40), index=True, nullable=False),
+    Column("notes", String(100), nullable=False),
+)
+
+Table(
+    "job_opportunity_ability",
+    BASELINE_METADATA,
+    Column(
+        "job_opportunity_id",
+        Integer(),
+        ForeignKey("job_opportunity.id"),
+        primary_key=True,
+    ),
+    Column("ability_id", Integer(), ForeignKey("ability.id"), primary_key=True),
+    Column(
+        "ability_type",
+        Enum("REQUERIDA", "DESEADA", name="jobopportunityabilityimportance"),
+        nullable=False,
+    ),
+)
+
+Table(
+    "postulation",
+    BASELINE_METADATA,
+    Column("id", Integer(), primary_key=True, index=True),
+    Column(
+        "job_opportunity_id",
+        Integer(),
+        ForeignKey("job_opportunity.id"),
+        nullable=False,
+    ),
+    Column("name", String(50), nullable=False),
+    Column("surname", String(50), nullable=False),
+    Column("email", String(100), nullable=False),
+    Column("phone_number", String(100), nullable=False),
+    Column("address_country_id", Integer(), ForeignKey("country.id"), nullable=False),
+    Column("address_state_id", Integer(), ForeignKey("state.id"), nullable=False),
+    Column("cv_file", String(), nullable=False),
+    Column("evaluated_at", DateTime(), nullable=True),
+    Column("suitable", Boolean(), nullable=False),
+    Column("ability_match", JSON(), nullable=True),
+    Column("created_at", DateTime(), nullable=False),
+    Column("updated_at", DateTime(), nullable=False),
+    Column(
+        "status",
+        Enum(
+            "PENDIENTE",
+            "ACEPTADA",
+            "NO_ACEPTADA",
+            "CONTRATADO",
+            name="postulationstatus",
+        ),
+        nullable=False,
+    ),
+    Column("motive", String(), nullable=True),
+)
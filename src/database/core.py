@@ -1,8 +1,11 @@
 from contextlib import asynccontextmanager
 from typing import Annotated
 from fastapi import Depends
+from sqlalchemy.engine import make_url
 from sqlalchemy.event import listen
-from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import FastAPI
 from dotenv import load_dotenv
 from os import getenv
@@ -21,6 +24,7 @@ from src.modules.employees.models.sector import Sector
 from src.modules.employees.models.state import State
 from src.modules.employees.models.work_history import WorkHistory
 from src.modules.postulation.models.postulation_models import Postulation
+from src.modules.role.models.role_models import Permission, Role, RolePermission
 from src.modules.shift.models.models import Shift
 from src.modules.configuration.config_models import Configuration
 from src.modules.leave.models.leave_models import Leave
@@ -28,6 +32,19 @@ from src.modules.opportunity.models.job_opportunity_models import (
     JobOpportunityAbility,
     JobOpportunityModel,
 )
+from src.cv_matching.job_models import MatcherJob
+from src.cv_matching.cache_models import CvTextCache
+from src.modules.payroll_calculator.run_models import PayrollRun
+from src.modules.payroll_calculator.summary_models import PayrollMonthlySummary
+from src.modules.face_recognition.models.face_recognition import FaceRecognition
+from src.database.migrations import LATEST_VERSION, SchemaVersion, read_version
+from src.database.pool import PoolConfig, PoolMetrics, engine_options
+from src.database.routing import (
+    DB_REPLICA_CONNECT_TIMEOUT_SECONDS,
+    Replica,
+    ReplicaRouter,
+    RoutingSession,
+)
 
 logger = logging.getLogger("uvicorn.info")
 
@@ -42,8 +59,11 @@ elif use_test_database.lower() == "true":
 else:
     logger.info("Using PostgreSQL database")
     url = str(getenv("DATABASE_URL"))
-engine = create_engine(url)
+pool_config = PoolConfig.from_env()
+engine = create_engine(url, **engine_options(url, pool_config))
+engine_metrics = PoolMetrics("primary", engine)
 logger.info(f"Engine name: {engine.name}")
+logger.info(f"Database pool: {pool_config}")
 
 
 def set_sqlite_pragma(dbapi_connection, connection_record):
@@ -57,8 +77,81 @@ if engine.name == "sqlite":
     listen(engine, "connect", set_sqlite_pragma)
 
 
+# Driver async de cada motor para el engine de los endpoints async
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def to_async_url(database_url: str):
+    parsed = make_url(database_url)
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.get_backend_name()])
+
+
+async_engine = create_async_engine(
+    to_async_url(url), **engine_options(url, pool_config, asynchronous=True)
+)
+async_engine_metrics = PoolMetrics("primary_async", async_engine.sync_engine)
+if async_engine.dialect.name == "sqlite":
+    listen(async_engine.sync_engine, "connect", set_sqlite_pragma)
+
+
+def create_replica(index: int, replica_url: str) -> Replica:
+    # Con un timeout de conexión corto una réplica caída se descarta rápido
+    replica = Replica(
+        f"replica_{index}",
+        create_engine(
+            replica_url,
+            **engine_options(
+                replica_url,
+                pool_config,
+                connect_timeout=DB_REPLICA_CONNECT_TIMEOUT_SECONDS,
+            ),
+        ),
+        create_async_engine(
+            to_async_url(replica_url),
+            **engine_options(
+                replica_url,
+                pool_config,
+                asynchronous=True,
+                connect_timeout=DB_REPLICA_CONNECT_TIMEOUT_SECONDS,
+            ),
+        ),
+    )
+    if replica.engine.name == "sqlite":
+        listen(replica.engine, "connect", set_sqlite_pragma)
+        listen(replica.async_engine.sync_engine, "connect", set_sqlite_pragma)
+    return replica
+
+
+# Réplicas de lectura separadas por coma; sin réplicas todo va al primario
+replica_urls = [
+    replica_url.strip()
+    for replica_url in getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if replica_url.strip()
+]
+replica_router = ReplicaRouter(
+    [create_replica(i, replica_url) for i, replica_url in enumerate(replica_urls)]
+)
+if replica_router.replicas:
+    logger.info(f"Read replicas: {len(replica_router.replicas)}")
+
+pool_metrics = [engine_metrics, async_engine_metrics]
+for replica in replica_router.replicas:
+    pool_metrics.append(PoolMetrics(replica.name, replica.engine))
+    pool_metrics.append(
+        PoolMetrics(f"{replica.name}_async", replica.async_engine.sync_engine)
+    )
+
+
 def init_db():
-    SQLModel.metadata.create_all(engine)
+    # Las migraciones no corren al arrancar: construir índices sobre tablas
+    # grandes demoraría el arranque. Se aplican antes, con
+    # `python -m src.database.migrate upgrade`; acá solo se avisa si faltan
+    version = read_version(engine)
+    if version < LATEST_VERSION:
+        logger.warning(
+            f"Database schema is at version {version}, latest is {LATEST_VERSION}: "
+            "run python -m src.database.migrate upgrade"
+        )
 
 
 def get_session():
@@ -66,10 +159,54 @@ def get_session():
         yield session
 
 
+def open_read_session() -> RoutingSession:
+    """
+    Sesión para lecturas: los SELECT van a una réplica al día (o al primario
+    si no hay ninguna) y cualquier escritura, y lo que se lea después, al
+    primario.
+    """
+    replica = replica_router.choose()
+    return RoutingSession(engine, replica.engine if replica else None)
+
+
+def get_read_session():
+    with open_read_session() as session:
+        yield session
+
+
+async def get_async_session():
+    # Sin expirar al confirmar: en async no se puede recargar un atributo
+    # de forma implícita al serializar la respuesta
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_read_session():
+    replica = replica_router.choose()
+    async with AsyncSession(
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        primary=async_engine.sync_engine,
+        replica=replica.async_engine.sync_engine if replica else None,
+    ) as session:
+        yield session
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    replica_router.start()
     yield
+    await async_engine.dispose()
+    for replica in replica_router.replicas:
+        await replica.async_engine.dispose()
 
 
 DatabaseSession = Annotated[Session, Depends(get_session)]
+# Para endpoints `async def`: las consultas no bloquean el event loop. Las
+# relaciones se tienen que cargar en la consulta (no hay lazy loading).
+AsyncDatabaseSession = Annotated[AsyncSession, Depends(get_async_session)]
+# Para endpoints que solo leen: pueden ir a una réplica con unos segundos de
+# retraso, así que no sirven para leer algo recién escrito en otro request.
+ReadDatabaseSession = Annotated[Session, Depends(get_read_session)]
+AsyncReadDatabaseSession = Annotated[AsyncSession, Depends(get_async_read_session)]
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from src.database.core import engine, pool_metrics, replica_router
+from src.database.pool import DatabaseHealthResponse, ReplicaStatus
+from time import perf_counter
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+health_router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@health_router.get(
+    "/db",
+    status_code=status.HTTP_200_OK,
+    response_model=DatabaseHealthResponse,
+    responses={503: {"model": DatabaseHealthResponse}},
+)
+def database_health():
+    """
+    Verifica la conexión a la base con un `SELECT 1` y devuelve el estado de
+    los pools: conexiones en uso, libres y de overflow, y el tiempo de espera
+    para obtener una, además del retraso de cada réplica. Si la base no
+    responde devuelve 503 con las mismas métricas, que es cuando más sirven.
+    El primario se verifica primero, así su latencia no incluye la de las
+    réplicas, que se miden después con su timeout de conexión corto.
+    """
+    started = perf_counter()
+    error: Exception | None = None
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as e:
+        error = e
+    latency_ms = (perf_counter() - started) * 1000
+
+    replica_router.refresh()
+    replicas = [
+        ReplicaStatus(
+            name=replica.name,
+            lag_seconds=replica.lag_seconds,
+            usable=replica.usable(),
+        )
+        for replica in replica_router.replicas
+    ]
+    if error is not None:
+        logger.error(f"Database health check failed: {error}")
+        response = DatabaseHealthResponse(
+            status="unavailable",
+            latency_ms=None,
+            detail=type(error).__name__,
+            pools=[metrics.snapshot() for metrics in pool_metrics],
+            replicas=replicas,
+        )
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=response.model_dump(),
+        )
+
+    return DatabaseHealthResponse(
+        status="ok",
+        latency_ms=latency_ms,
+        pools=[metrics.snapshot() for metrics in pool_metrics],
+        replicas=replicas,
+    )
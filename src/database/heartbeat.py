@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from sqlalchemy import Table, update
+from socket import gethostname
+from src.database.core import engine
+from threading import Lock, Thread
+from time import sleep
+from os import getenv, getpid
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+# Cada cuánto el proceso que ejecuta un trabajo en segundo plano renueva su
+# latido, y a partir de cuándo un trabajo sin latido se da por interrumpido
+JOB_HEARTBEAT_SECONDS = float(getenv("JOB_HEARTBEAT_SECONDS", "15"))
+JOB_STALE_SECONDS = float(getenv("JOB_STALE_SECONDS", "60"))
+
+
+def worker_id() -> str:
+    # Se calcula en cada llamada: con preload los workers heredan los módulos
+    # ya importados del proceso padre, pero cada uno tiene su propio PID
+    return f"{gethostname()}:{getpid()}"
+
+
+def stale_before() -> datetime:
+    """
+    Un trabajo en curso con el último latido anterior a este momento quedó
+    huérfano: el proceso que lo ejecutaba se reinició o se cayó.
+    """
+    return datetime.now() - timedelta(seconds=JOB_STALE_SECONDS)
+
+
+class Heartbeat:
+    """
+    Renueva `heartbeat_at` de las filas que este proceso está ejecutando
+    (columnas `worker_id` y `heartbeat_at` de la tabla) desde un thread
+    propio, así el latido no depende de que el trabajo haga commits. Solo
+    toca las filas cuyo `worker_id` es el de este proceso.
+    """
+
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self._ids: set[int] = set()
+        self._lock = Lock()
+        self._thread: Thread | None = None
+
+    def add(self, row_id: int) -> None:
+        with self._lock:
+            self._ids.add(row_id)
+            # El thread se crea en el primer uso, ya dentro del worker
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(
+                    target=self._run,
+                    name=f"{self.table.name}-heartbeat",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def discard(self, row_id: int) -> None:
+        with self._lock:
+            self._ids.discard(row_id)
+
+    def beat(self) -> None:
+        with self._lock:
+            ids = list(self._ids)
+        if not ids:
+            return
+        with engine.begin() as connection:
+            connection.execute(
+                update(self.table)
+                .where(self.table.c.id.in_(ids))
+                .where(self.table.c.worker_id == worker_id())
+                .values(heartbeat_at=datetime.now())
+            )
+
+    def _run(self) -> None:
+        while True:
+            sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                self.beat()
+            except Exception as e:
+                logger.warning(f"Heartbeat of {self.table.name} failed: {e}")
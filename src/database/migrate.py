@@ -0,0 +1,32 @@
+"""
+Corre las migraciones del esquema. La aplicación no las aplica al arrancar:
+se corren antes de levantarla, por ejemplo como paso del deploy.
+
+    python -m src.database.migrate upgrade
+    python -m src.database.migrate current
+
+Es un módulo aparte de `migrations` para que `python -m` no cargue ese
+módulo dos veces (como `__main__` y al importarlo `core`).
+"""
+
+from argparse import ArgumentParser
+from src.database.core import engine
+from src.database.migrations import LATEST_VERSION, read_version, run_migrations
+
+
+def main() -> None:
+    parser = ArgumentParser(
+        description="Migraciones versionadas del esquema de la base."
+    )
+    parser.add_argument("command", choices=["upgrade", "current"])
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        applied = run_migrations(engine)
+        print(f"Applied {applied} migrations, schema at version {LATEST_VERSION}")
+    else:
+        print(f"Schema version {read_version(engine)} (latest {LATEST_VERSION})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+from dataclasses import dataclass
+from datetime import datetime
+from sqlalchemy import Connection, Engine, Index, inspect, text
+from sqlmodel import Field, SQLModel, func, select
+from src.database.baseline_schema import BASELINE_METADATA
+from src.modules.face_recognition.services.embedding_migration import (
+    migrate_embedding_storage,
+    prepare_embedding_storage,
+)
+from typing import Callable
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+# Clave del advisory lock de PostgreSQL que serializa dos corridas de las
+# migraciones al mismo tiempo (por ejemplo, dos deploys)
+MIGRATION_LOCK_KEY = 7_345_001
+
+
+class SchemaVersion(SQLModel, table=True):
+    """
+    Una fila por migración aplicada. La versión actual es la mayor.
+    """
+
+    __tablename__ = "schema_version"  # type: ignore
+
+    version: int = Field(primary_key=True)
+    name: str
+    applied_at: datetime = Field(default_factory=datetime.now)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Cambio de esquema versionado. `apply` tiene que ser idempotente: si el
+    proceso se corta entre aplicarla y registrarla, se vuelve a correr.
+    """
+
+    version: int
+    name: str
+    apply: Callable[[Engine], None]
+
+
+def create_table(engine: Engine, table_name: str) -> None:
+    """
+    Crea una tabla nueva, con sus índices, si no existe. Se toma de la
+    metadata de los modelos, que tienen que estar importados.
+    """
+    SQLModel.metadata.tables[table_name].create(engine, checkfirst=True)
+
+
+def add_column(engine: Engine, table_name: str, column_name: str) -> None:
+    """
+    Agrega a una tabla existente una columna declarada en el modelo, si no
+    la tiene. La columna tiene que admitir NULL.
+    """
+    if column_name in {
+        column["name"] for column in inspect(engine).get_columns(table_name)
+    }:
+        return
+    column_type = (
+        SQLModel.metadata.tables[table_name]
+        .c[column_name]
+        .type.compile(dialect=engine.dialect)
+    )
+    with engine.begin() as connection:
+        connection.execute(
+            text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+        )
+
+
+def _index_is_invalid(connection: Connection, name: str) -> bool:
+    # Un CREATE INDEX CONCURRENTLY cortado deja el índice creado pero inválido
+    return bool(
+        connection.execute(
+            text(
+                "SELECT NOT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+            ),
+            {"name": name},
+        ).scalar()
+    )
+
+
+def create_index(engine: Engine, name: str, table_name: str, *columns: str) -> None:
+    """
+    Crea un índice si no existe. Las columnas se toman de la metadata de los
+    modelos, que tienen que estar importados. En PostgreSQL se construye con
+    CONCURRENTLY, fuera de una transacción, para no bloquear las escrituras
+    sobre la tabla mientras se arma; si una corrida anterior lo dejó
+    inválido se borra y se vuelve a crear.
+    """
+    table = SQLModel.metadata.tables[table_name]
+    index = Index(
+        name, *(table.c[column] for column in columns), postgresql_concurrently=True
+    )
+    with engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        if engine.name == "postgresql" and _index_is_invalid(connection, name):
+            logger.warning(f"Rebuilding invalid index {name}")
+            connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        index.create(connection, checkfirst=True)
+    # No queda asociado a la tabla: lo declara el modelo
+    table.indexes.discard(index)
+
+
+def baseline(engine: Engine) -> None:
+    """
+    Esquema previo al versionado, copiado en `baseline_schema`: crea las
+    tablas que falten con los índices de ese momento. No depende de los
+    modelos actuales y sobre una base existente no cambia nada.
+    `configuration` se toma de su modelo (no forma parte de la copia).
+    """
+    BASELINE_METADATA.create_all(engine)
+    create_table(engine, "configuration")
+
+
+def feature_tables(engine: Engine) -> None:
+    """
+    Tablas agregadas después de la base: jobs y caché de CVs del matcher,
+    corridas de liquidación y resumen mensual de horas.
+    """
+    for table_name in [
+        "matcher_job",
+        "cv_text_cache",
+        "payroll_run",
+        "payroll_monthly_summary",
+    ]:
+        create_table(engine, table_name)
+
+
+def face_embedding_storage(engine: Engine) -> None:
+    """
+    Pasa los embeddings faciales de JSON a float32 (o pgvector): agrega la
+    columna `embedding_f32` y convierte los registros existentes por lotes.
+    """
+    prepare_embedding_storage(engine)
+    migrate_embedding_storage(engine)
+
+
+def foreign_key_indexes(engine: Engine) -> None:
+    """
+    Índices de las claves foráneas que se usan para filtrar y para los JOIN.
+    `employee_hours.employee_id` y `clock_events.employee_id` quedan
+    cubiertos por los índices compuestos de `hot_path_indexes`, que empiezan
+    por esa columna.
+    """
+    for table_name, column in [
+        ("employee_hours", "concept_id"),
+        ("employee_hours", "shift_id"),
+        ("postulation", "job_opportunity_id"),
+        ("postulation", "address_country_id"),
+        ("postulation", "address_state_id"),
+        ("document", "employee_id"),
+    ]:
+        create_index(engine, f"ix_{table_name}_{column}", table_name, column)
+
+
+def hot_path_indexes(engine: Engine) -> None:
+    """
+    Índices compuestos de las consultas más frecuentes (ver
+    `src/database/query_plans.py`).
+    """
+    create_index(
+        engine,
+        "ix_clock_events_employee_id_event_date",
+        "clock_events",
+        "employee_id",
+        "event_date",
+    )
+    create_index(
+        engine,
+        "ix_employee_hours_employee_id_work_date_payroll_status",
+        "employee_hours",
+        "employee_id",
+        "work_date",
+        "payroll_status",
+    )
+    create_index(
+        engine,
+        "ix_employee_hours_payroll_status_id",
+        "employee_hours",
+        "payroll_status",
+        "id",
+    )
+    create_index(
+        engine,
+        "ix_job_opportunity_ability_job_opportunity_id_ability_type",
+        "job_opportunity_ability",
+        "job_opportunity_id",
+        "ability_type",
+    )
+
+
+def matcher_job_heartbeat(engine: Engine) -> None:
+    """
+    Dueño y último latido de cada job del matcher, para reconocer los que
+    quedaron huérfanos.
+    """
+    add_column(engine, "matcher_job", "worker_id")
+    add_column(engine, "matcher_job", "heartbeat_at")
+
+
+def face_recognition_updated_at(engine: Engine) -> None:
+    """
+    Fecha de la última modificación de cada rostro, para que el índice
+    facial de cada worker detecte los cambios.
+    """
+    add_column(engine, "face_recognition", "updated_at")
+
+
+def payroll_run_heartbeat(engine: Engine) -> None:
+    """
+    Dueño y último latido de cada liquidación, para que dos workers no la
+    ejecuten a la vez.
+    """
+    add_column(engine, "payroll_run", "worker_id")
+    add_column(engine, "payroll_run", "heartbeat_at")
+
+
+# En orden; una migración nueva se agrega al final con la versión siguiente
+MIGRATIONS = [
+    Migration(1, "baseline", baseline),
+    Migration(2, "feature_tables", feature_tables),
+    Migration(3, "face_embedding_storage", face_embedding_storage),
+    Migration(4, "foreign_key_indexes", foreign_key_indexes),
+    Migration(5, "hot_path_indexes", hot_path_indexes),
+    Migration(6, "matcher_job_heartbeat", matcher_job_heartbeat),
+    Migration(7, "face_recognition_updated_at", face_recognition_updated_at),
+    Migration(8, "payroll_run_heartbeat", payroll_run_heartbeat),
+]
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(connection: Connection) -> int:
+    version = connection.execute(select(func.max(SchemaVersion.version))).scalar()
+    return version or 0
+
+
+def read_version(engine: Engine) -> int:
+    """
+    Versión aplicada, sin crear nada: 0 si la base todavía no tiene la tabla
+    de versiones.
+    """
+    if not inspect(engine).has_table(SchemaVersion.__tablename__):
+        return 0
+    with engine.connect() as connection:
+        return current_version(connection)
+
+
+def _apply_pending(engine: Engine) -> int:
+    SchemaVersion.__table__.create(engine, checkfirst=True)  # type: ignore
+    with engine.connect() as connection:
+        version = current_version(connection)
+
+    applied = 0
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        logger.info(f"Applying migration {migration.version} ({migration.name})")
+        migration.apply(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                SchemaVersion.__table__.insert().values(  # type: ignore
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now(),
+                )
+            )
+        applied += 1
+    return applied
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Aplica las migraciones pendientes y devuelve cuántas aplicó. Si la base
+    ya está en la última versión solo lee la versión: no inspecciona las
+    tablas ni los índices.
+    """
+    version = read_version(engine)
+    if version >= LATEST_VERSION:
+        logger.info(f"Database schema is current (version {version})")
+        return 0
+
+    if engine.name != "postgresql":
+        applied = _apply_pending(engine)
+    else:
+        # Todo lo que escribe, incluida la creación de `schema_version`, va
+        # dentro del lock para que dos workers no lo hagan a la vez
+        with engine.connect() as lock_connection:
+            lock_connection.execute(
+                text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+            lock_connection.commit()
+            try:
+                # Otro worker pudo haberlas aplicado mientras se esperaba el lock
+                applied = _apply_pending(engine)
+            finally:
+                lock_connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+                )
+                lock_connection.commit()
+
+    logger.info(f"Database schema migrated to version {LATEST_VERSION}")
+    return applied
@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from pydantic import BaseModel
+from sqlalchemy import Engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.event import listen
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from threading import Lock
+from time import perf_counter
+from os import getenv
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    Configuración del pool de conexiones, leída del entorno.
+    `statement_timeout_ms` en 0 deja las consultas sin límite (solo aplica a
+    PostgreSQL).
+    """
+
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+    statement_timeout_ms: int
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        return cls(
+            pool_size=int(getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(getenv("DB_POOL_RECYCLE", "1800")),
+            pool_pre_ping=getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+            statement_timeout_ms=int(getenv("DB_STATEMENT_TIMEOUT_MS", "0")),
+        )
+
+
+class PoolStatus(BaseModel):
+    name: str
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    wait_count: int
+    wait_avg_ms: float
+    wait_max_ms: float
+
+
+class ReplicaStatus(BaseModel):
+    name: str
+    lag_seconds: float | None
+    usable: bool
+
+
+class DatabaseHealthResponse(BaseModel):
+    status: str
+    latency_ms: float | None
+    detail: str | None = None
+    pools: list[PoolStatus]
+    replicas: list[ReplicaStatus] = []
+
+
+class PoolMetrics:
+    """
+    Estado de un pool alimentado por sus eventos. El tiempo de espera de cada
+    checkout lo informan los pools `Measured*`, porque SQLAlchemy no emite un
+    evento al empezar a esperar una conexión.
+    """
+
+    def __init__(self, name: str, engine: Engine) -> None:
+        self.name = name
+        self.engine = engine
+        self._lock = Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+        pool = engine.pool
+        listen(pool, "checkout", self._on_checkout)
+        listen(pool, "connect", self._on_connect)
+        listen(pool, "invalidate", self._on_invalidate)
+        if isinstance(pool, MeasuredPoolMixin):
+            pool.metrics = self
+
+    def _on_checkout(self, *args) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_connect(self, *args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, *args) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> PoolStatus:
+        # Se lee el pool actual: `dispose()` lo reemplaza por uno nuevo
+        pool = self.engine.pool
+        queue_pool = isinstance(pool, QueuePool)
+        with self._lock:
+            return PoolStatus(
+                name=self.name,
+                size=pool.size() if queue_pool else 0,  # type: ignore
+                checked_out=pool.checkedout() if queue_pool else 0,  # type: ignore
+                idle=pool.checkedin() if queue_pool else 0,  # type: ignore
+                overflow=max(pool.overflow(), 0) if queue_pool else 0,  # type: ignore
+                checkouts=self.checkouts,
+                connects=self.connects,
+                invalidations=self.invalidations,
+                timeouts=self.timeouts,
+                wait_count=self.wait_count,
+                wait_avg_ms=(
+                    self.wait_total / self.wait_count * 1000 if self.wait_count else 0.0
+                ),
+                wait_max_ms=self.wait_max * 1000,
+            )
+
+
+class MeasuredPoolMixin:
+    """
+    Mide cuánto espera cada pedido de conexión al pool, incluidos los que
+    terminan en timeout por pool agotado.
+    """
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait(perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()  # type: ignore
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeasuredQueuePool(MeasuredPoolMixin, QueuePool):
+    pass
+
+
+class MeasuredAsyncQueuePool(MeasuredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(
+    database_url: str | URL,
+    config: PoolConfig,
+    asynchronous: bool = False,
+    connect_timeout: int | None = None,
+) -> dict:
+    """
+    Argumentos de `create_engine` / `create_async_engine` para el pool. Una
+    base SQLite en memoria mantiene su pool por defecto: con QueuePool cada
+    conexión vería una base distinta. `connect_timeout` (segundos, solo
+    PostgreSQL) limita cuánto se espera a un servidor que no responde.
+    """
+    parsed = make_url(database_url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+
+    options: dict = {
+        "poolclass": MeasuredAsyncQueuePool if asynchronous else MeasuredQueuePool,
+        "pool_size": config.pool_size,
+        "max_overflow": config.max_overflow,
+        "pool_timeout": config.pool_timeout,
+        "pool_recycle": config.pool_recycle,
+        "pool_pre_ping": config.pool_pre_ping,
+    }
+    if backend != "postgresql":
+        return options
+
+    connect_args: dict = {}
+    if config.statement_timeout_ms > 0:
+        timeout = str(config.statement_timeout_ms)
+        if asynchronous:
+            connect_args["server_settings"] = {"statement_timeout": timeout}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    if connect_timeout:
+        # asyncpg lo llama `timeout`; libpq, `connect_timeout`
+        connect_args["timeout" if asynchronous else "connect_timeout"] = connect_timeout
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
@@ -0,0 +1,202 @@
+"""
+Revisa el plan de las consultas más frecuentes y avisa cuáles recorren una
+tabla entera en lugar de usar un índice.
+
+    python -m src.database.query_plans
+    python -m src.database.query_plans --verbose
+
+Corre EXPLAIN (no ejecuta las consultas) contra la base configurada y sale
+con código 1 si alguna hace un scan secuencial de una tabla que no lo tiene
+permitido. En PostgreSQL se desalientan los scans secuenciales durante la
+revisión: con pocas filas el planner los elige aunque haya un índice, y lo
+que interesa es saber si el índice existe y se puede usar.
+"""
+
+from argparse import ArgumentParser
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+from sqlalchemy import Connection, func
+from sqlalchemy.sql import Executable
+from sqlmodel import select
+from src.database.core import engine
+from src.modules.clock_events.services.services import (
+    ATTENDANCE_RESUME_QUERY,
+    attendance_resume_params,
+    build_clock_events_query,
+)
+from src.modules.employees.models.documents import Document
+from src.modules.opportunity.models.job_opportunity_models import (
+    JobOpportunityAbility,
+)
+from src.modules.opportunity.schemas.job_opportunity_schemas import (
+    JobOpportunityAbilityImportance,
+)
+from src.modules.payroll_calculator.schemas import (
+    PayrollHoursRequest,
+    PayrollPendingValidationRequest,
+)
+from src.modules.payroll_calculator.service import (
+    build_hours_query,
+    build_pending_validation_query,
+)
+from src.modules.postulation.models.postulation_models import Postulation
+import json
+import sys
+
+SAMPLE_ID = 1
+SAMPLE_DAY = date(2025, 1, 15)
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """
+    Consulta a revisar. `build` devuelve la sentencia con parámetros de
+    ejemplo; `allowed_scans` son las tablas (o alias) que se pueden recorrer
+    enteras, por ejemplo los empleados activos del resumen de asistencia.
+    """
+
+    name: str
+    build: Callable[[], tuple[Executable, dict]]
+    allowed_scans: tuple[str, ...] = ()
+
+
+HOT_QUERIES = [
+    HotQuery(
+        "payroll_hours",
+        lambda: (
+            build_hours_query(
+                SAMPLE_ID,
+                PayrollHoursRequest(
+                    employee_id=SAMPLE_ID, start_date=SAMPLE_DAY, end_date=SAMPLE_DAY
+                ),
+            ),
+            {},
+        ),
+    ),
+    HotQuery(
+        "pending_validation_hours",
+        lambda: (build_pending_validation_query(PayrollPendingValidationRequest()), {}),
+    ),
+    HotQuery(
+        "clock_events",
+        lambda: (build_clock_events_query(SAMPLE_ID, SAMPLE_DAY), {}),
+    ),
+    HotQuery(
+        "attendance_resume",
+        lambda: (ATTENDANCE_RESUME_QUERY, attendance_resume_params(SAMPLE_DAY)),
+        allowed_scans=("e",),
+    ),
+    HotQuery(
+        "postulation_count",
+        lambda: (
+            select(func.count(Postulation.id)).where(  # type: ignore
+                Postulation.job_opportunity_id == SAMPLE_ID
+            ),
+            {},
+        ),
+    ),
+    HotQuery(
+        "job_opportunity_abilities",
+        lambda: (
+            select(JobOpportunityAbility.ability_id)
+            .where(JobOpportunityAbility.job_opportunity_id == SAMPLE_ID)
+            .where(
+                JobOpportunityAbility.ability_type
+                == JobOpportunityAbilityImportance.REQUERIDA
+            ),
+            {},
+        ),
+    ),
+    HotQuery(
+        "employee_documents",
+        lambda: (select(Document).where(Document.employee_id == SAMPLE_ID), {}),
+    ),
+]
+
+
+def _compile(connection: Connection, statement: Executable, params: dict) -> str:
+    if params:
+        statement = statement.params(**params)  # type: ignore
+    return str(
+        statement.compile(  # type: ignore
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def _postgres_scans(plan: dict) -> list[str]:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append(plan.get("Alias") or plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        scans.extend(_postgres_scans(child))
+    return scans
+
+
+def explain(connection: Connection, sql: str) -> tuple[list[str], list[str]]:
+    """
+    Devuelve las líneas del plan y las tablas (o alias) que se recorren con
+    un scan secuencial.
+    """
+    if connection.dialect.name == "postgresql":
+        result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        plan = (result if isinstance(result, list) else json.loads(result))[0]["Plan"]
+        lines = json.dumps(plan, indent=2).splitlines()
+        return lines, _postgres_scans(plan)
+
+    # SQLite: "SCAN t" recorre la tabla; "SEARCH t USING INDEX ..." o
+    # "SCAN t USING COVERING INDEX ..." usan un índice
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+    lines = [row[-1] for row in rows]
+    scans = [
+        line.split()[1]
+        for line in lines
+        if line.startswith("SCAN ") and " USING " not in line
+    ]
+    return lines, scans
+
+
+def check_query_plans(verbose: bool = False) -> list[str]:
+    """
+    Revisa todas las consultas registradas y devuelve los nombres de las que
+    hacen un scan secuencial no permitido.
+    """
+    flagged = []
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        for query in HOT_QUERIES:
+            statement, params = query.build()
+            lines, scans = explain(connection, _compile(connection, statement, params))
+            not_allowed = [scan for scan in scans if scan not in query.allowed_scans]
+            if not_allowed:
+                flagged.append(query.name)
+                print(f"SEQ SCAN  {query.name}: {', '.join(not_allowed)}")
+            else:
+                print(f"ok        {query.name}")
+            if verbose or not_allowed:
+                for line in lines:
+                    print(f"          {line}")
+        connection.rollback()
+    return flagged
+
+
+def main() -> None:
+    parser = ArgumentParser(
+        description="Revisa con EXPLAIN que las consultas frecuentes usen índices."
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Muestra todos los planes"
+    )
+    args = parser.parse_args()
+
+    flagged = check_query_plans(args.verbose)
+    if flagged:
+        print(f"{len(flagged)} of {len(HOT_QUERIES)} hot queries use sequential scans")
+        sys.exit(1)
+    print(f"All {len(HOT_QUERIES)} hot queries use indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+from itertools import count
+from sqlalchemy import Engine, TextClause, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+from threading import Lock, Thread
+from time import sleep
+from os import getenv
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+# Retraso máximo tolerado antes de mandar las lecturas al primario
+DB_REPLICA_MAX_LAG_SECONDS = float(getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+# Cada cuánto se vuelve a medir el retraso de cada réplica
+DB_REPLICA_LAG_CHECK_SECONDS = float(getenv("DB_REPLICA_LAG_CHECK_SECONDS", "5"))
+# Cuánto se espera a que una réplica acepte la conexión
+DB_REPLICA_CONNECT_TIMEOUT_SECONDS = int(
+    getenv("DB_REPLICA_CONNECT_TIMEOUT_SECONDS", "2")
+)
+
+# Sin WAL pendiente de aplicar la réplica está al día aunque el primario no
+# haya escrito nada hace rato (el timestamp del último replay sería viejo).
+# Eso solo vale si sigue recibiendo WAL: con el receptor desconectado no
+# llega nada nuevo y los LSN coinciden igual, así que el retraso queda en
+# NULL (réplica fuera de rotación).
+POSTGRES_REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+# Otro motor (por ejemplo una copia SQLite en pruebas) no replica: sin retraso
+NO_REPLICATION_LAG_QUERY = text("SELECT 0")
+
+
+def replica_lag_query(dialect_name: str) -> TextClause:
+    if dialect_name == "postgresql":
+        return POSTGRES_REPLICA_LAG_QUERY
+    return NO_REPLICATION_LAG_QUERY
+
+
+class Replica:
+    """
+    Réplica de lectura con sus engines sync y async y el último retraso
+    medido. `lag_seconds` en None significa que no respondió o que no está
+    recibiendo WAL.
+    """
+
+    def __init__(self, name: str, engine: Engine, async_engine: AsyncEngine) -> None:
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.lag_seconds: float | None = None
+
+    def usable(self) -> bool:
+        return (
+            self.lag_seconds is not None
+            and self.lag_seconds <= DB_REPLICA_MAX_LAG_SECONDS
+        )
+
+    def _record(self, lag: float | None, error: Exception | None = None) -> None:
+        # Solo se loguean los cambios, no cada medición
+        was_usable = self.usable()
+        self.lag_seconds = None if lag is None else float(lag)
+        if was_usable and not self.usable():
+            if error is not None:
+                reason = f"lag check failed: {error}"
+            elif self.lag_seconds is None:
+                reason = "is not streaming WAL"
+            else:
+                reason = f"lag is {self.lag_seconds}s"
+            logger.warning(
+                f"Read replica {self.name} {reason}, routing reads to primary"
+            )
+        elif not was_usable and self.usable():
+            logger.info(f"Read replica {self.name} is back in rotation")
+
+    def refresh(self) -> None:
+        """
+        Mide el retraso con el engine sync; el async apunta al mismo
+        servidor, así que la medición sirve para los dos.
+        """
+        try:
+            with self.engine.connect() as connection:
+                lag = connection.execute(replica_lag_query(self.engine.name)).scalar()
+        except Exception as e:
+            self._record(None, e)
+            return
+        self._record(lag)
+
+
+class ReplicaRouter:
+    """
+    Elige una réplica al día para cada sesión de lectura, rotando entre las
+    disponibles. Devuelve None cuando no hay ninguna y la lectura va al
+    primario. El retraso se mide desde un thread propio cada
+    `DB_REPLICA_LAG_CHECK_SECONDS`, nunca en el camino del request: una
+    réplica caída no demora las lecturas.
+    """
+
+    def __init__(self, replicas: list[Replica]) -> None:
+        self.replicas = replicas
+        self._turn = count()
+        self._lock = Lock()
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        # El thread se crea en el primer uso, ya dentro del worker
+        with self._lock:
+            if not self.replicas:
+                return
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(
+                    target=self._run, name="replica-lag-check", daemon=True
+                )
+                self._thread.start()
+
+    def refresh(self) -> None:
+        for replica in self.replicas:
+            replica.refresh()
+
+    def _run(self) -> None:
+        while True:
+            self.refresh()
+            sleep(DB_REPLICA_LAG_CHECK_SECONDS)
+
+    def choose(self) -> Replica | None:
+        self.start()
+        usable = [replica for replica in self.replicas if replica.usable()]
+        if not usable:
+            return None
+        return usable[next(self._turn) % len(usable)]
+
+
+def _is_read(clause) -> bool:
+    if clause is None:
+        return False
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip().upper().startswith("SELECT")
+    return bool(getattr(clause, "is_select", False))
+
+
+class RoutingSession(Session):
+    """
+    Sesión que manda los SELECT a la réplica y todo lo demás al primario.
+    Desde la primera escritura (flush o DML) todo va al primario, así una
+    lectura posterior en la misma sesión ve lo que se acaba de escribir.
+    Con `replica` en None es una sesión común contra el primario.
+    """
+
+    def __init__(self, primary: Engine, replica: Engine | None = None, **kw) -> None:
+        kw.pop("bind", None)
+        super().__init__(bind=primary, **kw)
+        self.primary = primary
+        self.replica = replica
+        self.wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.replica is None or self.wrote:
+            return self.primary
+        if self._flushing or not _is_read(clause):
+            self.wrote = True
+            return self.primary
+        return self.replica
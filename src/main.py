@@ -1,6 +1,8 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.database.core import lifespan
+from src.database.health_controller import health_router
 from src.modules.employees.controllers.employee_controller import employee_router
 from src.modules.employees.controllers.documents_controller import documents_router
 from src.modules.employees.controllers.work_history_controller import (
@@ -21,6 +23,7 @@ from src.modules.role.controllers.role_controller import role_router
 from src.modules.role.controllers.permission_controller import permission_router
 from src.auth.auth_controller import auth_router
 from src.cv_matching.controller import matcher_router
+from src.cv_matching import job_service, model_registry
 
 from src.modules.face_recognition.controllers.face_recognition_controller import face_recognition_router
 
@@ -33,9 +36,22 @@ from src.modules.leave.controllers.leave_controller import leave_router
 
 from src.modules.configuration.config_controller import config_router
 
+# Se cargan antes de crear la app para que, al levantar varios workers con
+# preload, todos compartan el modelo en memoria.
+model_registry.preload_models()
+
+
+@asynccontextmanager
+async def app_lifespan(app: FastAPI):
+    async with lifespan(app):
+        # Jobs sin latido que quedaron de un proceso anterior
+        job_service.fail_interrupted_jobs()
+        yield
+
+
 app = FastAPI(
     root_path="/api/v1",
-    lifespan=lifespan,
+    lifespan=app_lifespan,
     title="Talent Management API",
     version="0.1.0",
 )
@@ -70,3 +86,4 @@ app.include_router(shift_router)
 app.include_router(payroll_router)
 app.include_router(leave_router)
 app.include_router(config_router)
+app.include_router(health_router)
@@ -14,27 +14,27 @@ ability_router = APIRouter(prefix="/abilities", tags=["Abilities"])
 
 
 @ability_router.get("/", response_model=list[AbilityPublic])
-async def get_all_abilities(db: DatabaseSession) -> Sequence[AbilityModel]:
+def get_all_abilities(db: DatabaseSession) -> Sequence[AbilityModel]:
     return ability_service.get_all_abilities(db)
 
 
 @ability_router.get("/{ability_id}", response_model=AbilityPublic)
-async def get_ability_by_id(db: DatabaseSession, ability_id: int) -> AbilityModel:
+def get_ability_by_id(db: DatabaseSession, ability_id: int) -> AbilityModel:
     return ability_service.get_ability_by_id(db, ability_id)
 
 
 @ability_router.post(
     "/create", status_code=status.HTTP_201_CREATED, response_model=AbilityPublic
 )
-async def create_ability(db: DatabaseSession, body: AbilityRequest):
+def create_ability(db: DatabaseSession, body: AbilityRequest):
     return ability_service.create_ability(db, body)
 
 
 @ability_router.patch("/{ability_id}", status_code=status.HTTP_200_OK, response_model=AbilityPublic)
-async def update_ability(db: DatabaseSession, ability_id: int, body: AbilityUpdate):
+def update_ability(db: DatabaseSession, ability_id: int, body: AbilityUpdate):
     return ability_service.update_ability(db, ability_id, body)
 
 
 @ability_router.delete("/{ability_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_ability(db: DatabaseSession, ability_id: int) -> None:
+def delete_ability(db: DatabaseSession, ability_id: int) -> None:
     return ability_service.delete_ability(db, ability_id)
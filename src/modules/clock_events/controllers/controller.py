@@ -1,6 +1,10 @@
 from datetime import date
 from fastapi import APIRouter, Query, status
-from src.database.core import DatabaseSession
+from src.database.core import (
+    AsyncDatabaseSession,
+    AsyncReadDatabaseSession,
+    DatabaseSession,
+)
 from src.modules.clock_events.schemas import schemas
 from src.modules.clock_events.services import services
 from typing import List, Optional
@@ -13,29 +17,31 @@ clock_events_router = APIRouter(prefix="/clock_events", tags=["Clock events"])
     status_code=status.HTTP_200_OK
 )
 async def read_attendance_resume(
-    db: DatabaseSession,
+    db: AsyncReadDatabaseSession,
     fecha: date = Query(...)
 ):
     """
     Devuelve resumen de asistencia por empleado activo para una fecha dada
     """
-    return services.get_attendance_resume(db, fecha)
+    return await services.get_attendance_resume_async(db, fecha)
 
 
 @clock_events_router.get(
     "/", response_model=List[schemas.ClockEventRead], status_code=status.HTTP_200_OK
 )
 async def read_clock_events(
-    db: DatabaseSession,
+    db: AsyncDatabaseSession,
     employee_id: Optional[int] = Query(None),
     fecha: Optional[date] = Query(None)
 ):
-    return services.get_clock_events(db, employee_id=employee_id, fecha=fecha)
+    return await services.get_clock_events_async(
+        db, employee_id=employee_id, fecha=fecha
+    )
 
 @clock_events_router.post(
     "/", response_model=schemas.ClockEventResponse, status_code=status.HTTP_201_CREATED
 )
-async def create_clock_event(db: DatabaseSession, request: schemas.ClockEventRequest):
+def create_clock_event(db: DatabaseSession, request: schemas.ClockEventRequest):
     """
     docstring
     """
@@ -47,7 +53,7 @@ async def create_clock_event(db: DatabaseSession, request: schemas.ClockEventReq
     response_model=schemas.ClockEventResponse,
     status_code=status.HTTP_200_OK,
 )
-async def update_clock_event(
+def update_clock_event(
     db: DatabaseSession, clock_event_id: int, request: schemas.ClockEventRequest
 ):
     """
@@ -57,7 +63,7 @@ async def update_clock_event(
 
 
 @clock_events_router.delete("/{clock_event_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_clock_event(db: DatabaseSession, clock_event_id: int):
+def delete_clock_event(db: DatabaseSession, clock_event_id: int):
     """
     docstring
     """
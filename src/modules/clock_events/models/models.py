@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 from datetime import datetime
 from src.modules.clock_events.schemas.schemas import ClockEventTypes
@@ -9,6 +10,10 @@ if TYPE_CHECKING:
 
 class ClockEvents(SQLModel, table=True):
     __tablename__ = "clock_events"  # type: ignore
+    __table_args__ = (
+        # Las consultas de liquidación filtran por empleado y rango de fechas
+        Index("ix_clock_events_employee_id_event_date", "employee_id", "event_date"),
+    )
     id: int = Field(primary_key=True)
     employee_id: int = Field(
         foreign_key="employee.id", nullable=True, ondelete="CASCADE"
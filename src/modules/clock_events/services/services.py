@@ -1,9 +1,10 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import Optional, Sequence
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Date, DateTime, bindparam
 from sqlmodel import select, text
-from src.database.core import DatabaseSession
+from src.database.core import AsyncDatabaseSession, DatabaseSession
 from src.modules.clock_events.schemas.schemas import ClockEventRequest
 from src.modules.clock_events.models.models import ClockEvents
 from src.modules.employees.models.employee import Employee
@@ -12,41 +13,65 @@ from src.modules.employees.services.utils import get_employee_by_id
 import logging
 from sqlalchemy.orm import selectinload
 
+# El día se filtra como rango sobre `event_date` (no `DATE(event_date)`) para
+# que el JOIN use el índice (employee_id, event_date)
+ATTENDANCE_RESUME_QUERY = text("""
+    SELECT
+        e.id AS employee_id,
+        e.first_name,
+        e.last_name,
+        j.name AS job,
+        :fecha AS date,
+        MIN(CASE WHEN c.event_type = 'IN' THEN c.event_date END) AS first_in,
+        MAX(CASE WHEN c.event_type = 'OUT' THEN c.event_date END) AS last_out,
+        COUNT(c.id) AS total_events
+    FROM employee e
+    LEFT JOIN job j ON e.job_id = j.id
+    LEFT JOIN clock_events c ON e.id = c.employee_id
+        AND c.event_date >= :day_start AND c.event_date < :day_end
+    WHERE e.active = TRUE
+    GROUP BY e.id, e.first_name, e.last_name, j.name
+    ORDER BY e.id
+""").bindparams(
+    bindparam("fecha", type_=Date),
+    bindparam("day_start", type_=DateTime),
+    bindparam("day_end", type_=DateTime),
+)
+
+
+def attendance_resume_params(fecha: date) -> dict:
+    day_start = datetime.combine(fecha, datetime.min.time())
+    return {
+        "fecha": fecha,
+        "day_start": day_start,
+        "day_end": day_start + timedelta(days=1),
+    }
+
+
 def get_attendance_resume(db: DatabaseSession, fecha: date):
     return get_clock_event_summary_by_date_sql(db, fecha)
 
 def get_clock_event_summary_by_date_sql(db: DatabaseSession, fecha: date):
-    query = text("""
-        SELECT
-            e.id AS employee_id,
-            e.first_name,
-            e.last_name,
-            j.name AS job,
-            :fecha AS date,
-            MIN(CASE WHEN c.event_type = 'IN' THEN c.event_date END) AS first_in,
-            MAX(CASE WHEN c.event_type = 'OUT' THEN c.event_date END) AS last_out,
-            COUNT(c.id) AS total_events
-        FROM employee e
-        LEFT JOIN job j ON e.job_id = j.id
-        LEFT JOIN clock_events c ON e.id = c.employee_id AND DATE(c.event_date) = :fecha
-        WHERE e.active = TRUE
-        GROUP BY e.id, e.first_name, e.last_name, j.name
-        ORDER BY e.id
-    """)
-
-    result = db.execute(query, {"fecha": fecha})
+    result = db.execute(ATTENDANCE_RESUME_QUERY, attendance_resume_params(fecha))
+    return [dict(row._mapping) for row in result]
+
+
+async def get_attendance_resume_async(db: AsyncDatabaseSession, fecha: date):
+    result = await db.execute(ATTENDANCE_RESUME_QUERY, attendance_resume_params(fecha))
     return [dict(row._mapping) for row in result]
 
 
 def get_clock_event_by_id(db: DatabaseSession, id: int) -> ClockEvents | None:
     return db.exec(select(ClockEvents).where(ClockEvents.id == id)).first()
 
-def get_clock_events(
-    db: DatabaseSession,
+def build_clock_events_query(
     employee_id: Optional[int] = None,
     fecha: Optional[date] = None
-) -> Sequence[ClockEvents]:
-    stmt = select(ClockEvents)
+):
+    # El empleado y su puesto van en la respuesta: se cargan en la consulta
+    stmt = select(ClockEvents).options(
+        selectinload(ClockEvents.employee).selectinload(Employee.job)  # type: ignore
+    )
 
     if employee_id:
         stmt = stmt.where(ClockEvents.employee_id == employee_id)
@@ -59,7 +84,23 @@ def get_clock_events(
             )
         )
 
-    return db.exec(stmt.order_by(ClockEvents.event_date)).all()
+    return stmt.order_by(ClockEvents.event_date)
+
+
+def get_clock_events(
+    db: DatabaseSession,
+    employee_id: Optional[int] = None,
+    fecha: Optional[date] = None
+) -> Sequence[ClockEvents]:
+    return db.exec(build_clock_events_query(employee_id, fecha)).all()
+
+
+async def get_clock_events_async(
+    db: AsyncDatabaseSession,
+    employee_id: Optional[int] = None,
+    fecha: Optional[date] = None
+) -> Sequence[ClockEvents]:
+    return (await db.exec(build_clock_events_query(employee_id, fecha))).all()
 
 def post_clock_event(db: DatabaseSession, request: ClockEventRequest) -> ClockEvents:
     try:
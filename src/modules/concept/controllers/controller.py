@@ -10,7 +10,7 @@ concept_router = APIRouter(prefix="/concept", tags=["Concept"])
 @concept_router.get(
     "/", response_model=List[schemas.ConceptResponse], status_code=status.HTTP_200_OK
 )
-async def read_concepts(db: DatabaseSession):
+def read_concepts(db: DatabaseSession):
     """
     docstring
     """
@@ -20,7 +20,7 @@ async def read_concepts(db: DatabaseSession):
 @concept_router.post(
     "/", response_model=schemas.ConceptResponse, status_code=status.HTTP_201_CREATED
 )
-async def create_concept(db: DatabaseSession, request: schemas.ConceptRequest):
+def create_concept(db: DatabaseSession, request: schemas.ConceptRequest):
     """
     docstring
     """
@@ -32,7 +32,7 @@ async def create_concept(db: DatabaseSession, request: schemas.ConceptRequest):
     response_model=schemas.ConceptResponse,
     status_code=status.HTTP_200_OK,
 )
-async def update_concept(
+def update_concept(
     db: DatabaseSession, concept_id: int, request: schemas.ConceptRequest
 ):
     """
@@ -42,7 +42,7 @@ async def update_concept(
 
 
 @concept_router.delete("/{concept_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_concept(db: DatabaseSession, concept_id: int):
+def delete_concept(db: DatabaseSession, concept_id: int):
     """
     docstring
     """
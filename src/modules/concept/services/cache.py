@@ -0,0 +1,99 @@
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.modules.concept.models.models import Concept
+from threading import RLock
+from time import monotonic
+from os import getenv
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+# Cada proceso tiene su propia copia; se recarga cada CONCEPT_CACHE_TTL_SECONDS
+# para ver los cambios hechos desde otros workers.
+CONCEPT_CACHE_TTL_SECONDS = float(getenv("CONCEPT_CACHE_TTL_SECONDS", "300"))
+
+
+class ConceptCache:
+    """
+    Conceptos en memoria, por descripción y por ID. Son pocos y casi no
+    cambian, así que se cargan todos juntos en la primera consulta y se
+    invalidan al crear, modificar o borrar un concepto.
+
+    Devuelve copias desacopladas de la sesión: sirven para leer, no para
+    modificar el concepto.
+    """
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._by_description: dict[str, Concept] = {}
+        self._by_id: dict[int, Concept] = {}
+        self._loaded_at: float | None = None
+
+    def load(self, db: Session) -> None:
+        concepts = [
+            Concept(
+                id=concept.id,
+                description=concept.description,
+                is_deletable=concept.is_deletable,
+            )
+            for concept in db.exec(select(Concept)).all()
+        ]
+        with self._lock:
+            self._by_description = {
+                concept.description: concept for concept in concepts
+            }
+            self._by_id = {concept.id: concept for concept in concepts}
+            self._loaded_at = monotonic()
+        logger.info(f"Loaded {len(concepts)} concepts into the cache")
+
+    def is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and monotonic() - self._loaded_at <= CONCEPT_CACHE_TTL_SECONDS
+        )
+
+    def ensure_loaded(self, db: Session) -> None:
+        if not self.is_fresh():
+            self.load(db)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def get_by_description(self, db: Session, description: str) -> Concept | None:
+        """
+        Si la descripción no está se recarga una vez, por si el concepto se
+        creó desde otro proceso.
+        """
+        self.ensure_loaded(db)
+        concept = self._by_description.get(description)
+        if concept is None:
+            self.load(db)
+            concept = self._by_description.get(description)
+        return concept
+
+    def get_by_id(self, db: Session, concept_id: int | None) -> Concept | None:
+        if concept_id is None:
+            return None
+        self.ensure_loaded(db)
+        concept = self._by_id.get(concept_id)
+        if concept is None:
+            self.load(db)
+            concept = self._by_id.get(concept_id)
+        return concept
+
+    async def get_by_id_async(
+        self, db: AsyncSession, concept_id: int | None
+    ) -> Concept | None:
+        """
+        Para sesiones async: si la caché está vigente y tiene el concepto no
+        se toca la base; si no, se carga con la sesión sincrónica subyacente.
+        """
+        if concept_id is None:
+            return None
+        if self.is_fresh() and concept_id in self._by_id:
+            return self._by_id[concept_id]
+        return await db.run_sync(self.get_by_id, concept_id)
+
+
+concept_cache = ConceptCache()
@@ -12,7 +12,7 @@ employee_hours_router = APIRouter(prefix="/employee_hours", tags=["Employee hour
     response_model=List[schemas.EmployeeHoursResponse],
     status_code=status.HTTP_200_OK,
 )
-async def read_employee_hours(db: DatabaseSession):
+def read_employee_hours(db: DatabaseSession):
     """
     docstring
     """
@@ -24,7 +24,7 @@ async def read_employee_hours(db: DatabaseSession):
     response_model=schemas.EmployeeHoursResponse,
     status_code=status.HTTP_201_CREATED,
 )
-async def create_employee_hours(
+def create_employee_hours(
     db: DatabaseSession, request: schemas.EmployeeHoursRequest
 ):
     """
@@ -38,7 +38,7 @@ async def create_employee_hours(
     response_model=schemas.EmployeeHoursPatchResponse,
     status_code=status.HTTP_200_OK,
 )
-async def update_employee_hours(
+def update_employee_hours(
     db: DatabaseSession, employee_hours_id: int, request: schemas.EmployeeHoursPatchRequest
 ):
     """
@@ -50,7 +50,7 @@ async def update_employee_hours(
 @employee_hours_router.delete(
     "/{employee_hours_id}", status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_employee_hours(db: DatabaseSession, employee_hours_id: int):
+def delete_employee_hours(db: DatabaseSession, employee_hours_id: int):
     """
     docstring
     """
@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 from datetime import time, date
 from enum import Enum
@@ -23,13 +24,26 @@ class payType(str, Enum):
 
 class EmployeeHours(SQLModel, table=True):
     __tablename__ = "employee_hours"  # type: ignore
+    __table_args__ = (
+        # Liquidación, recálculo y resumen filtran por empleado y rango de
+        # fechas; también cubre las búsquedas solo por empleado
+        Index(
+            "ix_employee_hours_employee_id_work_date_payroll_status",
+            "employee_id",
+            "work_date",
+            "payroll_status",
+        ),
+        # Listado de horas pendientes de validación: filtra por estado y
+        # pagina por ID, así que el índice resuelve el WHERE y el ORDER BY
+        Index("ix_employee_hours_payroll_status_id", "payroll_status", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     employee_id: int | None = Field(
         default=None, foreign_key="employee.id", ondelete="CASCADE"
     )
-    concept_id: int | None = Field(default=None, foreign_key="concept.id")
-    shift_id: int = Field(foreign_key="shift.id")
+    concept_id: int | None = Field(default=None, foreign_key="concept.id", index=True)
+    shift_id: int = Field(foreign_key="shift.id", index=True)
     check_count: int = Field(default=0)
     work_date: date = Field(default=date.today)  # antes: date
     register_type: RegisterType = Field(default=None)
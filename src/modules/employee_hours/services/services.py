@@ -11,6 +11,7 @@ from src.modules.employees.services.utils import get_employee_by_id
 from src.modules.concept.services.service import get_concept_by_id
 from src.modules.shift.models.models import Shift
 from src.modules.shift.services.services import get_shift_by_id
+from src.modules.payroll_calculator.summary_service import refresh_monthly_summary
 import logging
 
 
@@ -52,6 +53,13 @@ def post_employee_hours(
             )
         db_employee_hours = EmployeeHours(**request.model_dump())
         db.add(db_employee_hours)
+        if db_employee_hours.employee_id is not None:
+            refresh_monthly_summary(
+                db,
+                [db_employee_hours.employee_id],
+                db_employee_hours.work_date,
+                db_employee_hours.work_date,
+            )
         db.commit()
         db.refresh(db_employee_hours)
         return db_employee_hours
@@ -72,6 +80,7 @@ def patch_employee_hours(
         # concept = get_concept_by_id(db, request.concept_id)
         # shift = get_shift_by_id(db, request.shift_id)
         db_employee_hours = get_employee_hours_by_id(db, employee_hours_id)
+        previous = (db_employee_hours.employee_id, db_employee_hours.work_date)
 
         # validate_employee_hours(employee, concept, shift, db_employee_hours)
 
@@ -79,6 +88,12 @@ def patch_employee_hours(
             if hasattr(db_employee_hours, attr):
                 setattr(db_employee_hours, attr, value)
         db.add(db_employee_hours)
+        # Si cambió el empleado o la fecha se recalculan ambos meses
+        for employee_id, work_date in dict.fromkeys(
+            [previous, (db_employee_hours.employee_id, db_employee_hours.work_date)]
+        ):
+            if employee_id is not None:
+                refresh_monthly_summary(db, [employee_id], work_date, work_date)
         db.commit()
         return db_employee_hours
     except IntegrityError as e:
@@ -99,6 +114,13 @@ def delete_employee_hours(db: DatabaseSession, employee_hours_id: int):
                 detail="Employee hours was not found",
             )
         db.delete(db_employee_hours)
+        if db_employee_hours.employee_id is not None:
+            refresh_monthly_summary(
+                db,
+                [db_employee_hours.employee_id],
+                db_employee_hours.work_date,
+                db_employee_hours.work_date,
+            )
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -10,7 +10,7 @@ documents_router = APIRouter(prefix="/documents", tags=["Documents"])
 @documents_router.get(
     "/{employee_id}", status_code=200, response_model=List[DocumentResponse]
 )
-async def get_documents_of_employee(
+def get_documents_of_employee(
     db: DatabaseSession,
     employee_id: int,
 ):
@@ -23,7 +23,7 @@ async def get_documents_of_employee(
 @documents_router.post(
     "/{employee_id}", status_code=201, response_model=DocumentResponse
 )
-async def create_document_of_employee(
+def create_document_of_employee(
     db: DatabaseSession,
     employee_id: int,
     document: DocumentRequest,
@@ -38,7 +38,7 @@ async def create_document_of_employee(
 @documents_router.patch(
     "/{employee_id}/{document_id}", status_code=200, response_model=DocumentResponse
 )
-async def update_document_of_employee(
+def update_document_of_employee(
     db: DatabaseSession,
     employee_id: int,
     document_id: int,
@@ -53,7 +53,7 @@ async def update_document_of_employee(
 
 
 @documents_router.delete("/{employee_id}/{document_id}", status_code=204)
-async def delete_documents_of_employee(
+def delete_documents_of_employee(
     db: DatabaseSession,
     employee_id: int,
     document_id: int,
@@ -1,6 +1,10 @@
 from typing import Optional
 from fastapi import APIRouter, status
-from src.database.core import DatabaseSession
+from src.database.core import (
+    AsyncDatabaseSession,
+    AsyncReadDatabaseSession,
+    DatabaseSession,
+)
 from src.modules.employees.services import employee_service
 from src.auth.login_request import LoginRequest
 from src.modules.employees.schemas.employee_models import (
@@ -18,9 +22,9 @@ employee_router = APIRouter(prefix="/employees", tags=["Employees"])
     summary="Cantidad de empleados activos",
 )
 async def count_active_employees(
-    db: DatabaseSession,
+    db: AsyncReadDatabaseSession,
 ):
-    return {"active_count": employee_service.count_active_employees(db)}
+    return {"active_count": await employee_service.count_active_employees_async(db)}
 
 
 """Enpoint para buscar a un empleado por su ID.
@@ -35,10 +39,10 @@ Returns:
     response_model=list[EmployeeResponse],
 )
 async def get_all_employees(
-    db: DatabaseSession,
+    db: AsyncReadDatabaseSession,
     sector_id: Optional[int] = None
 ):
-    return employee_service.get_all_employees(db, sector_id)
+    return await employee_service.get_all_employees_async(db, sector_id)
 
 
 @employee_router.get(
@@ -47,10 +51,10 @@ async def get_all_employees(
     response_model=EmployeeResponse,
 )
 async def get_employee_by_id(
-    db: DatabaseSession,
+    db: AsyncDatabaseSession,
     employee_id: int,
 ):
-    return employee_service.get_employee(db, employee_id)
+    return await employee_service.get_employee_async(db, employee_id)
 
 
 """Enpoint para registrar un nuevo empleado.
@@ -64,7 +68,7 @@ Returns:
     status_code=status.HTTP_201_CREATED,
     response_model=EmployeeResponse,
 )
-async def register_employee(
+def register_employee(
     db: DatabaseSession,
     register_employee_request: CreateEmployee,
 ):
@@ -82,7 +86,7 @@ Returns:
 
 
 @employee_router.patch("/{employee_id}", status_code=status.HTTP_200_OK)
-async def update_employee(
+def update_employee(
     db: DatabaseSession,
     employee_id: int,
     update_request: UpdateEmployee,
@@ -92,7 +96,7 @@ async def update_employee(
 
 # TODO: Remplazar por el de abajo
 @employee_router.post("/change_password", status_code=status.HTTP_204_NO_CONTENT)
-async def change_password(
+def change_password(
     db: DatabaseSession,
     model_request: ChangePasswordRequest
 ):
@@ -130,7 +134,7 @@ Returns:
 
 
 @employee_router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_employee(
+def delete_employee(
     db: DatabaseSession,
     employee_id: int,
 ):
@@ -13,7 +13,7 @@ work_history_router = APIRouter(prefix="/work-history", tags=["Work History"])
 @work_history_router.get(
     "/{employee_id}", status_code=200, response_model=List[WorkHistoryResponse]
 )
-async def get_work_history_of_employee(
+def get_work_history_of_employee(
     db: DatabaseSession,
     employee_id: int,
 ):
@@ -23,7 +23,7 @@ async def get_work_history_of_employee(
 @work_history_router.post(
     "/{employee_id}", status_code=201, response_model=WorkHistoryResponse
 )
-async def create_work_history_for_employee(
+def create_work_history_for_employee(
     db: DatabaseSession,
     employee_id: int,
     work_history: WorkHistoryRequest,
@@ -36,7 +36,7 @@ async def create_work_history_for_employee(
     status_code=200,
     response_model=WorkHistoryResponse,
 )
-async def update_work_history_of_employee(
+def update_work_history_of_employee(
     db: DatabaseSession,
     employee_id: int,
     work_history_id: int,
@@ -48,7 +48,7 @@ async def update_work_history_of_employee(
 
 
 @work_history_router.delete("/{employee_id}/{work_history_id}", status_code=204)
-async def delete_work_history_of_employee(
+def delete_work_history_of_employee(
     db: DatabaseSession, employee_id: int, work_history_id: int
 ):
     return work_history_service.delete_work_history_register(
@@ -15,7 +15,9 @@ class Document(SQLModel, table=True):
 
     __tablename__ = "document"  # type: ignore
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
-    employee_id: int = Field(foreign_key="employee.id", ondelete="CASCADE")
+    employee_id: int = Field(
+        foreign_key="employee.id", ondelete="CASCADE", index=True
+    )
     name: str = Field(max_length=50)
     extension: str = Field(max_length=5)
     creation_date: date
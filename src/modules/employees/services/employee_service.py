@@ -5,7 +5,7 @@ from src.modules.employees.models.employee import Employee
 from src.modules.employees.models.work_history import WorkHistory
 from src.modules.employees.models.documents import Document
 from src.modules.employees.schemas.employee_models import CreateEmployee, UpdateEmployee
-from src.database.core import DatabaseSession
+from src.database.core import AsyncDatabaseSession, DatabaseSession
 from sqlalchemy.exc import IntegrityError
 from src.auth.crypt import get_password_hash
 from src.modules.employees.services import utils
@@ -19,6 +19,10 @@ def count_active_employees(db: DatabaseSession) -> int:
     return result
 
 
+async def count_active_employees_async(db: AsyncDatabaseSession) -> int:
+    return await utils.count_active_employees_async(db)
+
+
 def get_all_employees(db: DatabaseSession, sector_id: Optional[int]) -> Sequence[Employee]:
     employees = utils.get_all_employees(db, sector_id)
 
@@ -29,6 +33,12 @@ def get_all_employees(db: DatabaseSession, sector_id: Optional[int]) -> Sequence
     return employees
 
 
+async def get_all_employees_async(
+    db: AsyncDatabaseSession, sector_id: Optional[int]
+) -> Sequence[Employee]:
+    return await utils.get_all_employees_async(db, sector_id)
+
+
 def get_employee(db: DatabaseSession, employee_id: int):
     employee = utils.get_employee_by_id(db, employee_id)
 
@@ -40,6 +50,10 @@ def get_employee(db: DatabaseSession, employee_id: int):
     return employee
 
 
+async def get_employee_async(db: AsyncDatabaseSession, employee_id: int) -> Employee:
+    return await utils.get_employee_by_id_async(db, employee_id)
+
+
 def create_employee(db: DatabaseSession, employee_request: CreateEmployee) -> Employee:
     """
     Registra un nuevo empleado en la base de datos.
@@ -1,4 +1,4 @@
-from src.database.core import DatabaseSession
+from src.database.core import AsyncDatabaseSession, DatabaseSession
 from src.modules.employees.schemas.sector_models import CreateSector, UpdateSector
 from src.modules.employees.models.sector import Sector
 from fastapi import HTTPException, status
@@ -31,6 +31,18 @@ def get_sector_by_id(db: DatabaseSession, sector_id: int) -> Sector:
     return result
 
 
+async def get_sector_by_id_async(db: AsyncDatabaseSession, sector_id: int) -> Sector:
+    result = (
+        await db.exec(select(Sector).where(Sector.id == sector_id))
+    ).one_or_none()
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"El Sector con ID {sector_id} no existe."
+        )
+    return result
+
+
 def create_sector(db: DatabaseSession, create_sector_request: CreateSector) -> Sector:
     db_sector = Sector(name=create_sector_request.name)
 
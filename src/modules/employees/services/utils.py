@@ -1,7 +1,7 @@
 from typing import Sequence, cast, Any, Optional
 from fastapi import HTTPException, status
 from sqlmodel import func, select
-from src.database.core import DatabaseSession
+from src.database.core import AsyncDatabaseSession, DatabaseSession
 from src.modules.employees.models.documents import Document
 from src.modules.employees.models.employee import Employee
 from src.modules.employees.models.job import Job
@@ -57,6 +57,27 @@ def count_active_employees(db: DatabaseSession) -> int:
     return result.one()
 
 
+async def count_active_employees_async(db: AsyncDatabaseSession) -> int:
+    result = await db.exec(
+        select(func.count()).select_from(Employee).where(Employee.active)
+    )
+    return result.one()
+
+
+def employee_relationship_options():
+    """
+    Relaciones que usa `EmployeeResponse`, cargadas en la misma consulta.
+    """
+    return (
+        selectinload(cast(Any, Employee.job)).selectinload(cast(Any, Job.sector)),
+        selectinload(cast(Any, Employee.state)),
+        selectinload(cast(Any, Employee.country)),
+        selectinload(cast(Any, Employee.work_histories)),
+        selectinload(cast(Any, Employee.documents)),
+        selectinload(cast(Any, Employee.shift))
+    )
+
+
 def get_employee_by_id(db: DatabaseSession, employee_id: int) -> Employee:
     """
     Obtiene un empleado por su ID, incluyendo sus relaciones.
@@ -64,14 +85,7 @@ def get_employee_by_id(db: DatabaseSession, employee_id: int) -> Employee:
     stmt = (
         select(Employee)
         .where(Employee.id == employee_id)
-        .options(
-            selectinload(cast(Any, Employee.job)).selectinload(cast(Any, Job.sector)),
-            selectinload(cast(Any, Employee.state)),
-            selectinload(cast(Any, Employee.country)),
-            selectinload(cast(Any, Employee.work_histories)),
-            selectinload(cast(Any, Employee.documents)),
-            selectinload(cast(Any, Employee.shift))
-        )
+        .options(*employee_relationship_options())
     )
 
     result = db.exec(stmt).one_or_none()
@@ -83,6 +97,24 @@ def get_employee_by_id(db: DatabaseSession, employee_id: int) -> Employee:
     return result
 
 
+async def get_employee_by_id_async(
+    db: AsyncDatabaseSession, employee_id: int
+) -> Employee:
+    stmt = (
+        select(Employee)
+        .where(Employee.id == employee_id)
+        .options(*employee_relationship_options())
+    )
+
+    result = (await db.exec(stmt)).one_or_none()
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"El empleado con ID {employee_id} no existe."
+        )
+    return result
+
+
 
 def get_employee_by_id_simple(db: DatabaseSession, employee_id: int) -> Employee:
     employee = db.exec(
@@ -124,6 +156,28 @@ def get_all_employees(db: DatabaseSession, sector_id: Optional[int]) -> Sequence
     return db.exec(stmt).all()
 
 
+async def get_all_employees_async(
+    db: AsyncDatabaseSession, sector_id: Optional[int]
+) -> Sequence[Employee]:
+    """
+    Igual que `get_all_employees`, pero con las relaciones de la respuesta
+    cargadas en la consulta en lugar de una consulta por empleado.
+    """
+    stmt = (
+        select(Employee)
+        .options(*employee_relationship_options())
+        .order_by(cast(Any, Employee.id))
+    )
+    if sector_id is not None:
+        # Para dar error si no existe el sector
+        await sector_service.get_sector_by_id_async(db, sector_id)
+
+        stmt = stmt.join(
+            Job, cast(Any, Employee.job_id == Job.id)
+        ).where(Job.sector_id == sector_id)
+    return (await db.exec(stmt)).all()
+
+
 def create_user_id(db: DatabaseSession, employee_request: CreateEmployee) -> str:
     first_char = employee_request.first_name[0].lower()
     last_name = employee_request.last_name.lower()
@@ -7,6 +7,8 @@ import logging
 
 from src.modules.clock_events.schemas.schemas import ClockEventTypes
 from src.modules.face_recognition.schemas.face_recognition_models import (
+    BatchAttendanceRequest,
+    BatchAttendanceResponse,
     CreateFaceRegistration,
     FaceRecognitionBaseModel,
     UpdateFaceRegistration,
@@ -27,7 +29,7 @@ face_recognition_router = APIRouter(
     response_model=FaceRecognitionBaseModel,
     status_code=status.HTTP_201_CREATED,
 )
-async def register_face(
+def register_face(
     db: DatabaseSession,
     face_recognition: CreateFaceRegistration,
 ) -> FaceRecognitionBaseModel:
@@ -40,7 +42,7 @@ async def register_face(
 @face_recognition_router.post(
     "/", response_model=OperationStatus, status_code=status.HTTP_200_OK
 )
-async def verify_face(
+def verify_face(
     db: DatabaseSession,
     face_recognition: VerifyFaceRegistration,
 ) -> OperationStatus:
@@ -54,7 +56,7 @@ async def verify_face(
 @face_recognition_router.patch(
     "/update", response_model=FaceRecognitionBaseModel, status_code=status.HTTP_200_OK
 )
-async def update_face(
+def update_face(
     db: DatabaseSession,
     face_recognition: UpdateFaceRegistration,
 ) -> FaceRecognitionBaseModel:
@@ -65,12 +67,29 @@ async def update_face(
     return face_recognition_service.update_face_register(db, face_recognition)
 
 
+@face_recognition_router.post(
+    "/batch",
+    response_model=BatchAttendanceResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def register_attendance_batch(
+    db: DatabaseSession,
+    batch_request: BatchAttendanceRequest,
+) -> BatchAttendanceResponse:
+    """
+    Registra en una sola llamada los escaneos encolados por un tótem, cada
+    uno con su tipo y fecha.
+    """
+    logger.info(f"Registrando lote de {len(batch_request.scans)} escaneos...")
+    return face_recognition_service.register_attendance_batch(db, batch_request)
+
+
 @face_recognition_router.post(
     "/{event_type}",
     response_model=OperationStatus,
     status_code=status.HTTP_202_ACCEPTED,
 )
-async def register_attendance(
+def register_attendance(
     event_type: ClockEventTypes,
     db: DatabaseSession,
     face_recognition: VerifyFaceRegistration,
@@ -81,11 +100,7 @@ async def register_attendance(
     logger.info(f"Registrando {event_type}...")
 
     # Asignar device según el tipo
-    match event_type:
-        case ClockEventTypes.IN:
-            device_id = "Totem de reconocimiento facial ingreso."
-        case ClockEventTypes.OUT:
-            device_id = "Totem de reconocimiento facial egreso."
+    device_id = face_recognition_service.TOTEM_DEVICE_IDS[event_type]
 
     return face_recognition_service.register_attendance(
         db, face_recognition, event_type=event_type, device_id=device_id
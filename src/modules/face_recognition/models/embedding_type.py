@@ -0,0 +1,52 @@
+from sqlalchemy.types import LargeBinary, TypeDecorator
+from os import getenv
+import numpy as np
+
+try:
+    from pgvector.sqlalchemy import Vector
+except ImportError:  # pragma: no cover - dependencia opcional
+    Vector = None
+
+# "binary" guarda los float32 como bytes; "pgvector" usa una columna vector
+# nativa cuando el motor es PostgreSQL y el paquete pgvector está instalado.
+FACE_EMBEDDING_STORAGE = getenv("FACE_EMBEDDING_STORAGE", "binary").lower()
+FACE_EMBEDDING_DIMENSIONS = int(getenv("FACE_EMBEDDING_DIMENSIONS", "128"))
+
+
+def uses_pgvector(dialect) -> bool:
+    return (
+        FACE_EMBEDDING_STORAGE == "pgvector"
+        and Vector is not None
+        and dialect.name == "postgresql"
+    )
+
+
+class Float32Embedding(TypeDecorator):
+    """
+    Embedding almacenado como float32. Acepta listas o arrays y devuelve un
+    `np.ndarray` de solo lectura creado con `np.frombuffer`, sin copiar ni
+    convertir cada valor a float de Python.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if uses_pgvector(dialect):
+            return dialect.type_descriptor(Vector(FACE_EMBEDDING_DIMENSIONS))
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        vector = np.asarray(value, dtype=np.float32)
+        if uses_pgvector(dialect):
+            return vector
+        return vector.tobytes()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if uses_pgvector(dialect):
+            return np.asarray(value, dtype=np.float32)
+        return np.frombuffer(value, dtype=np.float32)
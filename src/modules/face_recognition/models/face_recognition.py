@@ -1,5 +1,9 @@
+from datetime import datetime
+from pydantic import ConfigDict
 from sqlmodel import JSON, Column, Field, Relationship, SQLModel
 from typing import Optional, TYPE_CHECKING
+from src.modules.face_recognition.models.embedding_type import Float32Embedding
+import numpy as np
 
 if TYPE_CHECKING:
     from src.modules.employees.models.employee import Employee
@@ -7,10 +11,25 @@ if TYPE_CHECKING:
 class FaceRecognition(SQLModel, table=True):
     """
     Modelo de registro facial para la base de datos.
+
+    `embedding` se guarda en la columna binaria `embedding_f32` y al leerse es
+    un array float32 (al asignarlo también se acepta una lista). `legacy_embedding` es la antigua columna JSON; solo
+    tiene datos hasta que `migrate_embedding_storage` los convierte.
+    `updated_at` cambia en cada alta o modificación; el índice facial lo usa
+    para saber si tiene que recargarse.
     """
     __tablename__ = "face_recognition"  # type: ignore
+    model_config = ConfigDict(arbitrary_types_allowed=True)  # type: ignore
 
     id: Optional[int] = Field(primary_key=True, index=True, default=None)
     employee_id: int = Field(foreign_key="employee.id")
-    embedding: Optional[list[float]] = Field(sa_column=Column(JSON))
+    embedding: Optional[np.ndarray] = Field(
+        default=None, sa_column=Column("embedding_f32", Float32Embedding)
+    )
+    legacy_embedding: Optional[list[float]] = Field(
+        default=None, sa_column=Column("embedding", JSON(none_as_null=True))
+    )
+    updated_at: Optional[datetime] = Field(
+        default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now}
+    )
     employee: "Employee" = Relationship(back_populates="face_recognition")
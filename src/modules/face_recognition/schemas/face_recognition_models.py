@@ -1,5 +1,7 @@
+from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from src.modules.clock_events.schemas.schemas import ClockEventTypes
 
 
 class FaceRecognitionBaseModel(BaseModel):
@@ -36,4 +38,37 @@ class OperationStatus(BaseModel):
     """
     success: bool
     message: str
-    employee_id: Optional[int] | None
\ No newline at end of file
+    employee_id: Optional[int] | None
+
+class FaceScan(BaseModel):
+    """
+    Escaneo facial encolado por un tótem, con el momento en que se tomó.
+    """
+    embedding: list[float]
+    event_type: ClockEventTypes
+    event_date: datetime
+
+
+class BatchAttendanceRequest(BaseModel):
+    """
+    Modelo para registrar varios escaneos en una sola llamada.
+    """
+    device_id: Optional[str] = None
+    scans: list[FaceScan] = Field(min_length=1)
+
+
+class ScanStatus(OperationStatus):
+    """
+    Resultado de un escaneo dentro de un lote.
+    """
+    event_type: ClockEventTypes
+    event_date: datetime
+
+
+class BatchAttendanceResponse(BaseModel):
+    """
+    Resultado del registro en lote, en el mismo orden que los escaneos.
+    """
+    total: int
+    registered: int
+    results: list[ScanStatus]
@@ -0,0 +1,80 @@
+from sqlalchemy import Engine, bindparam, inspect, null, select, text, update
+from src.modules.face_recognition.models.embedding_type import uses_pgvector
+from src.modules.face_recognition.models.face_recognition import FaceRecognition
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+EMBEDDING_MIGRATION_BATCH_SIZE = 500
+
+
+def prepare_embedding_storage(engine: Engine) -> None:
+    """
+    Habilita la extensión `vector` antes de crear las tablas cuando los
+    embeddings se guardan con pgvector.
+    """
+    if uses_pgvector(engine.dialect):
+        with engine.begin() as connection:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+
+
+def migrate_embedding_storage(engine: Engine) -> int:
+    """
+    Agrega la columna `embedding_f32` a las bases creadas antes del cambio y
+    convierte por lotes los embeddings JSON existentes, vaciando la columna
+    anterior. Es idempotente: si no queda nada por convertir no hace nada.
+    Devuelve la cantidad de registros convertidos.
+    """
+    table = FaceRecognition.__table__
+    columns = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    new_column = table.c.embedding_f32
+    if new_column.name not in columns:
+        column_type = new_column.type.compile(dialect=engine.dialect)
+        logger.info(f"Adding column {table.name}.{new_column.name} ({column_type})")
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    f"ALTER TABLE {table.name} "
+                    f"ADD COLUMN {new_column.name} {column_type}"
+                )
+            )
+
+    # Se pagina por ID y cada lote vacía la columna anterior con un UPDATE
+    # directo: un JSON `'null'` se lee como None y, con el ORM, asignarle None
+    # no es un cambio, así que esa fila volvería en cada lote para siempre
+    legacy_column = table.c.embedding
+    copy_embedding = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values({new_column.name: bindparam("vector", type_=new_column.type)})
+    )
+    migrated = 0
+    last_id = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(table.c.id, legacy_column, new_column)
+                .where(legacy_column.is_not(None), table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(EMBEDDING_MIGRATION_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            copies = [
+                {"row_id": row.id, "vector": row.embedding}
+                for row in rows
+                if row.embedding_f32 is None and row.embedding is not None
+            ]
+            if copies:
+                connection.execute(copy_embedding, copies)
+            connection.execute(
+                update(table)
+                .where(table.c.id.in_([row.id for row in rows]))
+                .values({legacy_column.name: null()})
+            )
+            migrated += len(copies)
+
+    if migrated:
+        logger.info(f"Migrated {migrated} face embeddings to float32 storage")
+    return migrated
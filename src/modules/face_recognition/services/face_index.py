@@ -0,0 +1,178 @@
+from fastapi import HTTPException, status
+from sqlmodel import func, select
+from src.database.core import DatabaseSession
+from src.modules.face_recognition.models.face_recognition import FaceRecognition
+from threading import RLock
+from os import getenv
+from typing import Sequence
+import numpy as np
+import logging
+
+try:
+    import hnswlib
+except ImportError:  # pragma: no cover - dependencia opcional
+    hnswlib = None
+
+logger = logging.getLogger("uvicorn.error")
+
+# A partir de esta cantidad de rostros se usa HNSW (si hnswlib está instalado)
+# en lugar de la búsqueda exacta.
+FACE_INDEX_ANN_MIN_SIZE = int(getenv("FACE_INDEX_ANN_MIN_SIZE", "5000"))
+
+
+class FaceEmbeddingIndex:
+    """
+    Índice en memoria de los embeddings faciales: una matriz float32 contigua
+    (rostros × dimensiones) y el array de IDs de empleado de cada fila. La
+    identificación es una única operación vectorizada, o una consulta HNSW
+    cuando hay muchos rostros y `hnswlib` está disponible.
+    """
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._embeddings = np.empty((0, 0), dtype=np.float32)
+        self._employee_ids = np.empty(0, dtype=np.int64)
+        self._signature: tuple | None = None
+        self._ann = None
+
+    def __len__(self) -> int:
+        return len(self._employee_ids)
+
+    def load(self, faces: Sequence[FaceRecognition], signature: tuple) -> None:
+        rows = [
+            (face.employee_id, face.embedding)
+            for face in faces
+            if face.embedding is not None and len(face.embedding)
+        ]
+        with self._lock:
+            if rows:
+                # Los embeddings ya llegan como arrays float32 (`np.frombuffer`),
+                # por lo que armar la matriz es una única copia.
+                self._embeddings = np.vstack(
+                    [embedding for _, embedding in rows]
+                ).astype(np.float32, copy=False)
+                self._employee_ids = np.array(
+                    [employee_id for employee_id, _ in rows], dtype=np.int64
+                )
+            else:
+                self._embeddings = np.empty((0, 0), dtype=np.float32)
+                self._employee_ids = np.empty(0, dtype=np.int64)
+            self._ann = None
+            self._signature = signature
+        logger.info(f"Loaded {len(rows)} face embeddings into the index")
+
+    def ensure_loaded(self, db: DatabaseSession) -> None:
+        """
+        Cada proceso tiene su propio índice. En cada request se compara una
+        firma barata de la tabla (cantidad de filas, mayor ID y última
+        modificación) con la de la última carga, y si cambió (un alta, baja
+        o reemplazo hecho por este u otro worker) se recarga antes de
+        identificar a nadie.
+        """
+        signature = tuple(
+            db.exec(
+                select(
+                    func.count(),
+                    func.max(FaceRecognition.id),
+                    func.max(FaceRecognition.updated_at),
+                )
+            ).one()
+        )
+        if signature != self._signature:
+            self.load(db.exec(select(FaceRecognition)).all(), signature)
+
+    def _as_vector(self, embedding: list[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if len(self) and vector.shape != (self._embeddings.shape[1],):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The embedding must have {self._embeddings.shape[1]} dimensions.",
+            )
+        return vector
+
+    def validate(self, embedding: list[float] | None) -> None:
+        """
+        Lanza 400 si el embedding no tiene las dimensiones del índice. Se
+        llama antes de guardar, para no confirmar un registro que después
+        no se puede indexar.
+        """
+        if embedding is None or not len(embedding):
+            return
+        with self._lock:
+            self._as_vector(embedding)
+
+    def upsert(self, employee_id: int, embedding: list[float] | None) -> None:
+        with self._lock:
+            # Se valida antes de quitar la entrada anterior: si falla, el
+            # índice queda como estaba
+            vector = None
+            if embedding is not None and len(embedding):
+                vector = self._as_vector(embedding)
+            self.remove(employee_id)
+            if vector is None:
+                return
+            if len(self):
+                self._embeddings = np.vstack([self._embeddings, vector])
+            else:
+                self._embeddings = vector.reshape(1, -1)
+            self._employee_ids = np.append(self._employee_ids, employee_id)
+            self._ann = None
+
+    def remove(self, employee_id: int) -> None:
+        with self._lock:
+            keep = self._employee_ids != employee_id
+            if keep.all():
+                return
+            self._embeddings = np.ascontiguousarray(self._embeddings[keep])
+            self._employee_ids = self._employee_ids[keep]
+            self._ann = None
+
+    def _get_ann(self):
+        if hnswlib is None or len(self) < FACE_INDEX_ANN_MIN_SIZE:
+            return None
+        if self._ann is None:
+            ann = hnswlib.Index(space="l2", dim=self._embeddings.shape[1])
+            ann.init_index(max_elements=len(self), ef_construction=200, M=16)
+            ann.add_items(self._embeddings, np.arange(len(self)))
+            ann.set_ef(64)
+            self._ann = ann
+        return self._ann
+
+    def nearest(self, embeddings: list[list[float]]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Devuelve, para cada embedding, el ID de empleado más cercano y su
+        distancia euclidiana.
+        """
+        with self._lock:
+            if not len(self):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="No registered faces to compare with.",
+                )
+            queries = np.atleast_2d(
+                np.asarray([self._as_vector(e) for e in embeddings], dtype=np.float32)
+            )
+            ann = self._get_ann()
+            if ann is not None:
+                labels, squared = ann.knn_query(queries, k=1)
+                rows = labels[:, 0].astype(np.int64)
+                distances = np.sqrt(np.maximum(squared[:, 0], 0))
+            else:
+                # ||q - e||² = ||q||² - 2 q·e + ||e||², calculado como matriz
+                squared = (
+                    np.einsum("ij,ij->i", queries, queries)[:, None]
+                    - 2 * queries @ self._embeddings.T
+                    + np.einsum("ij,ij->i", self._embeddings, self._embeddings)[None, :]
+                )
+                rows = np.argmin(squared, axis=1)
+                distances = np.sqrt(
+                    np.maximum(squared[np.arange(len(queries)), rows], 0)
+                )
+            return self._employee_ids[rows], distances
+
+    def find(self, embedding: list[float]) -> tuple[int, float]:
+        employee_ids, distances = self.nearest([embedding])
+        return int(employee_ids[0]), float(distances[0])
+
+
+face_index = FaceEmbeddingIndex()
@@ -1,31 +1,32 @@
 from datetime import datetime
 from fastapi import HTTPException, status
-from sqlmodel import select
+from sqlalchemy import insert
+from sqlmodel import col, select
 from src.database.core import DatabaseSession
-from src.modules.clock_events.schemas.schemas import ClockEventRequest
+from src.modules.clock_events.models.models import ClockEvents
+from src.modules.clock_events.schemas.schemas import ClockEventRequest, ClockEventTypes
 from src.modules.clock_events.services.services import post_clock_event
 from src.modules.employees.models.employee import Employee
 from src.modules.face_recognition.models.face_recognition import FaceRecognition
 from src.modules.face_recognition.schemas.face_recognition_models import (
+    BatchAttendanceRequest,
+    BatchAttendanceResponse,
     CreateFaceRegistration,
     OperationStatus,
     UpdateFaceRegistration,
     VerifyFaceRegistration,
     FaceRecognitionBaseModel,
+    ScanStatus,
 )
-import numpy as np
-from typing import List
+from src.modules.face_recognition.services.face_index import face_index
 
 
 THRESHOLD = 0.6  # distancia máxima aceptada para considerar una coincidencia
 
-
-def euclidean_distance(vec1: List[float], vec2: List[float]) -> float:
-    return np.linalg.norm(np.array(vec1) - np.array(vec2))
-
-
-def get_all_faces(db: DatabaseSession):
-    return db.exec(select(FaceRecognition)).all()
+TOTEM_DEVICE_IDS = {
+    ClockEventTypes.IN: "Totem de reconocimiento facial ingreso.",
+    ClockEventTypes.OUT: "Totem de reconocimiento facial egreso.",
+}
 
 
 def create_face_register(
@@ -33,16 +34,16 @@ def create_face_register(
 ) -> FaceRecognitionBaseModel:
     # Verificar si ya existe un rostro similar
     new_embedding = create_face_register_request.embedding
-    db_faces = get_all_faces(db)
-
-    for face in db_faces:
-        if face.embedding:
-            distance = euclidean_distance(face.embedding, new_embedding)
-            if distance < THRESHOLD:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="A similar face already exists in the system.",
-                )
+    face_index.ensure_loaded(db)
+    face_index.validate(new_embedding)
+
+    if len(face_index) and new_embedding:
+        _, distance = face_index.find(new_embedding)
+        if distance < THRESHOLD:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A similar face already exists in the system.",
+            )
 
     # Crear el nuevo registro\
     employee_id = create_face_register_request.employee_id
@@ -53,6 +54,7 @@ def create_face_register(
     db.add(db_face_register)
     db.commit()
     db.refresh(db_face_register)
+    face_index.upsert(employee_id, new_embedding)
 
     return db_face_register
 
@@ -60,26 +62,16 @@ def create_face_register(
 def verify_face(
     db: DatabaseSession, verify_face_recognition_request: VerifyFaceRegistration
 ) -> OperationStatus:
-    db_faces = get_all_faces(db)
-
-    if not db_faces:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No registered faces to compare with."
+    face_index.ensure_loaded(db)
+    employee_id, distance = face_index.find(verify_face_recognition_request.embedding)
+
+    if distance < THRESHOLD:
+        return OperationStatus(
+            success=True,
+            message=f"Face verified successfully. Employee ID: {employee_id}",
+            employee_id=employee_id,
         )
 
-    input_embedding = verify_face_recognition_request.embedding
-
-    for face in db_faces:
-        if face.embedding:
-            distance = euclidean_distance(face.embedding, input_embedding)
-            if distance < THRESHOLD:
-                return OperationStatus(
-                    success=True,
-                    message=f"Face verified successfully. Employee ID: {face.employee_id}",
-                    employee_id=face.employee_id,
-                )
-
     return OperationStatus(employee_id=None, success=False, message="No match found.")
 
 
@@ -98,10 +90,15 @@ def update_face_register(
         # )
         return result
     else:
+        face_index.ensure_loaded(db)
+        face_index.validate(update_face_register_request.embedding)
         db_face_register.embedding = update_face_register_request.embedding
         db.add(db_face_register)
         db.commit()
         db.refresh(db_face_register)
+        face_index.upsert(
+            db_face_register.employee_id, db_face_register.embedding
+        )
         result = FaceRecognitionBaseModel(
             id=db_face_register.id,
             employee_id=db_face_register.employee_id,
@@ -120,47 +117,113 @@ def delete_face_register(db: DatabaseSession, employee_id: int) -> None:
 
     db.delete(db_face_register)
     db.commit()
+    face_index.remove(employee_id)
 
 
 def register_attendance(
     db: DatabaseSession, verify_face_recognition_request: VerifyFaceRegistration, event_type: str, device_id: str
 ) -> OperationStatus:
-    db_faces = get_all_faces(db)
+    face_index.ensure_loaded(db)
+    employee_id, distance = face_index.find(verify_face_recognition_request.embedding)
+
+    if distance >= THRESHOLD:
+        return OperationStatus(employee_id=None, success=False, message="No match found.")
 
-    if not db_faces:
+    employee = db.exec(
+        select(Employee).where(Employee.id == employee_id)
+    ).one_or_none()
+
+    if employee is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="No registered faces to compare with."
+            detail="Employee not found."
         )
 
-    input_embedding = verify_face_recognition_request.embedding
-
-    for face in db_faces:
-        if face.embedding:
-            distance = euclidean_distance(face.embedding, input_embedding)
-            if distance < THRESHOLD:
-                employee = db.exec(
-                    select(Employee).where(Employee.id == face.employee_id)
-                ).one_or_none()
-
-                if employee is None:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail="Employee not found."
-                    )
-
-                post_clock_event(db,ClockEventRequest(
-                        employee_id= employee.id,
-                        event_type= event_type,
-                        event_date= datetime.now(),
-                        device_id= device_id,
-                        source= "face_recognition"
-                ))
-
-                return OperationStatus(
-                    success=True,
-                    message=f"Check-in successful. Employee ID: {employee.id}",
-                    employee_id=employee.id,
+    post_clock_event(db,ClockEventRequest(
+            employee_id= employee.id,
+            event_type= event_type,
+            event_date= datetime.now(),
+            device_id= device_id,
+            source= "face_recognition"
+    ))
+
+    return OperationStatus(
+        success=True,
+        message=f"Check-in successful. Employee ID: {employee.id}",
+        employee_id=employee.id,
+    )
+
+
+def register_attendance_batch(
+    db: DatabaseSession, batch_request: BatchAttendanceRequest
+) -> BatchAttendanceResponse:
+    """
+    Identifica todos los escaneos con una sola consulta al índice de rostros
+    y registra las fichadas reconocidas en una única transacción.
+    """
+    scans = batch_request.scans
+    face_index.ensure_loaded(db)
+    employee_ids, distances = face_index.nearest([scan.embedding for scan in scans])
+    matched = distances < THRESHOLD
+
+    existing_ids = set(
+        db.exec(
+            select(Employee.id).where(
+                col(Employee.id).in_(set(employee_ids[matched].tolist()))
+            )
+        ).all()
+    )
+
+    results: list[ScanStatus] = []
+    clock_events: list[dict] = []
+    for scan, employee_id, is_match in zip(scans, employee_ids.tolist(), matched):
+        if not is_match:
+            results.append(
+                ScanStatus(
+                    success=False,
+                    message="No match found.",
+                    employee_id=None,
+                    event_type=scan.event_type,
+                    event_date=scan.event_date,
+                )
+            )
+            continue
+        if employee_id not in existing_ids:
+            results.append(
+                ScanStatus(
+                    success=False,
+                    message="Employee not found.",
+                    employee_id=employee_id,
+                    event_type=scan.event_type,
+                    event_date=scan.event_date,
                 )
+            )
+            continue
+
+        clock_events.append(
+            {
+                "employee_id": employee_id,
+                "event_type": scan.event_type,
+                "event_date": scan.event_date,
+                "device_id": batch_request.device_id
+                or TOTEM_DEVICE_IDS[scan.event_type],
+                "source": "face_recognition",
+            }
+        )
+        results.append(
+            ScanStatus(
+                success=True,
+                message=f"Check-in successful. Employee ID: {employee_id}",
+                employee_id=employee_id,
+                event_type=scan.event_type,
+                event_date=scan.event_date,
+            )
+        )
 
-    return OperationStatus(employee_id=None, success=False, message="No match found.")
+    if clock_events:
+        db.execute(insert(ClockEvents), clock_events)
+        db.commit()
+
+    return BatchAttendanceResponse(
+        total=len(scans), registered=len(clock_events), results=results
+    )
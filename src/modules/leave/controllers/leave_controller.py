@@ -1,6 +1,6 @@
 from fastapi import APIRouter, status
 from typing import Optional
-from src.database.core import DatabaseSession
+from src.database.core import DatabaseSession, ReadDatabaseSession
 from src.modules.auth.token import TokenDependency
 from src.modules.leave.schemas.leave_schemas import (
     LeaveDocumentStatus,
@@ -16,8 +16,8 @@ leave_router = APIRouter(prefix="/leaves", tags=["Leaves"])
 
 
 @leave_router.get("/", response_model=list[LeavePublic], status_code=status.HTTP_200_OK)
-async def get_leaves(
-    session: DatabaseSession,
+def get_leaves(
+    session: ReadDatabaseSession,
     document_status: Optional[LeaveDocumentStatus] = None,
     request_status: Optional[LeaveRequestStatus] = None,
     employee_id: Optional[int] = None,
@@ -31,7 +31,7 @@ async def get_leaves(
 @leave_router.get(
     "/types", response_model=list[LeaveTypePublic], status_code=status.HTTP_200_OK
 )
-async def get_leave_types(session: DatabaseSession):
+def get_leave_types(session: DatabaseSession):
     return leave_service.get_leave_types(session)
 
 
@@ -40,19 +40,19 @@ async def get_leave_types(session: DatabaseSession):
     response_model=LeaveTypePublic,
     status_code=status.HTTP_200_OK,
 )
-async def get_leave_type(session: DatabaseSession, leave_type_id: int):
+def get_leave_type(session: DatabaseSession, leave_type_id: int):
     return leave_service.get_leave_type(session, leave_type_id)
 
 
 @leave_router.get(
     "/{leave_id}", response_model=LeavePublic, status_code=status.HTTP_200_OK
 )
-async def get_leave(session: DatabaseSession, leave_id: int):
+def get_leave(session: DatabaseSession, leave_id: int):
     return leave_service.get_leave(session, leave_id)
 
 
 @leave_router.put("/", response_model=LeavePublic, status_code=status.HTTP_201_CREATED)
-async def create_leave(
+def create_leave(
     session: DatabaseSession, token: TokenDependency, request: LeaveCreate
 ):
     return leave_service.create_leave(session, token, request)
@@ -61,7 +61,7 @@ async def create_leave(
 @leave_router.patch(
     "/{leave_id}", response_model=LeavePublic, status_code=status.HTTP_200_OK
 )
-async def update_leave(
+def update_leave(
     session: DatabaseSession,
     token: TokenDependency,
     leave_id: int,
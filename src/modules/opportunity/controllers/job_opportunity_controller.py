@@ -1,5 +1,5 @@
 from fastapi import APIRouter, status
-from src.database.core import DatabaseSession
+from src.database.core import DatabaseSession, ReadDatabaseSession
 from src.modules.opportunity.schemas.job_opportunity_schemas import (
     JobOpportunityResponse,
     JobOpportunityRequest,
@@ -17,14 +17,14 @@ opportunity_router = APIRouter(prefix="/opportunities", tags=["Opportunities"])
     status_code=status.HTTP_200_OK,
     summary="Cantidad de oportunidades activas",
 )
-async def count_active_opportunities(db: DatabaseSession):
+def count_active_opportunities(db: DatabaseSession):
     return {"active_count": opportunity_service.count_active_opportunities(db)}
 
 
 @opportunity_router.get(
     "/", status_code=status.HTTP_200_OK, response_model=list[JobOpportunityResponse]
 )
-async def get_all_opportunities_with_abilities(db: DatabaseSession):
+def get_all_opportunities_with_abilities(db: ReadDatabaseSession):
     return opportunity_service.get_all_opportunities_with_abilities(db)
 
 
@@ -33,7 +33,7 @@ async def get_all_opportunities_with_abilities(db: DatabaseSession):
     status_code=status.HTTP_200_OK,
     response_model=JobOpportunityResponse,
 )
-async def get_opportunity_with_abilities(db: DatabaseSession, opportunity_id: int):
+def get_opportunity_with_abilities(db: DatabaseSession, opportunity_id: int):
     return opportunity_service.get_opportunity_with_abilities(db, opportunity_id)
 
 
@@ -42,7 +42,7 @@ async def get_opportunity_with_abilities(db: DatabaseSession, opportunity_id: in
     status_code=status.HTTP_201_CREATED,
     response_model=JobOpportunityResponse,
 )
-async def create_opportunity(
+def create_opportunity(
     db: DatabaseSession,
     job_opportunity_request: JobOpportunityRequest,
     payload: TokenDependency,  # ⬅️ obtenemos el token decodificado
@@ -63,12 +63,12 @@ async def create_opportunity(
     status_code=status.HTTP_200_OK,
     response_model=JobOpportunityResponse,
 )
-async def update_opportunity(
+def update_opportunity(
     db: DatabaseSession, opportunity_id: int, patch: JobOpportunityUpdate
 ):
     return opportunity_service.update_opportunity(db, opportunity_id, patch)
 
 
 @opportunity_router.delete("/{opportunity_id}", status_code=status.HTTP_200_OK)
-async def delete_opportunity(db: DatabaseSession, opportunity_id: int) -> None:
+def delete_opportunity(db: DatabaseSession, opportunity_id: int) -> None:
     return opportunity_service.delete_opportunity(db, opportunity_id)
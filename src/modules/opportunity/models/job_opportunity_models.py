@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime
 from sqlalchemy.sql import func
@@ -60,6 +61,14 @@ class JobOpportunityIdModel(JobOpportunityBaseModel):
 
 class JobOpportunityAbility(SQLModel, table=True):
     __tablename__ = "job_opportunity_ability"  # type: ignore
+    __table_args__ = (
+        # Las habilidades se leen por oportunidad y tipo (requerida/deseada)
+        Index(
+            "ix_job_opportunity_ability_job_opportunity_id_ability_type",
+            "job_opportunity_id",
+            "ability_type",
+        ),
+    )
 
     job_opportunity_id: int = Field(primary_key=True, foreign_key="job_opportunity.id")
     ability_id: int = Field(primary_key=True, foreign_key="ability.id")
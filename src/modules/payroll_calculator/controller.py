@@ -1,7 +1,14 @@
 from fastapi import APIRouter, status
-from src.database.core import DatabaseSession
+from fastapi.responses import StreamingResponse
+from src.database.core import (
+    AsyncDatabaseSession,
+    AsyncReadDatabaseSession,
+    DatabaseSession,
+)
+from src.modules.payroll_calculator import run_service
 from src.modules.payroll_calculator import schemas
 from src.modules.payroll_calculator import service
+from src.modules.payroll_calculator import summary_service
 
 payroll_router = APIRouter(prefix="/payroll", tags=["Payroll Calculation"])
 
@@ -10,21 +17,146 @@ payroll_router = APIRouter(prefix="/payroll", tags=["Payroll Calculation"])
     response_model=list[schemas.PayrollPendingValidationResponse],
     status_code=status.HTTP_200_OK,
 )
-async def get_pending_validation_hours(db: DatabaseSession, request: schemas.PayrollPendingValidationRequest):
-    return service.get_pending_validation_hours(db, request)
+async def get_pending_validation_hours(db: AsyncDatabaseSession, request: schemas.PayrollPendingValidationRequest):
+    """
+    Devuelve las horas pendientes de validación. Con `limit` se pagina: la
+    página siguiente se pide con `after_id` igual al último
+    `employee_hours.id` recibido.
+    """
+    return await service.get_pending_validation_hours_async(db, request)
+
+
+@payroll_router.post(
+    "/pending_validation_hours/stream",
+    status_code=status.HTTP_200_OK,
+)
+def stream_pending_validation_hours(request: schemas.PayrollPendingValidationRequest):
+    """
+    Igual que `/pending_validation_hours` pero como NDJSON, una línea por
+    registro, sin cargar todos los resultados en memoria.
+    """
+    service.check_date_range(request.start_date, request.end_date)
+    return StreamingResponse(
+        service.stream_pending_validation_hours(request),
+        media_type="application/x-ndjson",
+    )
 
 @payroll_router.post(
     "/calculate",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-async def calculate_hours(db: DatabaseSession, request: schemas.PayrollRequest):
+def calculate_hours(db: DatabaseSession, request: schemas.PayrollRequest):
     return service.calculate_hours(db, request)
 
 
+@payroll_router.post(
+    "/calculate/bulk",
+    response_model=schemas.PayrollBulkResponse,
+    status_code=status.HTTP_200_OK,
+)
+def calculate_hours_bulk(db: DatabaseSession, request: schemas.PayrollBulkRequest):
+    return service.calculate_hours_bulk(db, request)
+
+
 @payroll_router.post(
     "/hours",
     response_model=list[schemas.PayrollResponse],
     status_code=status.HTTP_200_OK,
 )
-async def get_hours_by_date_range(db: DatabaseSession, request: schemas.PayrollRequest):
-    return service.get_hours_by_date_range(db, request)
+async def get_hours_by_date_range(db: AsyncDatabaseSession, request: schemas.PayrollHoursRequest):
+    """
+    Devuelve las horas del empleado en el rango ordenadas por fecha. Con
+    `limit` se pagina: la página siguiente se pide con `after_date` y
+    `after_id` iguales a `work_date` e `id` del último registro recibido.
+    """
+    return await service.get_hours_by_date_range_async(db, request)
+
+
+@payroll_router.post(
+    "/hours/stream",
+    status_code=status.HTTP_200_OK,
+)
+def stream_hours_by_date_range(db: DatabaseSession, request: schemas.PayrollHoursRequest):
+    """
+    Igual que `/hours` pero como NDJSON, una línea por registro, sin cargar
+    todos los resultados en memoria.
+    """
+    service.check_date_range(request.start_date, request.end_date)
+    service.get_employee_by_id(db, request.employee_id)
+    return StreamingResponse(
+        service.stream_hours_by_date_range(request),
+        media_type="application/x-ndjson",
+    )
+
+
+@payroll_router.post(
+    "/summary",
+    response_model=list[schemas.PayrollSummaryResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_monthly_summary(db: AsyncReadDatabaseSession, request: schemas.PayrollSummaryRequest):
+    """
+    Devuelve los totales mensuales precalculados por empleado y concepto.
+    """
+    return await summary_service.get_monthly_summary_async(db, request)
+
+
+@payroll_router.post(
+    "/summary/rebuild",
+    response_model=schemas.PayrollSummaryRebuildResponse,
+    status_code=status.HTTP_200_OK,
+)
+def rebuild_monthly_summary(db: DatabaseSession):
+    """
+    Reconstruye todo el resumen mensual a partir de las horas cargadas.
+    """
+    return summary_service.rebuild_monthly_summary(db)
+
+
+@payroll_router.post(
+    "/runs",
+    response_model=schemas.PayrollRunResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def create_payroll_run(db: DatabaseSession, request: schemas.PayrollRunRequest):
+    """
+    Encola la liquidación de todos los empleados activos, opcionalmente
+    filtrados por sector o turno, y devuelve el ID de la liquidación.
+    """
+    return run_service.create_run(db, request)
+
+
+@payroll_router.get(
+    "/runs/{run_id}",
+    response_model=schemas.PayrollRunResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_payroll_run(db: DatabaseSession, run_id: int):
+    return run_service.get_run(db, run_id)
+
+
+@payroll_router.get(
+    "/runs/{run_id}/progress",
+    status_code=status.HTTP_200_OK,
+)
+def stream_payroll_run_progress(db: DatabaseSession, run_id: int):
+    """
+    Devuelve el progreso de la liquidación como NDJSON, una línea por cambio.
+    """
+    run_service.get_run_or_not_found(db, run_id)
+    return StreamingResponse(
+        run_service.stream_run_progress(run_id),
+        media_type="application/x-ndjson",
+    )
+
+
+@payroll_router.post(
+    "/runs/{run_id}/resume",
+    response_model=schemas.PayrollRunResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def resume_payroll_run(db: DatabaseSession, run_id: int):
+    """
+    Reanuda una liquidación interrumpida o reintenta los empleados con error.
+    """
+    return run_service.resume_run(db, run_id)
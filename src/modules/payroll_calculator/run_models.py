@@ -0,0 +1,33 @@
+from typing import Any
+from sqlmodel import SQLModel, Field, Column, JSON
+from datetime import date, datetime
+from src.modules.payroll_calculator.schemas import PayrollRunStatus
+
+
+class PayrollRun(SQLModel, table=True):
+    """
+    Liquidación de horas de toda la empresa (o de un sector o turno) para un
+    rango de fechas. Guarda los empleados incluidos al crearla, los que ya se
+    procesaron y los errores por empleado, para poder reanudarla.
+    """
+
+    __tablename__ = "payroll_run"  # type: ignore
+
+    id: int | None = Field(default=None, primary_key=True, index=True)
+    start_date: date
+    end_date: date
+    sector_id: int | None = Field(default=None, foreign_key="sector.id")
+    shift_id: int | None = Field(default=None, foreign_key="shift.id")
+    status: PayrollRunStatus = Field(default=PayrollRunStatus.PENDIENTE)
+    total: int = Field(default=0)
+    processed: int = Field(default=0)
+    failed: int = Field(default=0)
+    employee_ids: list[int] = Field(sa_column=Column(JSON), default_factory=list)
+    completed_ids: list[int] = Field(sa_column=Column(JSON), default_factory=list)
+    errors: dict[str, Any] = Field(sa_column=Column(JSON), default_factory=dict)
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: datetime | None = Field(default=None)
+    finished_at: datetime | None = Field(default=None)
+    # Proceso que la ejecuta y su último latido (`src/database/heartbeat.py`)
+    worker_id: str | None = Field(default=None, max_length=100)
+    heartbeat_at: datetime | None = Field(default=None)
@@ -0,0 +1,342 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from fastapi import HTTPException, status
+from sqlmodel import Session, col, select, update
+from src.database.core import DatabaseSession, engine
+from src.database.heartbeat import Heartbeat, stale_before, worker_id
+from src.modules.employees.models.employee import Employee
+from src.modules.employees.models.job import Job
+from src.modules.payroll_calculator import service
+from src.modules.payroll_calculator.run_models import PayrollRun
+from src.modules.payroll_calculator.schemas import (
+    PayrollBulkRequest,
+    PayrollRunRequest,
+    PayrollRunResponse,
+    PayrollRunStatus,
+)
+from time import monotonic, sleep
+from os import getenv
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+PAYROLL_RUN_WORKERS = int(getenv("PAYROLL_RUN_WORKERS", "4"))
+PAYROLL_RUN_CHUNK_SIZE = int(getenv("PAYROLL_RUN_CHUNK_SIZE", "50"))
+PAYROLL_RUN_POLL_SECONDS = float(getenv("PAYROLL_RUN_POLL_SECONDS", "1"))
+# El streaming de progreso se corta si la liquidación no avanza en este tiempo
+# (por ejemplo, si quedó interrumpida y hay que reanudarla).
+PAYROLL_RUN_STREAM_IDLE_SECONDS = float(
+    getenv("PAYROLL_RUN_STREAM_IDLE_SECONDS", "300")
+)
+
+# Un pool coordina las liquidaciones y otro calcula los lotes de empleados,
+# para que una liquidación nunca espere a un worker ocupado por ella misma.
+_run_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="payroll-run")
+_chunk_executor = ThreadPoolExecutor(
+    max_workers=PAYROLL_RUN_WORKERS, thread_name_prefix="payroll-worker"
+)
+_heartbeat = Heartbeat(PayrollRun.__table__)  # type: ignore
+
+FINISHED_STATUSES = (PayrollRunStatus.FINALIZADO, PayrollRunStatus.FALLIDO)
+
+
+def get_run_or_not_found(db: DatabaseSession, run_id: int) -> PayrollRun:
+    run = db.get(PayrollRun, run_id)
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"The payroll run {run_id} was not found",
+        )
+    return run
+
+
+def build_run_response(run: PayrollRun) -> PayrollRunResponse:
+    return PayrollRunResponse(
+        **run.model_dump(exclude={"errors", "employee_ids", "completed_ids"}),
+        errors={key: str(value) for key, value in run.errors.items()},
+    )
+
+
+def get_run(db: DatabaseSession, run_id: int) -> PayrollRunResponse:
+    return build_run_response(get_run_or_not_found(db, run_id))
+
+
+def select_employee_ids(db: DatabaseSession, request: PayrollRunRequest) -> list[int]:
+    """
+    Empleados activos incluidos en la liquidación según los filtros.
+    """
+    query = select(Employee.id).where(col(Employee.active).is_(True))
+    if request.shift_id is not None:
+        query = query.where(Employee.shift_id == request.shift_id)
+    if request.sector_id is not None:
+        query = query.join(Job, col(Employee.job_id) == Job.id).where(
+            Job.sector_id == request.sector_id
+        )
+    return list(db.exec(query.order_by(col(Employee.id))).all())
+
+
+def claim_run(db: DatabaseSession, run_id: int) -> bool:
+    """
+    Toma la liquidación para este proceso con un UPDATE condicional, así
+    dos workers no pueden reanudarla a la vez (dos cálculos sobre los mismos
+    empleados duplicarían los registros de horas). Se puede tomar si no
+    terminó bien o si está en proceso pero sin latido reciente (el worker
+    que la ejecutaba se cayó). Devuelve si la tomó.
+    """
+    claimable = (
+        col(PayrollRun.status).in_(
+            [PayrollRunStatus.PENDIENTE, PayrollRunStatus.FALLIDO]
+        )
+        | (
+            (col(PayrollRun.status) == PayrollRunStatus.FINALIZADO)
+            & (col(PayrollRun.failed) > 0)
+        )
+        | (
+            (col(PayrollRun.status) == PayrollRunStatus.EN_PROCESO)
+            & (
+                col(PayrollRun.heartbeat_at).is_(None)
+                | (col(PayrollRun.heartbeat_at) < stale_before())
+            )
+        )
+    )
+    result = db.exec(
+        update(PayrollRun)
+        .where(col(PayrollRun.id) == run_id)
+        .where(claimable)
+        .values(
+            status=PayrollRunStatus.EN_PROCESO,
+            worker_id=worker_id(),
+            heartbeat_at=datetime.now(),
+            finished_at=None,
+        )
+    )
+    db.commit()
+    return bool(result.rowcount)
+
+
+def enqueue_run(run_id: int) -> None:
+    # Con latido desde que se encola: puede esperar a que se libere el pool
+    _heartbeat.add(run_id)
+    _run_executor.submit(run_payroll, run_id)
+
+
+def create_run(db: DatabaseSession, request: PayrollRunRequest) -> PayrollRunResponse:
+    """
+    Registra la liquidación con los empleados que cumplen los filtros y la
+    encola. Devuelve inmediatamente el estado inicial.
+    """
+    if request.end_date < request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be greater than start date",
+        )
+    employee_ids = select_employee_ids(db, request)
+    if not employee_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No active employees match the given filters",
+        )
+
+    # Se crea ya tomada por este proceso
+    run = PayrollRun(
+        **request.model_dump(),
+        employee_ids=employee_ids,
+        total=len(employee_ids),
+        status=PayrollRunStatus.EN_PROCESO,
+        worker_id=worker_id(),
+        heartbeat_at=datetime.now(),
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    logger.info(f"Queued payroll run {run.id} for {run.total} employees")
+
+    enqueue_run(run.id)  # type: ignore
+    return build_run_response(run)
+
+
+def resume_run(db: DatabaseSession, run_id: int) -> PayrollRunResponse:
+    """
+    Vuelve a encolar una liquidación interrumpida o con errores. Solo se
+    calculan los empleados que todavía no se completaron.
+    """
+    run = get_run_or_not_found(db, run_id)
+    if run.status == PayrollRunStatus.FINALIZADO and not run.failed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"The payroll run {run_id} already finished",
+        )
+    if not claim_run(db, run_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"The payroll run {run_id} is already running",
+        )
+    enqueue_run(run_id)
+    logger.info(f"Resumed payroll run {run_id}")
+    db.refresh(run)
+    return build_run_response(run)
+
+
+def calculate_chunk(
+    start_date: date, end_date: date, employee_ids: list[int]
+) -> dict[int, str]:
+    """
+    Calcula un lote de empleados en su propia sesión y transacción. Si el
+    lote falla se recalcula de a un empleado para aislar los errores.
+    Devuelve los errores por empleado.
+    """
+    with Session(engine) as db:
+        try:
+            service.calculate_hours_bulk(
+                db,
+                PayrollBulkRequest(
+                    employee_ids=employee_ids, start_date=start_date, end_date=end_date
+                ),
+            )
+            return {}
+        except Exception as e:
+            if len(employee_ids) == 1:
+                return {employee_ids[0]: str(getattr(e, "detail", e))}
+
+        errors: dict[int, str] = {}
+        for employee_id in employee_ids:
+            try:
+                service.calculate_hours_bulk(
+                    db,
+                    PayrollBulkRequest(
+                        employee_ids=[employee_id],
+                        start_date=start_date,
+                        end_date=end_date,
+                    ),
+                )
+            except Exception as e:
+                errors[employee_id] = str(getattr(e, "detail", e))
+        return errors
+
+
+def save_run(db: Session, run: PayrollRun) -> bool:
+    """
+    Guarda el progreso solo si la liquidación sigue tomada por este proceso:
+    si perdió el latido y otro worker la retomó, no pisa su progreso.
+    Devuelve si la guardó.
+    """
+    result = db.exec(
+        update(PayrollRun)
+        .where(col(PayrollRun.id) == run.id)
+        .where(col(PayrollRun.worker_id) == worker_id())
+        .values(
+            status=run.status,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            processed=run.processed,
+            failed=run.failed,
+            completed_ids=run.completed_ids,
+            errors=run.errors,
+        )
+    )
+    db.commit()
+    return bool(result.rowcount)
+
+
+def run_payroll(run_id: int) -> None:
+    """
+    Reparte los empleados pendientes en lotes entre los workers. El progreso
+    solo lo escribe este thread, a medida que terminan los lotes, por lo que
+    al reanudar se retoma desde el último lote confirmado.
+    """
+    try:
+        with Session(engine) as db:
+            run = db.get(PayrollRun, run_id)
+            if run is None:
+                logger.error(f"Payroll run {run_id} not found")
+                return
+            if run.worker_id != worker_id():
+                logger.warning(f"Payroll run {run_id} was claimed by {run.worker_id}")
+                return
+            # Se escribe con `save_run`, no con el ORM
+            db.expunge(run)
+
+            try:
+                completed = set(run.completed_ids)
+                pending = [id for id in run.employee_ids if id not in completed]
+                run.started_at = run.started_at or datetime.now()
+                run.processed = len(completed)
+                run.failed = 0
+                run.errors = {}
+                # Se crean los conceptos antes de repartir para que los workers
+                # no intenten crearlos en paralelo.
+                service.get_payroll_concepts(db)
+                if not save_run(db, run):
+                    raise RuntimeError("lost the claim on the run")
+
+                chunks = [
+                    pending[i : i + PAYROLL_RUN_CHUNK_SIZE]
+                    for i in range(0, len(pending), PAYROLL_RUN_CHUNK_SIZE)
+                ]
+                futures = {
+                    _chunk_executor.submit(
+                        calculate_chunk, run.start_date, run.end_date, chunk
+                    ): chunk
+                    for chunk in chunks
+                }
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    errors = future.result()
+                    run.completed_ids = run.completed_ids + [
+                        id for id in chunk if id not in errors
+                    ]
+                    run.errors = {
+                        **run.errors,
+                        **{str(id): error for id, error in errors.items()},
+                    }
+                    run.processed += len(chunk)
+                    run.failed += len(errors)
+                    if not save_run(db, run):
+                        raise RuntimeError("lost the claim on the run")
+
+                run.status = PayrollRunStatus.FINALIZADO
+            except Exception as e:
+                logger.error(f"Payroll run {run_id} failed")
+                logger.error(e)
+                db.rollback()
+                run.status = PayrollRunStatus.FALLIDO
+                run.errors = {**run.errors, "run": str(getattr(e, "detail", e))}
+
+            run.finished_at = datetime.now()
+            if not save_run(db, run):
+                logger.warning(f"Payroll run {run_id} was taken over by another worker")
+                return
+            logger.info(
+                f"Payroll run {run_id} {run.status.value}: "
+                f"{run.processed}/{run.total} processed, {run.failed} failed"
+            )
+    finally:
+        _heartbeat.discard(run_id)
+
+
+def stream_run_progress(run_id: int) -> Iterator[str]:
+    """
+    Emite el estado de la liquidación como NDJSON cada vez que cambia, hasta
+    que termina o deja de avanzar. Usa su propia sesión porque la del request
+    se cierra antes de que empiece el streaming.
+    """
+    last_line = None
+    last_change = monotonic()
+    with Session(engine) as db:
+        while True:
+            run = db.get(PayrollRun, run_id, populate_existing=True)
+            if run is None:
+                return
+            line = build_run_response(run).model_dump_json()
+            if line != last_line:
+                yield line + "\n"
+                last_line = line
+                last_change = monotonic()
+            if run.status in FINISHED_STATUSES:
+                return
+            if monotonic() - last_change > PAYROLL_RUN_STREAM_IDLE_SECONDS:
+                return
+            # Cierra la transacción de lectura para ver los próximos commits
+            db.rollback()
+            sleep(PAYROLL_RUN_POLL_SECONDS)
@@ -1,6 +1,7 @@
-from datetime import date, time
+from datetime import date, datetime, time
+from enum import Enum
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from src.modules.employees.models.employee import Employee
 
@@ -10,6 +11,34 @@ class PayrollRequest(BaseModel):
     end_date: date
 
 
+class PayrollHoursRequest(PayrollRequest):
+    # Paginación por cursor: fecha e ID del último registro de la página anterior
+    after_date: Optional[date] = None
+    after_id: Optional[int] = None
+    limit: Optional[int] = Field(default=None, ge=1)
+
+    @model_validator(mode="after")
+    def validate_cursor(self):
+        # El cursor es el par (fecha, ID): uno solo no indica dónde seguir
+        if (self.after_date is None) != (self.after_id is None):
+            raise ValueError("after_date and after_id must be sent together")
+        return self
+
+
+class PayrollBulkRequest(BaseModel):
+    employee_ids: List[int] = Field(min_length=1)
+    start_date: date
+    end_date: date
+
+
+class PayrollBulkResponse(BaseModel):
+    employees: int
+    unchanged: int
+    updated: int
+    inserted: int
+    deleted: int
+
+
 class ConceptSchema(BaseModel):
     id: int | None
     description: str
@@ -54,9 +83,66 @@ class PayrollPendingValidationRequest(BaseModel):
     employee_id: Optional[List[int]] = None
     start_date: Optional[date] = None
     end_date: Optional[date] = None
+    # Paginación por cursor: ID del último registro de la página anterior
+    after_id: Optional[int] = None
+    limit: Optional[int] = Field(default=None, ge=1)
 
 class PayrollPendingValidationResponse(BaseModel):
     employee: Employee
     employee_hours: EmployeeHoursSchema
     concept: ConceptSchema
     shift: ShiftSchema
+
+
+class PayrollSummaryRequest(BaseModel):
+    employee_id: Optional[List[int]] = None
+    start_month: Optional[date] = None
+    end_month: Optional[date] = None
+
+
+class PayrollSummaryResponse(BaseModel):
+    employee_id: int
+    month: date
+    concept_id: int | None
+    concept: ConceptSchema | None
+    record_count: int
+    total_time_seconds: int
+    extra_hours_seconds: int
+    payable_days: int
+    absent_days: int
+    updated_at: datetime
+
+
+class PayrollSummaryRebuildResponse(BaseModel):
+    employees: int
+    rows: int
+
+
+class PayrollRunStatus(str, Enum):
+    PENDIENTE = "pendiente"
+    EN_PROCESO = "en_proceso"
+    FINALIZADO = "finalizado"
+    FALLIDO = "fallido"
+
+
+class PayrollRunRequest(BaseModel):
+    start_date: date
+    end_date: date
+    sector_id: Optional[int] = None
+    shift_id: Optional[int] = None
+
+
+class PayrollRunResponse(BaseModel):
+    id: int
+    start_date: date
+    end_date: date
+    sector_id: Optional[int]
+    shift_id: Optional[int]
+    status: PayrollRunStatus
+    total: int
+    processed: int
+    failed: int
+    errors: dict[str, str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
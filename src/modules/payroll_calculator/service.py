@@ -1,64 +1,158 @@
-from collections import defaultdict
 from datetime import date, datetime, time, timedelta
 from fastapi import HTTPException, status
-from src.database.core import DatabaseSession
+from src.database.core import (
+    AsyncDatabaseSession,
+    DatabaseSession,
+    open_read_session,
+)
 from src.modules.clock_events.models.models import ClockEvents
 from src.modules.clock_events.schemas.schemas import ClockEventTypes
 from src.modules.concept.models.models import Concept
+from src.modules.concept.services.cache import concept_cache
 from src.modules.employees.models.employee import Employee
 from src.modules.employees.schemas.employee_models import EmployeeResponse
 from src.modules.payroll_calculator.schemas import (
     ConceptSchema,
     EmployeeHoursSchema,
     PayrollPendingValidationResponse,
+    PayrollBulkRequest,
+    PayrollBulkResponse,
+    PayrollHoursRequest,
     PayrollRequest,
     PayrollResponse,
     ShiftSchema,
     PayrollPendingValidationRequest
 )
-from src.modules.employee_hours.models.models import EmployeeHours, RegisterType, payType
-from sqlmodel import delete, select
+from src.modules.employee_hours.models.models import EmployeeHours, payType
+from src.modules.payroll_calculator.summary_service import refresh_monthly_summary
+from src.modules.payroll_calculator.shift_rules import (
+    DailyClockSummary,
+    build_employee_hours_rows,
+)
+from sqlalchemy import Date, and_, bindparam, case, func, insert, or_, update
+from sqlalchemy.orm import selectinload
+from sqlmodel import col, delete, select
+from src.modules.shift.models.models import Shift
+from collections.abc import Iterator
+from typing import Sequence
+from os import getenv
+import numpy as np
+
+PAYROLL_SUMMARY_FETCH_SIZE = int(getenv("PAYROLL_SUMMARY_FETCH_SIZE", "5000"))
+PAYROLL_STREAM_FETCH_SIZE = int(getenv("PAYROLL_STREAM_FETCH_SIZE", "500"))
+
+# Conceptos que puede generar el cálculo de horas
+PAYROLL_CONCEPTS = (
+    "Día no hábil.",
+    "Ausente sin entrada registrada",
+    "Presente sin salida registrada",
+    "Jornada laboral completa",
+    "Tiempo faltante",
+    "Horas extra",
+)
 
 
-def get_pending_validation_hours(
-    db: DatabaseSession, request: PayrollPendingValidationRequest
-) -> list[PayrollResponse]:
-    if request.start_date and request.end_date and request.end_date < request.start_date:
+def check_date_range(start_date: date | None, end_date: date | None) -> None:
+    if start_date and end_date and end_date < start_date:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="End date must be greater than start date",
         )
 
-    query = select(EmployeeHours).where(EmployeeHours.payroll_status == "PENDING_VALIDATION")
+
+def build_pending_validation_query(request: PayrollPendingValidationRequest):
+    """
+    Trae cada registro pendiente junto con su empleado y el turno del empleado
+    en una sola consulta. Los empleados sin turno quedan afuera por el JOIN.
+    """
+    query = (
+        select(EmployeeHours, Employee, Shift)
+        .join(Employee, col(EmployeeHours.employee_id) == Employee.id)
+        .join(Shift, col(Employee.shift_id) == Shift.id)
+        .where(EmployeeHours.payroll_status == "PENDING_VALIDATION")
+    )
 
     if request.employee_id:
-        query = query.where(EmployeeHours.employee_id.in_(request.employee_id))
+        query = query.where(col(EmployeeHours.employee_id).in_(request.employee_id))
 
     if request.start_date:
         query = query.where(EmployeeHours.work_date >= request.start_date)
     if request.end_date:
         query = query.where(EmployeeHours.work_date <= request.end_date)
 
-    employee_hours_list = db.exec(query).all()
+    # Paginación por cursor: se continúa desde el último ID devuelto
+    if request.after_id is not None:
+        query = query.where(col(EmployeeHours.id) > request.after_id)
+    query = query.order_by(col(EmployeeHours.id))
+    if request.limit is not None:
+        query = query.limit(request.limit)
+    return query
+
+
+def build_pending_validation_response(
+    eh: EmployeeHours, employee: Employee, shift: Shift, concept: Concept | None
+) -> PayrollPendingValidationResponse:
+    # El empleado se pasa tal cual: `Employee.model_validate` copia también
+    # las relaciones y dispara una consulta por cada una.
+    return PayrollPendingValidationResponse(
+        employee=employee,
+        employee_hours=EmployeeHoursSchema.model_validate(eh),
+        concept=ConceptSchema.model_validate(concept),
+        shift=ShiftSchema.model_validate(shift),
+    )
+
+
+def get_pending_validation_hours(
+    db: DatabaseSession, request: PayrollPendingValidationRequest
+) -> list[PayrollPendingValidationResponse]:
+    check_date_range(request.start_date, request.end_date)
+    return [
+        build_pending_validation_response(
+            eh, employee, shift, concept_cache.get_by_id(db, eh.concept_id)
+        )
+        for eh, employee, shift in db.exec(build_pending_validation_query(request))
+    ]
+
+
+async def get_pending_validation_hours_async(
+    db: AsyncDatabaseSession, request: PayrollPendingValidationRequest
+) -> list[PayrollPendingValidationResponse]:
+    check_date_range(request.start_date, request.end_date)
+    rows = await db.exec(build_pending_validation_query(request))
+    return [
+        build_pending_validation_response(
+            eh,
+            employee,
+            shift,
+            await concept_cache.get_by_id_async(db, eh.concept_id),
+        )
+        for eh, employee, shift in rows.all()
+    ]
 
-    responses = []
-    for eh in employee_hours_list:
-        # Acá asumimos que las relaciones están disponibles vía foreign keys
-        concept = db.get(Concept, eh.concept_id)
-        employee = db.exec(
-            select(Employee).where(Employee.id == eh.employee_id)
-        ).one_or_none()
 
-        if not employee or not employee.shift:
-            continue  # o lanzá error si es crítico
+def stream_pending_validation_hours(
+    request: PayrollPendingValidationRequest,
+) -> Iterator[str]:
+    """
+    Igual que `get_pending_validation_hours` pero emite NDJSON a medida que
+    lee, de a PAYROLL_STREAM_FETCH_SIZE filas, sin armar la lista completa.
+    Usa su propia sesión porque la del request se cierra antes del streaming.
+    """
+    with open_read_session() as db:
+        rows = db.exec(
+            build_pending_validation_query(request).execution_options(
+                yield_per=PAYROLL_STREAM_FETCH_SIZE
+            )
+        )
+        for partition in rows.partitions():
+            for eh, employee, shift in partition:
+                response = build_pending_validation_response(
+                    eh, employee, shift, concept_cache.get_by_id(db, eh.concept_id)
+                )
+                yield response.model_dump_json() + "\n"
+            # Libera las filas ya enviadas del identity map
+            db.expunge_all()
 
-        responses.append(PayrollPendingValidationResponse(
-            employee=Employee.model_validate(employee),
-            employee_hours=EmployeeHoursSchema.model_validate(eh),
-            concept=ConceptSchema.model_validate(concept),
-            shift=ShiftSchema.model_validate(employee.shift),
-        ))
-    return responses
 
 def get_employee_by_id(db: DatabaseSession, employee_id: int) -> Employee:
     employee = db.exec(select(Employee).where(Employee.id == employee_id)).one_or_none()
@@ -70,743 +164,392 @@ def get_employee_by_id(db: DatabaseSession, employee_id: int) -> Employee:
     return employee
 
 
-def filter_and_sort_clock_events(
-    clock_events: list[ClockEvents], start_date: date, end_date: date
-) -> list[ClockEvents]:
-    # 1) Convertimos los límites a datetime (si queremos incluir TODO el rango del día):
-    start_dt = datetime.combine(start_date, time.min)  # 00:00:00
-    end_dt = datetime.combine(end_date, time.max)  # 23:59:59.999999
-
-    # 2) Filtramos y 3) devolvemos la lista ya ordenada:
-    return sorted(
-        (ev for ev in clock_events if start_dt <= ev.event_date <= end_dt),
-        key=lambda ev: ev.event_date,
-    )
-
+async def get_employee_with_shift_async(
+    db: AsyncDatabaseSession, employee_id: int
+) -> Employee:
+    employee = (
+        await db.exec(
+            select(Employee)
+            .where(Employee.id == employee_id)
+            .options(selectinload(Employee.shift))  # type: ignore
+        )
+    ).one_or_none()
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"The employee {employee_id} was not found",
+        )
+    return employee
 
-def get_date_range(start_date: date, end_date: date) -> list[date]:
-    # Determina el orden correcto de las fechas
-    start = min(start_date, end_date)
-    end = max(start_date, end_date)
 
-    # Calcula la cantidad de días entre las fechas
-    delta_days = (end - start).days
+def build_hours_query(employee_id: int, request: PayrollHoursRequest):
+    """
+    Registros del empleado en el rango, ordenados por fecha e ID. El filtro y
+    el orden se resuelven en la base en lugar de cargar todo el historial.
+    """
+    query = select(EmployeeHours).where(
+        EmployeeHours.employee_id == employee_id,
+        EmployeeHours.work_date >= request.start_date,
+        EmployeeHours.work_date <= request.end_date,
+    )
 
-    # Genera la lista de fechas
-    return [start + timedelta(days=i) for i in range(delta_days + 1)]
+    # Paginación por cursor: se continúa desde el último (fecha, ID) devuelto
+    if request.after_date is not None and request.after_id is not None:
+        query = query.where(
+            or_(
+                col(EmployeeHours.work_date) > request.after_date,
+                and_(
+                    EmployeeHours.work_date == request.after_date,
+                    col(EmployeeHours.id) > request.after_id,
+                ),
+            )
+        )
+    query = query.order_by(col(EmployeeHours.work_date), col(EmployeeHours.id))
+    if request.limit is not None:
+        query = query.limit(request.limit)
+    return query
+
+
+def build_hours_response(
+    eh: EmployeeHours, shift: ShiftSchema, concept: Concept | None
+) -> PayrollResponse:
+    return PayrollResponse(
+        employee_hours=EmployeeHoursSchema.model_validate(eh),
+        concept=ConceptSchema.model_validate(concept),
+        shift=shift,
+    )
 
 
 def get_hours_by_date_range(
-    db: DatabaseSession, request: PayrollRequest
+    db: DatabaseSession, request: PayrollHoursRequest
 ) -> list[PayrollResponse]:
-    if request.end_date < request.start_date:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="End date must be greater than start date",
-        )
+    check_date_range(request.start_date, request.end_date)
     employee = get_employee_by_id(db, request.employee_id)
-    filtered_hours = filter_and_sort_hours(
-        employee.employee_hours, request.start_date, request.end_date
-    )
+    shift = ShiftSchema.model_validate(employee.shift)
     return [
-        PayrollResponse(
-            employee_hours=EmployeeHoursSchema.model_validate(eh),
-            concept=ConceptSchema.model_validate(eh.concept),  # type: ignore
-            shift=ShiftSchema.model_validate(employee.shift),
+        build_hours_response(eh, shift, concept_cache.get_by_id(db, eh.concept_id))
+        for eh in db.exec(build_hours_query(employee.id, request))  # type: ignore
+    ]
+
+
+async def get_hours_by_date_range_async(
+    db: AsyncDatabaseSession, request: PayrollHoursRequest
+) -> list[PayrollResponse]:
+    check_date_range(request.start_date, request.end_date)
+    employee = await get_employee_with_shift_async(db, request.employee_id)
+    shift = ShiftSchema.model_validate(employee.shift)
+    rows = await db.exec(build_hours_query(employee.id, request))  # type: ignore
+    return [
+        build_hours_response(
+            eh, shift, await concept_cache.get_by_id_async(db, eh.concept_id)
         )
-        for eh in filtered_hours
+        for eh in rows.all()
     ]
 
 
-def filter_and_sort_hours(
-    employee_hours: list[EmployeeHours], start_date: date, end_date: date
-):
-    # Compara solo fechas, no datetime
-    return sorted(
-        (eh for eh in employee_hours if start_date <= eh.work_date <= end_date),
-        key=lambda eh: eh.work_date,
-    )
+def stream_hours_by_date_range(request: PayrollHoursRequest) -> Iterator[str]:
+    """
+    Igual que `get_hours_by_date_range` pero emite NDJSON a medida que lee,
+    de a PAYROLL_STREAM_FETCH_SIZE filas. Usa su propia sesión porque la del
+    request se cierra antes del streaming.
+    """
+    with open_read_session() as db:
+        employee = get_employee_by_id(db, request.employee_id)
+        shift = ShiftSchema.model_validate(employee.shift)
+        rows = db.exec(
+            build_hours_query(employee.id, request).execution_options(  # type: ignore
+                yield_per=PAYROLL_STREAM_FETCH_SIZE
+            )
+        )
+        for partition in rows.partitions():
+            for eh in partition:
+                response = build_hours_response(
+                    eh, shift, concept_cache.get_by_id(db, eh.concept_id)
+                )
+                yield response.model_dump_json() + "\n"
+            # Libera las filas ya enviadas del identity map
+            db.expunge_all()
+
 
 def calculate_hours(db: DatabaseSession, request: PayrollRequest):
-    if request.end_date < request.start_date:
+    calculate_hours_bulk(
+        db,
+        PayrollBulkRequest(
+            employee_ids=[request.employee_id],
+            start_date=request.start_date,
+            end_date=request.end_date,
+        ),
+    )
+
+
+def get_employees_by_ids(
+    db: DatabaseSession, employee_ids: list[int]
+) -> Sequence[Employee]:
+    employees = db.exec(
+        select(Employee)
+        .where(col(Employee.id).in_(employee_ids))
+        .options(selectinload(Employee.shift))  # type: ignore
+        .order_by(col(Employee.id))
+    ).all()
+    missing = sorted(set(employee_ids) - {employee.id for employee in employees})
+    if missing:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="End date must be greater than start date",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"The employee {', '.join(map(str, missing))} was not found",
         )
-    employee = get_employee_by_id(db, request.employee_id)
-    
-    sorted_events: list[ClockEvents] = []
-
-    date_range = get_date_range(request.start_date, request.end_date)
-    sorted_events = filter_and_sort_clock_events(
-        employee.clock_events,
-        request.start_date,
-        request.end_date,
+    return employees
+
+
+def _add_days(day, days: int, dialect_name: str):
+    # SQLite no tiene aritmética de fechas: `datetime(fecha, '+N days')`
+    # devuelve el texto comparable con el de las columnas DATETIME
+    if dialect_name == "sqlite":
+        return func.datetime(day, f"+{days} days")
+    return day + timedelta(days=days)
+
+
+def get_daily_clock_summary(
+    db: DatabaseSession, employee_ids: list[int], start_date: date, end_date: date
+) -> DailyClockSummary:
+    """
+    Resume en SQL las fichadas del rango por empleado y día (cantidad,
+    entradas, primera entrada y última salida) y agrega la primera salida
+    posterior a la primera entrada de cada día. Las filas se leen por
+    partes y se pasan directo a columnas para el cálculo vectorizado.
+    """
+    in_range = (
+        col(ClockEvents.employee_id).in_(employee_ids),
+        col(ClockEvents.event_date).between(
+            datetime.combine(start_date, time.min),
+            datetime.combine(end_date, time.max),
+        ),
+    )
+    is_in = ClockEvents.event_type == ClockEventTypes.IN
+    work_date = func.date(ClockEvents.event_date, type_=Date).label("work_date")
+
+    daily = (
+        select(
+            ClockEvents.employee_id,
+            work_date,
+            func.count().label("check_count"),
+            func.count(case((is_in, 1))).label("in_count"),
+            func.min(case((is_in, ClockEvents.event_date))).label("first_in"),
+            func.max(case((~is_in, ClockEvents.event_date))).label("last_out"),
+        )
+        .where(*in_range)
+        .group_by(ClockEvents.employee_id, work_date)
+        .cte("daily")
     )
-    
-    events_by_day: dict[date, list[ClockEvents]] = defaultdict(list)
 
-    # 1) Agrupar eventos por día
-    for event in sorted_events:
-        event_day = date(
-            event.event_date.year, event.event_date.month, event.event_date.day
+    # Para la regla del día siguiente solo cuenta una salida anterior al
+    # inicio del día subsiguiente; sin este tope cada primera entrada se
+    # cruzaba con todas las salidas posteriores del rango
+    out_window_end = _add_days(daily.c.work_date, 2, db.get_bind().dialect.name)
+    first_out = (
+        select(
+            daily.c.employee_id,
+            daily.c.work_date,
+            func.min(ClockEvents.event_date).label("first_out_after_in"),
         )
-        events_by_day[event_day].append(event)
-    try:   
-        if employee.shift.type == "matutino":
-            # 2) Para cada día hábil, procesar según tenga o no eventos
-            process_morning_shift_hours(
-                db, employee, date_range, events_by_day
-            )
-        elif employee.shift.type == "vespertino":
-            process_afternoon_shift_hours(
-                db, employee, date_range, events_by_day
-            )
-        else:
-            process_night_shift_hours(
-                db, employee, date_range, events_by_day
-            )
-            pass
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing hours: {str(e)}",
+        .join(
+            ClockEvents,
+            (ClockEvents.employee_id == daily.c.employee_id)
+            & (ClockEvents.event_type == ClockEventTypes.OUT)
+            & (ClockEvents.event_date > daily.c.first_in)
+            & (ClockEvents.event_date < out_window_end),
         )
+        .where(*in_range)
+        .group_by(daily.c.employee_id, daily.c.work_date)
+        .subquery()
+    )
 
-def process_morning_shift_hours(
-    db: DatabaseSession,
-    employee: Employee,
-    date_range: list[date],
-    events_by_day: dict[date, list[ClockEvents]],
-):
-    for day in date_range:
-        # Saltar sábados y domingos
-        existing_employee_hours = db.exec(
-        select(EmployeeHours)
-        .where(
-            EmployeeHours.employee_id == employee.id,
-            EmployeeHours.work_date == day,
-            EmployeeHours.payroll_status != 'archived'
-        )).all()
-
-        if existing_employee_hours:
-            for eh in existing_employee_hours:
-                db.delete(eh)
-                db.commit()
-                
-        if day.weekday() in (5, 6):
-            concept= check_concept(db, "Día no hábil.")
-            create_employee_hours(
-                db=db, 
-                employee=employee, 
-                concept=concept.id, 
-                day=day, 
-                daily_events_count=0, 
-                first_check_in=None, 
-                last_check_out=None, 
-                payroll_status="not payable", 
-                notes="Día no hábil", 
-                sumary_time=None, 
-                extra_hours=None,
-                register_type=RegisterType.DIA_NO_HABIL,
-            )
-            continue
-
-        daily_events = events_by_day.get(day, [])
-        ins = [ev for ev in daily_events if ev.event_type == ClockEventTypes.IN]
-        outs = [ev for ev in daily_events if ev.event_type == ClockEventTypes.OUT]
-
-        # EL EMPLEADO NO REGISTRÓ UNA ENTRADA EN TODO EL DÍA
-        if not ins:
-            concept = check_concept(db, "Ausente sin entrada registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=0,
-                first_check_in=None,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado no registró entrada en el día.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.AUSENCIA,
-            )    
-            continue
-
-        first_check = min(ins, key=lambda ev: ev.event_date).event_date.time()
-
-        # EL EMPLEADO NO REGISTRÓ SU SALIDA
-        if len(ins) > len(outs):
-            concept = check_concept(db, "Presente sin salida registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado registró entrada pero no salida.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-            continue
+    query = select(
+        daily.c.employee_id,
+        daily.c.work_date,
+        daily.c.check_count,
+        daily.c.in_count,
+        daily.c.first_in,
+        daily.c.last_out,
+        first_out.c.first_out_after_in,
+    ).outerjoin(
+        first_out,
+        (first_out.c.employee_id == daily.c.employee_id)
+        & (first_out.c.work_date == daily.c.work_date),
+    )
 
-        last_check = max(outs, key=lambda ev: ev.event_date).event_date.time()
-
-        check_in_dt = datetime.combine(day, first_check)
-        check_out_dt = datetime.combine(day, last_check)
-
-        # Cálculo de tiempo trabajado
-        worked_duration = check_out_dt - check_in_dt
-        total_seconds = int(worked_duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) % 3600 // 60
-        seconds = total_seconds % 60
-
-        #  Duración de la jornada como time
-        summary_time = time(hour=hours % 24, minute=minutes, second=seconds) if hours < 24 else None
-
-        #  Cálculo en formato decimal para validar rango
-        worked_hours_float = hours + (minutes / 60)
-
-        #  Lógica de validación según rango 7:30 - 8:30
-        lower_bound = 7.5  # 7h30m
-        upper_bound = 8.5  # 8h30m
-
-        if lower_bound <= worked_hours_float <= upper_bound:
-            # JORNADA COMPLETA
-            concept= check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
+    columns: list[list] = [[] for _ in range(7)]
+    for partition in (
+        db.execute(query)
+        .yield_per(PAYROLL_SUMMARY_FETCH_SIZE)
+        .partitions()
+    ):
+        for values, column in zip(zip(*partition), columns):
+            column.extend(values)
+
+    return DailyClockSummary(
+        employee_ids=np.array(columns[0], dtype=np.int64),
+        work_dates=np.array(columns[1], dtype="datetime64[D]"),
+        check_count=np.array(columns[2], dtype=np.int64),
+        in_count=np.array(columns[3], dtype=np.int64),
+        first_in=np.array(columns[4], dtype="datetime64[us]"),
+        last_out=np.array(columns[5], dtype="datetime64[us]"),
+        first_out_after_in=np.array(columns[6], dtype="datetime64[us]"),
+    )
 
-        elif worked_hours_float < lower_bound:
-            # HORAS FALTANTES
-            faltante_hours = int(8.0 - worked_hours_float)
-            faltante_minutes = int((8.0 - worked_hours_float - faltante_hours) * 60)
-
-            concept = check_concept(db, "Tiempo faltante")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="not payable",
-                notes=f"Le faltaron {faltante_hours}h {faltante_minutes}m para completar la jornada",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
 
-        else:
-            # HORAS EXTRA
-            extra_hours = int(worked_hours_float - 8.0)
-            extra_minutes = int((worked_hours_float - 8.0 - extra_hours) * 60)
-            extra_time = time(hour=extra_hours, minute=extra_minutes, second=0)
-
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes=f"El empleado completó su jornada laboral.",
-                sumary_time=time(hour=8),
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
+def get_payroll_concepts(db: DatabaseSession) -> dict[str, int]:
+    """
+    Devuelve el ID de cada concepto usado por el cálculo, resuelto desde la
+    caché de conceptos.
+    """
+    return {
+        description: check_concept(db, description).id
+        for description in PAYROLL_CONCEPTS
+    }
+
+
+# Columnas que genera el cálculo; si ninguna cambia el registro no se toca
+CALCULATED_COLUMNS = (
+    "concept_id",
+    "shift_id",
+    "check_count",
+    "register_type",
+    "first_check_in",
+    "last_check_out",
+    "sumary_time",
+    "extra_hours",
+    "payroll_status",
+    "notes",
+)
 
-            concept = check_concept(db, "Horas extra")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="pending validation",
-                notes=f"El empleado realizó {extra_hours}h {extra_minutes}m extra",
-                sumary_time=None,
-                extra_hours=extra_time,
-                register_type=RegisterType.PRESENCIA,
-            )
 
-def process_afternoon_shift_hours(
+def diff_employee_hours(
     db: DatabaseSession,
-    employee: Employee,
-    date_range: list[date],
-    events_by_day: dict[date, list[ClockEvents]],
-):
-    for day in date_range:
-        # Saltar sábados y domingos
-        existing_employee_hours = db.exec(
-        select(EmployeeHours)
+    employee_ids: list[int],
+    start_date: date,
+    end_date: date,
+    rows: list[dict],
+) -> tuple[list[dict], list[dict], list[int], int]:
+    """
+    Compara los registros calculados con los no archivados que ya existen.
+    Cada día se empareja en orden: el registro existente con menor ID con el
+    primer registro calculado del día, y así. Devuelve los registros a
+    insertar, los cambios a aplicar (con `row_id`), los IDs a borrar y la
+    cantidad de registros sin cambios.
+    """
+    table = EmployeeHours.__table__  # type: ignore
+    columns = [
+        table.c[name] for name in ("id", "employee_id", "work_date", *CALCULATED_COLUMNS)
+    ]
+    existing: dict[tuple, list] = {}
+    for row in db.execute(
+        select(*columns)
         .where(
-            EmployeeHours.employee_id == employee.id,
-            EmployeeHours.work_date == day,
-            EmployeeHours.payroll_status != 'archived'
-        )).all()
-
-        if existing_employee_hours:
-            for eh in existing_employee_hours:
-                db.delete(eh)
-                db.commit()
-
-        if day.weekday() in (5, 6):
-            concept = check_concept(db, "Día no hábil.")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=0,
-                first_check_in=None,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="Día no hábil",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.DIA_NO_HABIL,
-            )
-            continue
-
-        daily_events = events_by_day.get(day, [])
-        next_day_events = events_by_day.get(day + timedelta(days=1), [])
-
-        ins = [ev for ev in daily_events if ev.event_type == ClockEventTypes.IN]
-        outs_today = [ev for ev in daily_events if ev.event_type == ClockEventTypes.OUT]
-        outs_tomorrow = [ev for ev in next_day_events if ev.event_type == ClockEventTypes.OUT]
-        outs = outs_today + outs_tomorrow
-
-        if not ins:
-            # No entrada
-            concept = check_concept(db, "Ausente sin entrada registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=0,
-                first_check_in=None,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado no registró entrada en el día.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.AUSENCIA,
-            )
-            continue
-
-        first_check = min(ins, key=lambda ev: ev.event_date).event_date.time()
-
-        if not outs:
-            # No salida
-            concept = check_concept(db, "Presente sin salida registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado registró entrada pero no salida.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-            continue
-
-        outs_sorted = sorted(outs, key=lambda ev: ev.event_date)
-        first_check_in_dt = datetime.combine(day, first_check)
-        last_check_datetime = next(
-            (ev.event_date for ev in outs_sorted if ev.event_date > first_check_in_dt),
-            None
+            table.c.employee_id.in_(employee_ids),
+            table.c.work_date.between(start_date, end_date),
+            table.c.payroll_status != payType.ARCHIVED,
         )
-
-        if not last_check_datetime:
-            # No salida válida después del IN
-            concept = check_concept(db, "Presente sin salida registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado registró entrada pero no salida.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
+        .order_by(table.c.id)
+    ):
+        existing.setdefault((row.employee_id, row.work_date), []).append(row)
+
+    to_insert: list[dict] = []
+    to_update: list[dict] = []
+    unchanged = 0
+    position: dict[tuple, int] = {}
+    for row in rows:
+        day = (row["employee_id"], row["work_date"])
+        index = position.get(day, 0)
+        position[day] = index + 1
+        current_rows = existing.get(day, [])
+        if index >= len(current_rows):
+            to_insert.append(row)
             continue
-
-        last_check = last_check_datetime.time()
-
-        check_in_dt = first_check_in_dt
-        check_out_day = day if last_check_datetime.date() == day else day + timedelta(days=1)
-        check_out_dt = datetime.combine(check_out_day, last_check)
-
-        print(f"DEBUG -- Day: {day}, Check-in: {check_in_dt}, Check-out: {check_out_dt}")
-
-        if check_out_dt <= check_in_dt:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Salida inválida: la salida ({check_out_dt}) es anterior o igual a la entrada ({check_in_dt})",
-            )
-
-        worked_duration = check_out_dt - check_in_dt
-        total_seconds = int(worked_duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) % 60
-        seconds = total_seconds % 60
-
-        if hours >= 24:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"El empleado tiene {int(hours)}h trabajadas, excediendo el máximo permitido de 23h59m.",
-            )
-
-        summary_time = None
-        if hours < 24:
-            summary_time = time(hour=hours, minute=minutes, second=seconds)
-
-        worked_hours_float = hours + (minutes / 60)
-
-        lower_bound = 7.5  # 7h30m
-        upper_bound = 8.5  # 8h30m
-
-        if lower_bound <= worked_hours_float <= upper_bound:
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-        elif worked_hours_float < lower_bound:
-            faltante_hours = int(8.0 - worked_hours_float)
-            faltante_minutes = int((8.0 - worked_hours_float - faltante_hours) * 60)
-            concept = check_concept(db, "Tiempo faltante")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="not payable",
-                notes=f"Le faltaron {faltante_hours}h {faltante_minutes}m para completar la jornada",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
+        current = current_rows[index]
+        if all(getattr(current, name) == row[name] for name in CALCULATED_COLUMNS):
+            unchanged += 1
         else:
-            # Horas extra
-            extra_seconds = total_seconds - (8 * 3600)
-            extra_hours = extra_seconds // 3600
-            extra_minutes = (extra_seconds % 3600) // 60
-
-            if extra_hours >= 24:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"El empleado tiene {int(extra_hours)}h trabajadas, excediendo el máximo permitido de 23h59m.",
-                )
+            changes = {name: row[name] for name in CALCULATED_COLUMNS}
+            to_update.append({"row_id": current.id, **changes})
 
-            extra_time = time(hour=int(extra_hours), minute=int(extra_minutes), second=0)
-
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=time(hour=8),
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
+    to_delete = [
+        current.id
+        for day, current_rows in existing.items()
+        for current in current_rows[position.get(day, 0) :]
+    ]
+    return to_insert, to_update, to_delete, unchanged
+
+
+def calculate_hours_bulk(
+    db: DatabaseSession, request: PayrollBulkRequest
+) -> PayrollBulkResponse:
+    """
+    Calcula las horas de varios empleados para todo el rango en memoria y las
+    compara con los registros no archivados existentes: solo se actualizan
+    los que cambiaron, se insertan los nuevos y se borran los que sobran, en
+    una única transacción junto con el resumen mensual. Recalcular sin
+    cambios no escribe nada. Si algún empleado falla no se guarda nada.
+    """
+    if request.end_date < request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be greater than start date",
+        )
+    employee_ids = list(dict.fromkeys(request.employee_ids))
+    employees = get_employees_by_ids(db, employee_ids)
+    events = get_daily_clock_summary(
+        db, employee_ids, request.start_date, request.end_date
+    )
 
-            concept = check_concept(db, "Horas extra")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="pending validation",
-                notes=f"El empleado realizó {int(extra_hours)}h {int(extra_minutes)}m extra",
-                sumary_time=None,
-                extra_hours=extra_time,
-                register_type=RegisterType.PRESENCIA,
-            )
+    try:
+        concepts = get_payroll_concepts(db)
+        rows = build_employee_hours_rows(
+            employees, request.start_date, request.end_date, events, concepts
+        )
+        to_insert, to_update, to_delete, unchanged = diff_employee_hours(
+            db, employee_ids, request.start_date, request.end_date, rows
+        )
 
-def process_night_shift_hours(
-    db: DatabaseSession,
-    employee: Employee,
-    date_range: list[date],
-    events_by_day: dict[date, list[ClockEvents]],
-):
-    for day in date_range:
-        # Saltar sábados y domingos (día de ingreso)
-        existing_employee_hours = db.exec(
-        select(EmployeeHours)
-        .where(
-            EmployeeHours.employee_id == employee.id,
-            EmployeeHours.work_date == day,
-            EmployeeHours.payroll_status != 'archived'
-        )).all()
-
-        if existing_employee_hours:
-            for eh in existing_employee_hours:
-                db.delete(eh)
-                db.commit()
-
-        if day.weekday() in (5, 6):
-            concept = check_concept(db, "Día no hábil.")
-            create_employee_hours(
-                db=db, 
-                employee=employee, 
-                concept=concept.id, 
-                day=day, 
-                daily_events_count=0, 
-                first_check_in=None, 
-                last_check_out=None, 
-                payroll_status="not payable", 
-                notes="Día no hábil", 
-                sumary_time=None, 
-                extra_hours=None,
-                register_type=RegisterType.DIA_NO_HABIL,
+        table = EmployeeHours.__table__  # type: ignore
+        if to_delete:
+            db.execute(delete(table).where(table.c.id.in_(to_delete)))
+        if to_update:
+            db.execute(
+                update(table).where(table.c.id == bindparam("row_id")), to_update
             )
-            continue
-        
-        # Fichadas del día de ingreso
-        daily_events = events_by_day.get(day, [])
-        # Fichadas del día siguiente
-        next_day_events = events_by_day.get(day + timedelta(days=1), [])
-        
-        # Juntar eventos de entrada (día actual) y salida (día siguiente)
-        ins = [ev for ev in daily_events if ev.event_type == ClockEventTypes.IN]
-        outs = [ev for ev in next_day_events if ev.event_type == ClockEventTypes.OUT]
-
-        if not ins:
-            # No entrada
-            concept = check_concept(db, "Ausente sin entrada registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=0,
-                first_check_in=None,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado no registró entrada en el día.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.AUSENCIA,
-            )    
-            continue
-        
-        first_check = min(ins, key=lambda ev: ev.event_date).event_date.time()
-
-        if not outs:
-            # No salida
-            concept = check_concept(db, "Presente sin salida registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado registró entrada pero no salida.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-            continue
-        
-        last_check = max(outs, key=lambda ev: ev.event_date).event_date.time()
-        
-        # Construir datetime combinando día y hora
-        check_in_dt = datetime.combine(day, first_check)
-        check_out_dt = datetime.combine(day + timedelta(days=1), last_check)
-
-        worked_duration = check_out_dt - check_in_dt
-        total_seconds = int(worked_duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) % 3600 // 60
-        seconds = total_seconds % 60
-
-        summary_time = time(hour=hours % 24, minute=minutes, second=seconds) if hours < 24 else None
-        worked_hours_float = hours + (minutes / 60)
-
-        lower_bound = 7.5  # 7h30m
-        upper_bound = 8.5  # 8h30m
-
-        if lower_bound <= worked_hours_float <= upper_bound:
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-        elif worked_hours_float < lower_bound:
-            faltante_hours = int(8.0 - worked_hours_float)
-            faltante_minutes = int((8.0 - worked_hours_float - faltante_hours) * 60)
-            concept = check_concept(db, "Tiempo faltante")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="not payable",
-                notes=f"Le faltaron {faltante_hours}h {faltante_minutes}m para completar la jornada",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-        else:
-            extra_hours = int(worked_hours_float - 8.0)
-            extra_minutes = int((worked_hours_float - 8.0 - extra_hours) * 60)
-            extra_time = time(hour=extra_hours, minute=extra_minutes, second=0)
-
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=time(hour=8),
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
+        if to_insert:
+            db.execute(insert(table), to_insert)
+        if to_delete or to_update or to_insert:
+            refresh_monthly_summary(
+                db, employee_ids, request.start_date, request.end_date
             )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing hours: {str(e)}",
+        )
 
-            concept = check_concept(db, "Horas extra")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="pending validation",
-                notes=f"El empleado realizó {extra_hours}h {extra_minutes}m extra",
-                sumary_time=None,
-                extra_hours=extra_time,
-                register_type=RegisterType.PRESENCIA,
-            )
+    return PayrollBulkResponse(
+        employees=len(employees),
+        unchanged=unchanged,
+        updated=len(to_update),
+        inserted=len(to_insert),
+        deleted=len(to_delete),
+    )
 
 def check_concept(db: DatabaseSession, concept_description: str) -> Concept:
     # Buscar si existe
-    concept = db.exec(
-        select(Concept).where(Concept.description == concept_description)
-    ).one_or_none()
-    
+    concept = concept_cache.get_by_description(db, concept_description)
+
     # Si no existe, crear
     if not concept:
         new_concept = Concept(description=concept_description)
         db.add(new_concept)
         db.commit()
         db.refresh(new_concept)  # Refresca para tener el ID generado
+        concept_cache.invalidate()
         return new_concept
 
     return concept
-
-def create_employee_hours(
-    db: DatabaseSession,
-    employee: Employee,
-    concept: int,
-    day: date,
-    daily_events_count: int,
-    first_check_in: time | None,
-    last_check_out: time | None,
-    payroll_status: str,
-    notes: str,
-    sumary_time: time | None,
-    extra_hours: time | None,
-    register_type: RegisterType,
-):
-        
-    # Crear nuevo
-    employee_hours = EmployeeHours(
-        employee_id=employee.id,
-        concept_id=concept,
-        shift_id=employee.shift.id,
-        check_count=daily_events_count,
-        work_date=day,
-        register_type=register_type,
-        first_check_in=first_check_in,
-        last_check_out=last_check_out,
-        sumary_time=sumary_time,
-        extra_hours=extra_hours,
-        payroll_status=payType(payroll_status),  # acá le pasas 'archived', 'payable', etc
-        notes=notes,
-    )
-
-    db.add(employee_hours)
-    db.commit()
-    db.refresh(employee_hours)
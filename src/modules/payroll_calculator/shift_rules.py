@@ -0,0 +1,346 @@
+from dataclasses import dataclass
+from datetime import date, time, timedelta
+from enum import Enum
+from fastapi import HTTPException, status
+from typing import Sequence
+from src.modules.employees.models.employee import Employee
+from src.modules.employee_hours.models.models import RegisterType, payType
+import numpy as np
+
+# Margen alrededor de `Shift.working_hours` dentro del cual la jornada se
+# considera completa (antes fijo en 7:30 - 8:30 para jornadas de 8 horas).
+SHIFT_TOLERANCE_MINUTES = 30
+
+MICROSECONDS_PER_DAY = 86_400_000_000
+NO_EVENT_MIN = np.iinfo(np.int64).min
+NO_EVENT_MAX = np.iinfo(np.int64).max
+
+
+class CheckOut(int, Enum):
+    """
+    Qué fichada de salida cierra la jornada iniciada en la primera entrada.
+    """
+
+    LAST_SAME_DAY = 0
+    LAST_NEXT_DAY = 1
+    FIRST_AFTER_CHECK_IN = 2
+
+
+@dataclass(frozen=True)
+class ShiftRule:
+    check_out: CheckOut
+    # Las fichadas del día siguiente cuentan para la jornada
+    counts_next_day: bool
+    # Cada entrada del día necesita su salida (más entradas que salidas = sin salida)
+    requires_out_per_in: bool
+
+
+SHIFT_RULES = {
+    "matutino": ShiftRule(
+        check_out=CheckOut.LAST_SAME_DAY,
+        counts_next_day=False,
+        requires_out_per_in=True,
+    ),
+    "vespertino": ShiftRule(
+        check_out=CheckOut.FIRST_AFTER_CHECK_IN,
+        counts_next_day=True,
+        requires_out_per_in=False,
+    ),
+}
+DEFAULT_SHIFT_RULE = ShiftRule(
+    check_out=CheckOut.LAST_NEXT_DAY,
+    counts_next_day=True,
+    requires_out_per_in=False,
+)
+
+
+class DayKind(int, Enum):
+    NO_HABIL = 0
+    AUSENTE = 1
+    SIN_SALIDA = 2
+    TIEMPO_FALTANTE = 3
+    JORNADA_COMPLETA = 4
+    HORAS_EXTRA = 5
+
+
+@dataclass
+class DailyClockSummary:
+    """
+    Fichadas resumidas por empleado y día, como columnas. Los instantes son
+    datetime64[us] y valen NaT cuando no hay fichada.
+    """
+
+    employee_ids: np.ndarray
+    work_dates: np.ndarray
+    check_count: np.ndarray
+    in_count: np.ndarray
+    first_in: np.ndarray
+    last_out: np.ndarray
+    first_out_after_in: np.ndarray
+
+
+def _time_of_day(microseconds: int) -> time:
+    seconds, micro = divmod(microseconds, 1_000_000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour=hour, minute=minute, second=second, microsecond=micro)
+
+
+def _duration(minutes: int) -> tuple[int, int]:
+    return divmod(minutes, 60)
+
+
+def classify_days(
+    employees: Sequence[Employee],
+    start_date: date,
+    end_date: date,
+    events: DailyClockSummary,
+) -> dict[str, np.ndarray]:
+    """
+    Clasifica todos los días de todos los empleados en una sola pasada sobre
+    matrices (empleados × días). Devuelve las matrices que necesita
+    `build_employee_hours_rows`.
+    """
+    n_employees = len(employees)
+    n_days = (end_date - start_date).days + 1
+    # Una columna extra para leer el "día siguiente" del último día
+    width = n_days + 1
+    size = n_employees * width
+
+    employee_index = {employee.id: i for i, employee in enumerate(employees)}
+    rules = [SHIFT_RULES.get(e.shift.type, DEFAULT_SHIFT_RULE) for e in employees]
+    check_out_rule = np.array([rule.check_out for rule in rules], dtype=np.int64)
+    counts_next_day = np.array([rule.counts_next_day for rule in rules])
+    requires_out_per_in = np.array([rule.requires_out_per_in for rule in rules])
+    nominal_minutes = np.array(
+        [round(e.shift.working_hours * 60) for e in employees], dtype=np.int64
+    )
+    working_days = np.array([e.shift.working_days for e in employees])
+
+    first_day = np.datetime64(start_date, "D")
+    day_start = (
+        first_day + np.arange(n_days)
+    ).astype("datetime64[us]").astype(np.int64)
+    # El 01/01/1970 fue jueves (weekday 3)
+    weekday = (first_day.astype(np.int64) + np.arange(n_days) + 3) % 7
+
+    day_index = (events.work_dates - first_day).astype(np.int64)
+    row = np.array(
+        [employee_index[id] for id in events.employee_ids.tolist()], dtype=np.int64
+    )
+    cell = row * width + day_index
+
+    def to_cells(values: np.ndarray, missing: int) -> np.ndarray:
+        cells = np.full(size, missing, dtype=np.int64)
+        cells[cell] = values
+        return cells
+
+    def instants(values: np.ndarray, missing: int) -> np.ndarray:
+        return to_cells(
+            np.where(np.isnat(values), missing, values.astype(np.int64)), missing
+        )
+
+    n_events = to_cells(events.check_count, 0)
+    n_in = to_cells(events.in_count, 0)
+    n_out = n_events - n_in
+    first_in = instants(events.first_in, NO_EVENT_MAX)
+    last_out = instants(events.last_out, NO_EVENT_MIN)
+    # Solo vale si es del mismo día de la entrada o del siguiente
+    first_out_after_in = instants(events.first_out_after_in, NO_EVENT_MAX)
+    cell_day_start = np.tile(
+        day_start[0] + np.arange(width) * MICROSECONDS_PER_DAY, n_employees
+    )
+    first_out_after_in[
+        first_out_after_in >= cell_day_start + 2 * MICROSECONDS_PER_DAY
+    ] = NO_EVENT_MAX
+
+    def today(values: np.ndarray) -> np.ndarray:
+        return values.reshape(n_employees, width)[:, :n_days]
+
+    def next_day(values: np.ndarray) -> np.ndarray:
+        return values.reshape(n_employees, width)[:, 1:]
+
+    candidates = np.stack(
+        [today(last_out), next_day(last_out), today(first_out_after_in)]
+    )
+    check_out = np.take_along_axis(
+        candidates, check_out_rule[None, :, None].repeat(n_days, axis=2), axis=0
+    )[0]
+    check_in = today(first_in)
+    has_in = today(n_in) > 0
+    has_out = (
+        (check_out != NO_EVENT_MIN)
+        & (check_out != NO_EVENT_MAX)
+        & (check_out > check_in)
+        & ~(requires_out_per_in[:, None] & (today(n_in) > today(n_out)))
+    )
+
+    worked_seconds = np.where(
+        has_in & has_out, (check_out - check_in) // 1_000_000, 0
+    )
+    worked_minutes = worked_seconds // 60
+    lower = (nominal_minutes - SHIFT_TOLERANCE_MINUTES)[:, None]
+    upper = (nominal_minutes + SHIFT_TOLERANCE_MINUTES)[:, None]
+    non_working = weekday[None, :] >= working_days[:, None]
+
+    kind = np.select(
+        [
+            non_working,
+            ~has_in,
+            ~has_out,
+            worked_minutes < lower,
+            worked_minutes <= upper,
+        ],
+        [
+            DayKind.NO_HABIL,
+            DayKind.AUSENTE,
+            DayKind.SIN_SALIDA,
+            DayKind.TIEMPO_FALTANTE,
+            DayKind.JORNADA_COMPLETA,
+        ],
+        DayKind.HORAS_EXTRA,
+    )
+
+    too_long = (kind >= DayKind.TIEMPO_FALTANTE) & (worked_seconds >= 86_400)
+    if too_long.any():
+        hours = int(worked_seconds[too_long][0] // 3600)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El empleado tiene {hours}h trabajadas, excediendo el máximo permitido de 23h59m.",
+        )
+
+    return {
+        "kind": kind,
+        "check_count": today(n_events)
+        + np.where(counts_next_day[:, None], next_day(n_events), 0),
+        "check_in": check_in - day_start[None, :],
+        "check_out": (check_out - day_start[None, :]) % MICROSECONDS_PER_DAY,
+        "worked_seconds": worked_seconds,
+        "nominal_minutes": nominal_minutes,
+    }
+
+
+def build_employee_hours_rows(
+    employees: Sequence[Employee],
+    start_date: date,
+    end_date: date,
+    events: DailyClockSummary,
+    concepts: dict[str, int],
+) -> list[dict]:
+    """
+    Arma los registros de `EmployeeHours` de cada empleado y día a partir de
+    la clasificación vectorizada, listos para una inserción masiva.
+    """
+    days = classify_days(employees, start_date, end_date, events)
+    dates = [
+        start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)
+    ]
+    kinds = days["kind"].tolist()
+    check_counts = days["check_count"].tolist()
+    check_ins = days["check_in"].tolist()
+    check_outs = days["check_out"].tolist()
+    worked = days["worked_seconds"].tolist()
+    nominal = days["nominal_minutes"].tolist()
+
+    rows: list[dict] = []
+    for i, employee in enumerate(employees):
+        nominal_time = _time_of_day(nominal[i] * 60_000_000)
+        for j, day in enumerate(dates):
+            row = {
+                "employee_id": employee.id,
+                "shift_id": employee.shift.id,
+                "work_date": day,
+                "check_count": check_counts[i][j],
+                "first_check_in": None,
+                "last_check_out": None,
+                "sumary_time": None,
+                "extra_hours": None,
+            }
+            kind = kinds[i][j]
+
+            if kind == DayKind.NO_HABIL:
+                rows.append(
+                    {
+                        **row,
+                        "check_count": 0,
+                        "concept_id": concepts["Día no hábil."],
+                        "register_type": RegisterType.DIA_NO_HABIL,
+                        "payroll_status": payType.NOT_PAYABLE,
+                        "notes": "Día no hábil",
+                    }
+                )
+                continue
+
+            if kind == DayKind.AUSENTE:
+                rows.append(
+                    {
+                        **row,
+                        "check_count": 0,
+                        "concept_id": concepts["Ausente sin entrada registrada"],
+                        "register_type": RegisterType.AUSENCIA,
+                        "payroll_status": payType.NOT_PAYABLE,
+                        "notes": "El empleado no registró entrada en el día.",
+                    }
+                )
+                continue
+
+            row["register_type"] = RegisterType.PRESENCIA
+            row["first_check_in"] = _time_of_day(check_ins[i][j])
+
+            if kind == DayKind.SIN_SALIDA:
+                rows.append(
+                    {
+                        **row,
+                        "concept_id": concepts["Presente sin salida registrada"],
+                        "payroll_status": payType.NOT_PAYABLE,
+                        "notes": "El empleado registró entrada pero no salida.",
+                    }
+                )
+                continue
+
+            row["last_check_out"] = _time_of_day(check_outs[i][j])
+            worked_minutes = worked[i][j] // 60
+            summary_time = _time_of_day(worked[i][j] * 1_000_000)
+
+            if kind == DayKind.JORNADA_COMPLETA:
+                rows.append(
+                    {
+                        **row,
+                        "concept_id": concepts["Jornada laboral completa"],
+                        "payroll_status": payType.PAYABLE,
+                        "notes": "El empleado completó su jornada laboral.",
+                        "sumary_time": summary_time,
+                    }
+                )
+            elif kind == DayKind.TIEMPO_FALTANTE:
+                missing_hours, missing_minutes = _duration(nominal[i] - worked_minutes)
+                rows.append(
+                    {
+                        **row,
+                        "concept_id": concepts["Tiempo faltante"],
+                        "payroll_status": payType.NOT_PAYABLE,
+                        "notes": f"Le faltaron {missing_hours}h {missing_minutes}m para completar la jornada",
+                        "sumary_time": summary_time,
+                    }
+                )
+            else:
+                extra_hours, extra_minutes = _duration(worked_minutes - nominal[i])
+                rows.append(
+                    {
+                        **row,
+                        "concept_id": concepts["Jornada laboral completa"],
+                        "payroll_status": payType.PAYABLE,
+                        "notes": "El empleado completó su jornada laboral.",
+                        "sumary_time": nominal_time,
+                    }
+                )
+                rows.append(
+                    {
+                        **row,
+                        "concept_id": concepts["Horas extra"],
+                        "payroll_status": payType.PENDING_VALIDATION,
+                        "notes": f"El empleado realizó {extra_hours}h {extra_minutes}m extra",
+                        "extra_hours": time(hour=extra_hours, minute=extra_minutes),
+                    }
+                )
+    return rows
@@ -0,0 +1,33 @@
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+from datetime import date, datetime
+
+
+class PayrollMonthlySummary(SQLModel, table=True):
+    """
+    Totales de `EmployeeHours` por empleado, mes y concepto. Se mantiene al
+    día cada vez que se escriben o borran horas, para que los reportes no
+    tengan que recorrer la tabla de horas.
+    """
+
+    __tablename__ = "payroll_monthly_summary"  # type: ignore
+    __table_args__ = (
+        UniqueConstraint(
+            "employee_id",
+            "month",
+            "concept_id",
+            name="uq_payroll_monthly_summary_employee_month_concept",
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    employee_id: int = Field(foreign_key="employee.id", ondelete="CASCADE")
+    # Primer día del mes
+    month: date = Field(index=True)
+    concept_id: int | None = Field(default=None, foreign_key="concept.id")
+    record_count: int = Field(default=0)
+    total_time_seconds: int = Field(default=0)
+    extra_hours_seconds: int = Field(default=0)
+    payable_days: int = Field(default=0)
+    absent_days: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.now)
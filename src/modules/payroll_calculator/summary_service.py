@@ -0,0 +1,203 @@
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import insert
+from sqlmodel import Session, col, delete, func, select
+from src.database.core import AsyncDatabaseSession, DatabaseSession
+from src.modules.concept.models.models import Concept
+from src.modules.concept.services.cache import concept_cache
+from src.modules.employee_hours.models.models import (
+    EmployeeHours,
+    RegisterType,
+    payType,
+)
+from src.modules.payroll_calculator.schemas import (
+    ConceptSchema,
+    PayrollSummaryRebuildResponse,
+    PayrollSummaryRequest,
+    PayrollSummaryResponse,
+)
+from src.modules.payroll_calculator.summary_models import PayrollMonthlySummary
+from typing import Sequence
+from os import getenv
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+PAYROLL_SUMMARY_REBUILD_CHUNK_SIZE = int(
+    getenv("PAYROLL_SUMMARY_REBUILD_CHUNK_SIZE", "500")
+)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def month_end(day: date) -> date:
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def _seconds(value: time | None) -> int:
+    if value is None:
+        return 0
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def refresh_monthly_summary(
+    db: Session, employee_ids: Sequence[int], start_date: date, end_date: date
+) -> int:
+    """
+    Recalcula el resumen de los empleados en los meses que tocan el rango a
+    partir de las horas que hay en la base. No confirma la transacción: se
+    llama dentro de la misma que escribió las horas, así el resumen nunca
+    queda desfasado. Devuelve la cantidad de filas de resumen escritas.
+
+    Los totales se suman en Python porque sumar columnas TIME no es portable
+    entre PostgreSQL y SQLite; solo se leen los meses afectados.
+    """
+    if not employee_ids:
+        return 0
+    first_month = month_start(start_date)
+    last_day = month_end(end_date)
+
+    db.execute(
+        delete(PayrollMonthlySummary).where(
+            col(PayrollMonthlySummary.employee_id).in_(employee_ids),
+            col(PayrollMonthlySummary.month).between(first_month, last_day),
+        )
+    )
+
+    hours = db.execute(
+        select(
+            EmployeeHours.employee_id,
+            EmployeeHours.work_date,
+            EmployeeHours.concept_id,
+            EmployeeHours.sumary_time,
+            EmployeeHours.extra_hours,
+            EmployeeHours.payroll_status,
+            EmployeeHours.register_type,
+        ).where(
+            col(EmployeeHours.employee_id).in_(employee_ids),
+            col(EmployeeHours.work_date).between(first_month, last_day),
+        )
+    )
+
+    now = datetime.now()
+    totals: dict[tuple, dict] = {}
+    for row in hours:
+        key = (row.employee_id, month_start(row.work_date), row.concept_id)
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = {
+                "employee_id": row.employee_id,
+                "month": key[1],
+                "concept_id": row.concept_id,
+                "record_count": 0,
+                "total_time_seconds": 0,
+                "extra_hours_seconds": 0,
+                "payable_days": 0,
+                "absent_days": 0,
+                "updated_at": now,
+            }
+        total["record_count"] += 1
+        total["total_time_seconds"] += _seconds(row.sumary_time)
+        total["extra_hours_seconds"] += _seconds(row.extra_hours)
+        if row.payroll_status == payType.PAYABLE:
+            total["payable_days"] += 1
+        if row.register_type == RegisterType.AUSENCIA:
+            total["absent_days"] += 1
+
+    if totals:
+        db.execute(insert(PayrollMonthlySummary.__table__), list(totals.values()))  # type: ignore
+    return len(totals)
+
+
+def rebuild_monthly_summary(db: DatabaseSession) -> PayrollSummaryRebuildResponse:
+    """
+    Reconstruye el resumen completo desde las horas, de a lotes de empleados,
+    en una sola transacción. Sirve para cargarlo por primera vez o para
+    corregirlo si las horas se modificaron por fuera de la API.
+    """
+    employees = db.execute(
+        select(
+            EmployeeHours.employee_id,
+            func.min(EmployeeHours.work_date),
+            func.max(EmployeeHours.work_date),
+        )
+        .where(col(EmployeeHours.employee_id).is_not(None))
+        .group_by(EmployeeHours.employee_id)
+        .order_by(EmployeeHours.employee_id)
+    ).all()
+
+    try:
+        db.execute(delete(PayrollMonthlySummary))
+        written = 0
+        for i in range(0, len(employees), PAYROLL_SUMMARY_REBUILD_CHUNK_SIZE):
+            chunk = employees[i : i + PAYROLL_SUMMARY_REBUILD_CHUNK_SIZE]
+            written += refresh_monthly_summary(
+                db,
+                [employee_id for employee_id, _, _ in chunk],
+                min(start for _, start, _ in chunk),
+                max(end for _, _, end in chunk),
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info(
+        f"Rebuilt payroll monthly summary: {written} rows for {len(employees)} employees"
+    )
+    return PayrollSummaryRebuildResponse(employees=len(employees), rows=written)
+
+
+def build_monthly_summary_query(request: PayrollSummaryRequest):
+    query = select(PayrollMonthlySummary)
+    if request.employee_id:
+        query = query.where(
+            col(PayrollMonthlySummary.employee_id).in_(request.employee_id)
+        )
+    if request.start_month:
+        query = query.where(
+            PayrollMonthlySummary.month >= month_start(request.start_month)
+        )
+    if request.end_month:
+        query = query.where(
+            PayrollMonthlySummary.month <= month_start(request.end_month)
+        )
+    return query.order_by(
+        col(PayrollMonthlySummary.employee_id),
+        col(PayrollMonthlySummary.month),
+        col(PayrollMonthlySummary.concept_id),
+    )
+
+
+def build_monthly_summary_response(
+    summary: PayrollMonthlySummary, concept: Concept | None
+) -> PayrollSummaryResponse:
+    return PayrollSummaryResponse(
+        **summary.model_dump(exclude={"id"}),
+        concept=ConceptSchema.model_validate(concept) if concept else None,
+    )
+
+
+def get_monthly_summary(
+    db: DatabaseSession, request: PayrollSummaryRequest
+) -> list[PayrollSummaryResponse]:
+    return [
+        build_monthly_summary_response(
+            summary, concept_cache.get_by_id(db, summary.concept_id)
+        )
+        for summary in db.exec(build_monthly_summary_query(request))
+    ]
+
+
+async def get_monthly_summary_async(
+    db: AsyncDatabaseSession, request: PayrollSummaryRequest
+) -> list[PayrollSummaryResponse]:
+    rows = await db.exec(build_monthly_summary_query(request))
+    return [
+        build_monthly_summary_response(
+            summary, await concept_cache.get_by_id_async(db, summary.concept_id)
+        )
+        for summary in rows.all()
+    ]
@@ -15,13 +15,13 @@ class Postulation(SQLModel, table=True):
     __tablename__: str = "postulation"  # type: ignore
 
     id: int | None = Field(primary_key=True, index=True)
-    job_opportunity_id: int = Field(foreign_key="job_opportunity.id")
+    job_opportunity_id: int = Field(foreign_key="job_opportunity.id", index=True)
     name: str = Field(min_length=1, max_length=50)
     surname: str = Field(min_length=1, max_length=50)
     email: EmailStr = Field(min_length=1, max_length=100)
     phone_number: str = Field(min_length=1, max_length=100)
-    address_country_id: int = Field(foreign_key="country.id")
-    address_state_id: int = Field(foreign_key="state.id")
+    address_country_id: int = Field(foreign_key="country.id", index=True)
+    address_state_id: int = Field(foreign_key="state.id", index=True)
     cv_file: str = Field()
     evaluated_at: datetime | None = Field(default=None)
     suitable: bool = Field(default=False)
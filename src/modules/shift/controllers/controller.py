@@ -12,7 +12,7 @@ shift_router = APIRouter(prefix="/shift", tags=["Shift"])
 @shift_router.get(
     "/", response_model=List[schemas.ShiftResponse], status_code=status.HTTP_200_OK
 )
-async def read_shift(db: DatabaseSession):
+def read_shift(db: DatabaseSession):
     """
     docstring
     """
@@ -22,7 +22,7 @@ async def read_shift(db: DatabaseSession):
 @shift_router.post(
     "/", response_model=schemas.ShiftResponse, status_code=status.HTTP_201_CREATED
 )
-async def create_shift(db: DatabaseSession, request: schemas.ShiftRequest):
+def create_shift(db: DatabaseSession, request: schemas.ShiftRequest):
     """
     docstring
     """
@@ -32,7 +32,7 @@ async def create_shift(db: DatabaseSession, request: schemas.ShiftRequest):
 @shift_router.patch(
     "/{shift_id}", response_model=schemas.ShiftResponse, status_code=status.HTTP_200_OK
 )
-async def update_shift(
+def update_shift(
     db: DatabaseSession, shift_id: int, request: schemas.ShiftRequest
 ):
     """
@@ -42,7 +42,7 @@ async def update_shift(
 
 
 @shift_router.delete("/{shift_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_shift(db: DatabaseSession, shift_id: int):
+def delete_shift(db: DatabaseSession, shift_id: int):
     """
     docstring
     """
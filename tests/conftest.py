@@ -0,0 +1,7 @@
+import os
+
+# `src.database.core` crea los engines al importarse: los tests usan una base
+# SQLite en memoria y sin réplicas, nunca la de la aplicación
+os.environ.setdefault("USE_TEST_DATABASE", "true")
+os.environ.setdefault("TEST_DATABASE_URL", "sqlite://")
+os.environ.setdefault("DATABASE_REPLICA_URLS", "")
@@ -0,0 +1,147 @@
+from datetime import date, time
+from sqlalchemy import insert
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+from src.modules.employee_hours.models.models import (
+    EmployeeHours,
+    RegisterType,
+    payType,
+)
+from src.modules.payroll_calculator.service import diff_employee_hours
+import pytest
+
+START_DATE = date(2025, 5, 5)
+END_DATE = date(2025, 5, 9)
+
+table = EmployeeHours.__table__  # type: ignore
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def complete(employee_id: int, day: int, **changes) -> dict:
+    return {
+        "employee_id": employee_id,
+        "work_date": date(2025, 5, day),
+        "concept_id": 4,
+        "shift_id": 1,
+        "check_count": 2,
+        "register_type": RegisterType.PRESENCIA,
+        "first_check_in": time(8),
+        "last_check_out": time(16),
+        "sumary_time": time(8),
+        "extra_hours": None,
+        "payroll_status": payType.PAYABLE,
+        "notes": "El empleado completó su jornada laboral.",
+        **changes,
+    }
+
+
+def extra(employee_id: int, day: int) -> dict:
+    return complete(
+        employee_id,
+        day,
+        concept_id=6,
+        last_check_out=time(17),
+        sumary_time=None,
+        extra_hours=time(1),
+        payroll_status=payType.PENDING_VALIDATION,
+        notes="El empleado realizó 1h 0m extra",
+    )
+
+
+def store(db: Session, rows: list[dict]) -> list[int]:
+    ids = []
+    for row in rows:
+        result = db.execute(insert(table).values(**row))
+        ids.append(result.inserted_primary_key[0])
+    db.commit()
+    return ids
+
+
+def diff(db: Session, rows: list[dict]):
+    # Siempre se recalcula el empleado 1
+    return diff_employee_hours(db, [1], START_DATE, END_DATE, rows)
+
+
+def test_unchanged_rows_are_not_written(db):
+    rows = [complete(1, day) for day in range(5, 10)]
+    store(db, rows)
+
+    assert diff(db, rows) == ([], [], [], 5)
+
+
+def test_changed_row_is_updated_in_place(db):
+    ids = store(db, [complete(1, 5), complete(1, 6)])
+    changed = complete(1, 6, check_count=3, notes="Otra nota")
+
+    to_insert, to_update, to_delete, unchanged = diff(db, [complete(1, 5), changed])
+
+    assert (to_insert, to_delete, unchanged) == ([], [], 1)
+    assert len(to_update) == 1
+    assert to_update[0]["row_id"] == ids[1]
+    assert to_update[0]["check_count"] == 3
+    assert to_update[0]["notes"] == "Otra nota"
+    assert "employee_id" not in to_update[0]
+    assert "work_date" not in to_update[0]
+
+
+def test_new_days_are_inserted(db):
+    store(db, [complete(1, 5)])
+    new_rows = [complete(1, 6), extra(1, 6)]
+
+    assert diff(db, [complete(1, 5), *new_rows]) == (new_rows, [], [], 1)
+
+
+def test_days_without_calculated_rows_are_deleted(db):
+    ids = store(db, [complete(1, 5), complete(1, 6)])
+
+    assert diff(db, [complete(1, 5)]) == ([], [], [ids[1]], 1)
+
+
+def test_day_whose_rows_shrink_keeps_the_first_and_deletes_the_rest(db):
+    # El día tenía jornada completa más horas extra y ahora solo jornada
+    # completa: se conserva el registro de menor ID y se borra el sobrante
+    ids = store(db, [complete(1, 5, last_check_out=time(17)), extra(1, 5)])
+    recalculated = complete(1, 5, last_check_out=time(16, 15))
+
+    to_insert, to_update, to_delete, unchanged = diff(db, [recalculated])
+
+    assert (to_insert, unchanged) == ([], 0)
+    assert [change["row_id"] for change in to_update] == [ids[0]]
+    assert to_update[0]["last_check_out"] == time(16, 15)
+    assert to_delete == [ids[1]]
+
+
+def test_day_whose_rows_grow_inserts_the_extra_row(db):
+    ids = store(db, [complete(1, 5)])
+
+    to_insert, to_update, to_delete, unchanged = diff(db, [complete(1, 5), extra(1, 5)])
+
+    assert to_insert == [extra(1, 5)]
+    assert (to_update, to_delete, unchanged) == ([], [], 1)
+    assert ids
+
+
+def test_archived_rows_and_other_employees_are_left_alone(db):
+    store(
+        db,
+        [
+            complete(1, 5, payroll_status=payType.ARCHIVED),
+            complete(2, 5),
+            complete(1, 12),
+        ],
+    )
+
+    # Los archivados no se emparejan ni se borran: el día se inserta de nuevo
+    assert diff(db, [complete(1, 5)]) == ([complete(1, 5)], [], [], 0)
@@ -0,0 +1,331 @@
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from src.modules.employee_hours.models.models import RegisterType, payType
+from src.modules.payroll_calculator.shift_rules import (
+    DailyClockSummary,
+    build_employee_hours_rows,
+)
+import numpy as np
+import pytest
+
+CONCEPTS = {
+    "Día no hábil.": 1,
+    "Ausente sin entrada registrada": 2,
+    "Presente sin salida registrada": 3,
+    "Jornada laboral completa": 4,
+    "Tiempo faltante": 5,
+    "Horas extra": 6,
+}
+
+# Lunes a domingo
+START_DATE = date(2025, 5, 5)
+END_DATE = date(2025, 5, 11)
+
+
+def at(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2025, 5, day, hour, minute)
+
+
+def summarize(events: list[tuple[int, datetime, str]]) -> DailyClockSummary:
+    """
+    Arma en memoria el mismo resumen que `get_daily_clock_summary` calcula
+    en SQL a partir de fichadas (empleado, instante, tipo).
+    """
+    days: dict[tuple[int, date], list[tuple[datetime, str]]] = {}
+    for employee_id, instant, event_type in events:
+        days.setdefault((employee_id, instant.date()), []).append((instant, event_type))
+
+    columns: list[list] = [[] for _ in range(7)]
+    for (employee_id, day), day_events in sorted(days.items()):
+        ins = [instant for instant, event_type in day_events if event_type == "IN"]
+        outs = [instant for instant, event_type in day_events if event_type == "OUT"]
+        first_in = min(ins) if ins else None
+        window_end = datetime.combine(day + timedelta(days=2), time.min)
+        outs_after_in = [
+            instant
+            for id, instant, event_type in events
+            if id == employee_id
+            and event_type == "OUT"
+            and first_in is not None
+            and first_in < instant < window_end
+        ]
+        values = (
+            employee_id,
+            day,
+            len(day_events),
+            len(ins),
+            first_in,
+            max(outs) if outs else None,
+            min(outs_after_in) if outs_after_in else None,
+        )
+        for column, value in zip(columns, values):
+            column.append(value)
+
+    return DailyClockSummary(
+        employee_ids=np.array(columns[0], dtype=np.int64),
+        work_dates=np.array(columns[1], dtype="datetime64[D]"),
+        check_count=np.array(columns[2], dtype=np.int64),
+        in_count=np.array(columns[3], dtype=np.int64),
+        first_in=np.array(columns[4], dtype="datetime64[us]"),
+        last_out=np.array(columns[5], dtype="datetime64[us]"),
+        first_out_after_in=np.array(columns[6], dtype="datetime64[us]"),
+    )
+
+
+def employee(shift_type: str, employee_id: int = 1) -> SimpleNamespace:
+    shift = SimpleNamespace(id=7, type=shift_type, working_hours=8, working_days=5)
+    return SimpleNamespace(id=employee_id, shift=shift)
+
+
+def legacy_row(
+    day: int,
+    concept: str,
+    check_count: int,
+    check_in: time | None,
+    check_out: time | None,
+    summary_time: time | None,
+    extra_hours: time | None,
+    payroll_status: payType,
+    register_type: RegisterType,
+    notes: str,
+) -> dict:
+    return {
+        "employee_id": 1,
+        "concept_id": CONCEPTS[concept],
+        "shift_id": 7,
+        "check_count": check_count,
+        "work_date": date(2025, 5, day),
+        "register_type": register_type,
+        "first_check_in": check_in,
+        "last_check_out": check_out,
+        "sumary_time": summary_time,
+        "extra_hours": extra_hours,
+        "payroll_status": payroll_status,
+        "notes": notes,
+    }
+
+
+def complete(day, check_count, check_in, check_out, summary_time=time(8)):
+    return legacy_row(
+        day,
+        "Jornada laboral completa",
+        check_count,
+        check_in,
+        check_out,
+        summary_time,
+        None,
+        payType.PAYABLE,
+        RegisterType.PRESENCIA,
+        "El empleado completó su jornada laboral.",
+    )
+
+
+def missing_time(day, check_count, check_in, check_out, summary_time, hours, minutes):
+    return legacy_row(
+        day,
+        "Tiempo faltante",
+        check_count,
+        check_in,
+        check_out,
+        summary_time,
+        None,
+        payType.NOT_PAYABLE,
+        RegisterType.PRESENCIA,
+        f"Le faltaron {hours}h {minutes}m para completar la jornada",
+    )
+
+
+def extra_time(day, check_count, check_in, check_out, extra):
+    return legacy_row(
+        day,
+        "Horas extra",
+        check_count,
+        check_in,
+        check_out,
+        None,
+        extra,
+        payType.PENDING_VALIDATION,
+        RegisterType.PRESENCIA,
+        f"El empleado realizó {extra.hour}h {extra.minute}m extra",
+    )
+
+
+def no_check_out(day, check_count, check_in):
+    return legacy_row(
+        day,
+        "Presente sin salida registrada",
+        check_count,
+        check_in,
+        None,
+        None,
+        None,
+        payType.NOT_PAYABLE,
+        RegisterType.PRESENCIA,
+        "El empleado registró entrada pero no salida.",
+    )
+
+
+def absent(day):
+    return legacy_row(
+        day,
+        "Ausente sin entrada registrada",
+        0,
+        None,
+        None,
+        None,
+        None,
+        payType.NOT_PAYABLE,
+        RegisterType.AUSENCIA,
+        "El empleado no registró entrada en el día.",
+    )
+
+
+def non_working(day):
+    return legacy_row(
+        day,
+        "Día no hábil.",
+        0,
+        None,
+        None,
+        None,
+        None,
+        payType.NOT_PAYABLE,
+        RegisterType.DIA_NO_HABIL,
+        "Día no hábil",
+    )
+
+
+# Fichadas de una semana por tipo de turno y los registros que generaban
+# para ellas los procesadores por turno anteriores a `shift_rules`
+# (process_morning/afternoon/night_shift_hours). Las duraciones evitan las
+# diferencias documentadas: minutos no enteros en el turno vespertino y
+# faltantes que el cálculo con float truncaba.
+CASES = {
+    "matutino": (
+        [
+            (at(5, 8), "IN"),
+            (at(5, 16), "OUT"),
+            (at(6, 8), "IN"),
+            (at(6, 14, 30), "OUT"),
+            (at(7, 8), "IN"),
+            (at(7, 17, 15), "OUT"),
+            # Dos entradas y una salida: falta la última salida
+            (at(8, 8), "IN"),
+            (at(8, 12), "OUT"),
+            (at(8, 13), "IN"),
+        ],
+        [
+            complete(5, 2, time(8), time(16)),
+            missing_time(6, 2, time(8), time(14, 30), time(6, 30), 1, 30),
+            complete(7, 2, time(8), time(17, 15)),
+            extra_time(7, 2, time(8), time(17, 15), time(1, 15)),
+            no_check_out(8, 3, time(8)),
+            absent(9),
+            non_working(10),
+            non_working(11),
+        ],
+    ),
+    "vespertino": (
+        [
+            (at(5, 16), "IN"),
+            (at(6, 0), "OUT"),
+            (at(6, 15), "IN"),
+            (at(6, 22), "OUT"),
+            (at(7, 14), "IN"),
+            (at(8, 1), "OUT"),
+            (at(8, 16), "IN"),
+        ],
+        [
+            complete(5, 4, time(16), time(0)),
+            missing_time(6, 4, time(15), time(22), time(7), 1, 0),
+            complete(7, 3, time(14), time(1)),
+            extra_time(7, 3, time(14), time(1), time(3)),
+            no_check_out(8, 2, time(16)),
+            absent(9),
+            non_working(10),
+            non_working(11),
+        ],
+    ),
+    "nocturno": (
+        [
+            (at(5, 22), "IN"),
+            (at(6, 6), "OUT"),
+            (at(6, 22), "IN"),
+            (at(7, 5), "OUT"),
+            (at(7, 21), "IN"),
+            (at(8, 7, 30), "OUT"),
+            (at(8, 22), "IN"),
+        ],
+        [
+            complete(5, 3, time(22), time(6)),
+            missing_time(6, 4, time(22), time(5), time(7), 1, 0),
+            complete(7, 4, time(21), time(7, 30)),
+            extra_time(7, 4, time(21), time(7, 30), time(2, 30)),
+            no_check_out(8, 2, time(22)),
+            absent(9),
+            non_working(10),
+            non_working(11),
+        ],
+    ),
+}
+
+
+@pytest.mark.parametrize("shift_type", CASES)
+def test_rows_match_legacy_processor(shift_type):
+    events, expected = CASES[shift_type]
+    rows = build_employee_hours_rows(
+        [employee(shift_type)],
+        START_DATE,
+        END_DATE,
+        summarize([(1, instant, event_type) for instant, event_type in events]),
+        CONCEPTS,
+    )
+    assert rows == expected
+
+
+def test_employees_are_classified_independently():
+    # Varios empleados y turnos en la misma pasada dan lo mismo que por separado
+    employees = [
+        employee(shift_type, employee_id)
+        for employee_id, shift_type in enumerate(CASES, start=1)
+    ]
+    events = [
+        (employee_id, instant, event_type)
+        for employee_id, shift_type in enumerate(CASES, start=1)
+        for instant, event_type in CASES[shift_type][0]
+    ]
+    rows = build_employee_hours_rows(
+        employees, START_DATE, END_DATE, summarize(events), CONCEPTS
+    )
+    expected = [
+        {**row, "employee_id": employee_id}
+        for employee_id, shift_type in enumerate(CASES, start=1)
+        for row in CASES[shift_type][1]
+    ]
+    assert rows == expected
+
+
+def test_overnight_check_out_counts_for_the_check_in_day():
+    # La salida del turno nocturno cae en el día siguiente y cierra la jornada
+    # de la entrada; el día siguiente, sin entrada propia, queda ausente
+    events = [(1, at(5, 22), "IN"), (1, at(6, 6, 15), "OUT")]
+    rows = build_employee_hours_rows(
+        [employee("nocturno")],
+        START_DATE,
+        date(2025, 5, 6),
+        summarize(events),
+        CONCEPTS,
+    )
+    assert rows == [
+        complete(5, 2, time(22), time(6, 15), time(8, 15)),
+        absent(6),
+    ]
+
+
+def test_missing_check_out_on_the_last_day_of_the_range():
+    # Sin fichadas del día siguiente en el rango la entrada queda sin salida
+    events = [(1, at(5, 16), "IN")]
+    rows = build_employee_hours_rows(
+        [employee("vespertino")], START_DATE, START_DATE, summarize(events), CONCEPTS
+    )
+    assert rows == [no_check_out(5, 1, time(16))]